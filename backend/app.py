@@ -6,8 +6,12 @@ from config import config
 from extensions import db, migrate, ma, jwt
 from utils import setup_logger
 from utils.exceptions import APIException
+from utils.json_provider import make_json_provider
+from utils.compression import compress_response
 from utils.email_service import mail
 from utils.image_upload import init_cloudinary # <--- ADD THIS
+from commands import register_commands
+from services.cart_store import init_cart_stores
 
 # Import all models for Flask-Migrate
 from models.order import Order, OrderItem
@@ -17,6 +21,7 @@ from models.cake import Cake
 from models.User import User
 from models.cart import Cart, CartItem, CartItemImage
 from models.customization import CakeTemplate, CakeTemplateImage
+import models.search  # Full-text search indexes (FTS5 / tsvector)
 
 
 def create_app(config_name=None):
@@ -29,6 +34,9 @@ def create_app(config_name=None):
         config_name = os.environ.get('FLASK_ENV', 'development')
     app.config.from_object(config[config_name])
     
+    # JSON provider for jsonify/get_json (orjson when available)
+    app.json = make_json_provider(app)
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -37,6 +45,9 @@ def create_app(config_name=None):
     mail.init_app(app)  # Initialize Flask-Mail
     init_cloudinary(app)
     
+    # Cart storage (guest carts in SQL or a key-value store)
+    init_cart_stores(app)
+    
     # Configure CORS
     CORS(app, 
      resources={r"/api/*": {"origins": app.config['CORS_ORIGINS']}},
@@ -57,6 +68,9 @@ def create_app(config_name=None):
     # Register blueprints
     register_blueprints(app)
     
+    # Register CLI commands (flask carts ...)
+    register_commands(app)
+    
     return app
 
 
@@ -70,6 +84,8 @@ def register_blueprints(app):
     from controllers.customization_controller import customization_bp
     from controllers.cart_controller import cart_bp
     from controllers.portfolio_controller import portfolio_bp
+    from controllers.search_controller import search_bp
+    from controllers.pricing_controller import pricing_bp
 
     
     app.register_blueprint(cake_bp, url_prefix='/api')
@@ -80,6 +96,8 @@ def register_blueprints(app):
     app.register_blueprint(customization_bp, url_prefix='/api')
     app.register_blueprint(cart_bp, url_prefix='/api')
     app.register_blueprint(portfolio_bp, url_prefix='/api')  # ENABLED
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(pricing_bp, url_prefix='/api')
     
     app.logger.info("All blueprints registered successfully")
 
@@ -87,7 +105,6 @@ def register_blueprints(app):
 def register_error_handlers(app):
     """Register error handlers for the application."""
     
-    @app.errorhandler(APIException)
     def handle_api_exception(error):
         """Handle custom API exceptions."""
         app.logger.error(
@@ -98,6 +115,12 @@ def register_error_handlers(app):
         response.status_code = error.code
         return response
     
+    # Flask looks HTTPException handlers up by status code, so each subclass
+    # (ValidationError -> 400, ResourceNotFoundError -> 404, ...) must be
+    # registered itself or it falls through to the generic Exception handler.
+    for exception_class in (APIException, *APIException.__subclasses__()):
+        app.register_error_handler(exception_class, handle_api_exception)
+    
     @app.errorhandler(400)
     def bad_request(error):
         """Handle 400 Bad Request errors."""
@@ -229,6 +252,11 @@ def register_hooks(app):
         response.headers['X-Frame-Options'] = 'DENY'
         response.headers['X-XSS-Protection'] = '1; mode=block'
         return response
+    
+    @app.after_request
+    def compress_response_body(response):
+        """gzip/brotli-compress large text responses the client accepts."""
+        return compress_response(response)
 
 
 # Create app instance for Flask CLI and migrations
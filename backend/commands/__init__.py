@@ -0,0 +1,8 @@
+# backend/commands/__init__.py
+"""Flask CLI command groups (flask <group> <command>)."""
+from .carts import carts_cli
+
+
+def register_commands(app):
+    """Register all CLI command groups on the app."""
+    app.cli.add_command(carts_cli)
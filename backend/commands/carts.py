@@ -0,0 +1,79 @@
+# backend/commands/carts.py
+import re
+from datetime import datetime, timedelta
+
+import click
+from flask.cli import AppGroup
+
+from services.cart_service import (
+    find_cart_total_drift, recompute_cart_totals, collect_abandoned_carts
+)
+
+carts_cli = AppGroup('carts', help='Shopping cart maintenance.')
+
+
+class Duration(click.ParamType):
+    """A duration such as 30d, 12h or 2w, converted to a timedelta."""
+    name = 'duration'
+    UNITS = {'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, timedelta):
+            return value
+        match = re.fullmatch(r'(\d+)([hdw])', value.strip().lower())
+        if not match:
+            self.fail(f"{value!r} is not a duration like 30d, 12h or 2w", param, ctx)
+        amount, unit = match.groups()
+        return timedelta(**{self.UNITS[unit]: int(amount)})
+
+
+@carts_cli.command('check')
+@click.option('--fix', is_flag=True, help='Recompute the totals of drifted carts.')
+def check_cart_totals(fix):
+    """
+    Compare stored cart totals with their items.
+
+    Exits with status 1 when drift is found and --fix is not given, so it
+    can run from cron or CI.
+    """
+    drift = find_cart_total_drift()
+    for cart_id, stored_total, actual_total, stored_count, actual_count in drift:
+        click.echo(
+            f"cart {cart_id}: total {stored_total:.2f} != {actual_total:.2f}, "
+            f"items {stored_count} != {actual_count}"
+        )
+
+    if not drift:
+        click.echo("All cart totals are consistent.")
+    elif fix:
+        updated = recompute_cart_totals(row[0] for row in drift)
+        click.echo(f"Recomputed totals for {updated} cart(s).")
+    else:
+        click.echo(f"{len(drift)} cart(s) out of sync; rerun with --fix to repair.")
+        raise SystemExit(1)
+
+
+@carts_cli.command('gc')
+@click.option('--older-than', 'older_than', type=Duration(), default='30d', show_default=True,
+              help='Delete guest carts not updated for this long (e.g. 30d, 12h, 2w).')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=5000, show_default=True,
+              help='Carts deleted per transaction.')
+def collect_garbage(older_than, chunk_size):
+    """
+    Delete abandoned guest carts with their items and images.
+
+    Meant to run on a schedule, e.g. nightly from cron:
+
+        0 3 * * *  cd /app/backend && flask carts gc --older-than 30d
+    """
+    cutoff = datetime.utcnow() - older_than
+
+    def report(chunk, total, elapsed):
+        click.echo(f"deleted {chunk} carts ({total} total, {total / max(elapsed, 1e-9):.0f} carts/s)")
+
+    deleted, elapsed = collect_abandoned_carts(cutoff, chunk_size, on_chunk=report)
+    rate = deleted / elapsed if elapsed else 0.0
+    click.echo(
+        f"Deleted {deleted} abandoned guest cart(s) not updated since "
+        f"{cutoff:%Y-%m-%d %H:%M} in {elapsed:.2f}s ({rate:.0f} carts/s)."
+    )
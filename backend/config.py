@@ -68,6 +68,47 @@ class Config:
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     ADMIN_EMAIL = os.environ.get('ADMIN_EMAIL', 'admin@cakes2.com')
+    
+    # Response Cache Settings
+    # Seconds a cached catalog payload may be served before it is rebuilt.
+    # Writes in this process invalidate immediately; the TTL bounds how long
+    # other worker processes can serve a stale catalog.
+    CATALOG_CACHE_TTL = int(os.environ.get('CATALOG_CACHE_TTL', 60))
+    # Same for data derived from customization options (pricing table and
+    # grouped option payloads)
+    OPTION_CACHE_TTL = int(os.environ.get('OPTION_CACHE_TTL', 300))
+    # Seconds between checks of the catalog tables' fingerprint by the
+    # typeahead index; a change made by another process is picked up then
+    TYPEAHEAD_TTL = int(os.environ.get('TYPEAHEAD_TTL', 60))
+    
+    # Compression Settings
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    
+    # JSON Settings
+    # 'auto' uses orjson when it is installed and a tuned stdlib encoder
+    # otherwise; 'orjson' or 'stdlib' force one of them.
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    
+    # Cart Store Settings
+    # Where guest carts live: 'sql' (cart/cart_item rows), 'memory' (an
+    # in-process dict, development only) or 'redis' (CART_STORE_URL). With
+    # 'memory' or 'redis' guest carts become rows only when the visitor logs in.
+    # User carts are always rows.
+    CART_STORE = os.environ.get('CART_STORE', 'sql')
+    CART_STORE_URL = os.environ.get('CART_STORE_URL', 'redis://localhost:6379/0')
+    # Seconds an untouched key-value guest cart is kept (every write renews it)
+    CART_STORE_TTL = int(os.environ.get('CART_STORE_TTL', 30 * 24 * 3600))
+    
+    # Checkout Settings
+    # Flat delivery fee added to every order; clients may echo it but never set it
+    DELIVERY_FEE = float(os.environ.get('DELIVERY_FEE', 500.0))
+    
+    # Bulk Catalog Import/Export Settings
+    # Rows validated and written per INSERT/UPDATE statement (and per commit)
+    CATALOG_IMPORT_BATCH_SIZE = int(os.environ.get('CATALOG_IMPORT_BATCH_SIZE', 500))
 
 
 class DevelopmentConfig(Config):
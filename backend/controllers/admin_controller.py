@@ -1,11 +1,20 @@
 # backend/controllers/admin_controller.py
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from models.User import User
 from models.order import Order
 from models.cake import Cake
 from marshmallow import Schema, fields, EXCLUDE
+from utils.cache import catalog_cache, option_cache
+from utils.exceptions import ValidationError
+from utils.pagination import cursor_requested, keyset_paginate
+from utils.validators import validate_pagination_params
+from utils.fieldsets import (
+    requested_fields, schema_fields, schema_attributes, projected_schema, projection_options
+)
+from services.typeahead_service import typeahead_index
+from services.catalog_import_service import IMPORT_SPECS, import_catalog, export_catalog
 from datetime import datetime, timedelta
 
 admin_bp = Blueprint('admin', __name__)
@@ -99,6 +108,56 @@ def get_dashboard_stats():
         print(f"Error fetching admin stats: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+def _first_item_cake(order):
+    first_item = order.items[0] if order.items else None
+    return first_item.cake if first_item else None
+
+# Admin order list: output key -> (Order attributes it reads, getter).
+# Orders hold their cakes in items; the flat cake_* keys describe the first one.
+ADMIN_ORDER_FIELDS = {
+    'id': (('id',), lambda order: order.id),
+    'order_number': (('order_number',), lambda order: order.order_number),
+    'user_id': (('user_id',), lambda order: order.user_id),
+    'cake_id': (('items',), lambda order: order.items[0].cake_id if order.items else None),
+    'quantity': (('items',), lambda order: sum(item.quantity for item in order.items)),
+    'customer_name': (('customer_name',), lambda order: order.customer_name),
+    'customer_email': (('customer_email',), lambda order: order.customer_email),
+    'customer_phone': (('customer_phone',), lambda order: order.customer_phone),
+    'delivery_date': (('delivery_date',), lambda order: _isoformat(order.delivery_date)),
+    'special_requests': (('special_instructions',), lambda order: order.special_instructions),
+    'total_price': (('total_price',), lambda order: order.total_price),
+    'status': (('status',), lambda order: order.status),
+    'created_at': (('created_at',), lambda order: _isoformat(order.created_at)),
+    'cake_name': (('items',), lambda order: getattr(_first_item_cake(order), 'name', 'Unknown Cake')),
+    'user_email': (('user',), lambda order: order.user.email if order.user else 'Guest'),
+}
+
+# Admin user list: output key -> (User attributes it reads, getter)
+ADMIN_USER_FIELDS = {
+    'id': (('id',), lambda user: user.id),
+    'name': (('name',), lambda user: user.name),
+    'email': (('email',), lambda user: user.email),
+    'phone': (('phone',), lambda user: user.phone),
+    'is_admin': (('is_admin',), lambda user: user.is_admin),
+    'created_at': (('created_at',), lambda user: _isoformat(user.created_at)),
+    'order_count': (('orders',), lambda user: len(user.orders)),
+}
+
+def mapped_attributes(field_map, fields):
+    """Model attributes read by the requested keys of a field map."""
+    return {attr for key in fields for attr in field_map[key][0]}
+
+def order_to_admin_dict(order, fields=None):
+    """Flatten an order (plus cake and user names) for the admin order list."""
+    return {key: ADMIN_ORDER_FIELDS[key][1](order) for key in (fields or ADMIN_ORDER_FIELDS)}
+
+def user_to_admin_dict(user, fields=None):
+    """Flatten a user (plus order count) for the admin user list."""
+    return {key: ADMIN_USER_FIELDS[key][1](user) for key in (fields or ADMIN_USER_FIELDS)}
+
 # Get all orders with pagination
 @admin_bp.route('/orders', methods=['GET'])
 @jwt_required()
@@ -107,39 +166,41 @@ def get_all_orders_admin():
         return jsonify({'message': 'Admin access required'}), 403
     
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page, per_page = validate_pagination_params()
         status_filter = request.args.get('status', type=str)
         
-        query = Order.query.order_by(Order.created_at.desc())
+        query = Order.query
         
         if status_filter:
             query = query.filter_by(status=status_filter)
         
-        paginated_orders = query.paginate(
+        # Sparse fieldsets (?fields=): only load what the requested keys read
+        fields = requested_fields(ADMIN_ORDER_FIELDS)
+        if fields is not None:
+            query = query.options(*projection_options(
+                Order, mapped_attributes(ADMIN_ORDER_FIELDS, fields), always=('created_at',)
+            ))
+        
+        # Keyset mode: seek on (created_at, id) instead of COUNT + OFFSET
+        if cursor_requested():
+            orders, next_cursor = keyset_paginate(
+                query,
+                [(Order.created_at, True), (Order.id, True)],
+                request.args.get('cursor', ''),
+                per_page
+            )
+            return jsonify({
+                'orders': [order_to_admin_dict(order, fields) for order in orders],
+                'next_cursor': next_cursor
+            })
+        
+        paginated_orders = query.order_by(Order.created_at.desc()).paginate(
             page=page, 
             per_page=per_page, 
             error_out=False
         )
         
-        orders_data = []
-        for order in paginated_orders.items:
-            orders_data.append({
-                'id': order.id,
-                'user_id': order.user_id,
-                'cake_id': order.cake_id,
-                'quantity': order.quantity,
-                'customer_name': order.customer_name,
-                'customer_email': order.customer_email,
-                'customer_phone': order.customer_phone,
-                'delivery_date': order.delivery_date.isoformat() if order.delivery_date else None,
-                'special_requests': order.special_requests,
-                'total_price': order.total_price,
-                'status': order.status,
-                'created_at': order.created_at.isoformat() if order.created_at else None,
-                'cake_name': order.cake.name if order.cake else 'Unknown Cake',
-                'user_email': order.user.email if order.user else 'Guest'
-            })
+        orders_data = [order_to_admin_dict(order, fields) for order in paginated_orders.items]
         
         return jsonify({
             'orders': orders_data,
@@ -148,6 +209,8 @@ def get_all_orders_admin():
             'current_page': page
         })
         
+    except ValidationError:
+        raise
     except Exception as e:
         print(f"Error fetching orders: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -192,9 +255,21 @@ def get_all_cakes_admin():
         return jsonify({'message': 'Admin access required'}), 403
     
     try:
-        cakes = Cake.query.order_by(Cake.name).all()
-        return jsonify(cakes_schema.dump(cakes))
-        
+        # Sparse fieldsets (?fields=): project both the SELECT and the schema
+        query = Cake.query
+        schema = cakes_schema
+        fields = requested_fields(schema_fields(CakeSchema))
+        if fields is not None:
+            schema = projected_schema(CakeSchema, fields)
+            query = query.options(*projection_options(
+                Cake, schema_attributes(CakeSchema, fields), always=('name',)
+            ))
+        
+        cakes = query.order_by(Cake.name).all()
+        return jsonify(schema.dump(cakes))
+        
+    except ValidationError:
+        raise
     except Exception as e:
         print(f"Error fetching cakes: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
@@ -225,6 +300,8 @@ def create_cake():
         
         db.session.add(new_cake)
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.upsert('cake', new_cake.id, new_cake.name)
         
         return jsonify({
             'message': 'Cake created successfully',
@@ -257,6 +334,8 @@ def update_cake(cake_id):
             cake.image_url = data['image_url']
         
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.upsert('cake', cake.id, cake.name)
         
         return jsonify({
             'message': 'Cake updated successfully',
@@ -284,6 +363,8 @@ def delete_cake(cake_id):
         
         db.session.delete(cake)
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.remove('cake', cake_id)
         
         return jsonify({'message': 'Cake deleted successfully'})
         
@@ -292,6 +373,96 @@ def delete_cake(cake_id):
         print(f"Error deleting cake: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
 
+CATALOG_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+def _catalog_format():
+    """Pick csv/ndjson from ?format= or the request Content-Type."""
+    fmt = request.args.get('format')
+    if fmt is None:
+        fmt = 'csv' if request.mimetype == 'text/csv' else 'ndjson'
+    return fmt if fmt in CATALOG_FORMATS else None
+
+# Bulk import cakes or customization options
+@admin_bp.route('/cakes/import', methods=['POST'])
+@jwt_required()
+def import_cakes():
+    """
+    Stream-import a CSV or NDJSON catalog.
+    
+    Query Parameters:
+        - type (str): 'cake' (default) or 'option'
+        - format (str): 'csv' or 'ndjson' (default: from Content-Type)
+    
+    The body is the raw file, or a multipart upload in the 'file' field.
+    Rows are upserted on their natural key (cake name; option category + name).
+    """
+    if not require_admin():
+        return jsonify({'message': 'Admin access required'}), 403
+    
+    kind = request.args.get('type', 'cake')
+    if kind not in IMPORT_SPECS:
+        return jsonify({'message': f'Invalid type: {kind}'}), 400
+    
+    fmt = _catalog_format()
+    if fmt is None:
+        return jsonify({'message': 'Format must be csv or ndjson'}), 400
+    
+    try:
+        upload = request.files.get('file')
+        stream = upload.stream if upload else request.stream
+        
+        report = import_catalog(
+            stream, kind, fmt, current_app.config['CATALOG_IMPORT_BATCH_SIZE']
+        )
+        
+        if report.inserted or report.updated:
+            catalog_cache.bump()
+            typeahead_index.invalidate()
+            if kind == 'option':
+                option_cache.bump()
+        
+        current_app.logger.info(
+            f"Catalog import finished",
+            extra={'type': kind, 'processed': report.processed, 'errors': report.error_count}
+        )
+        
+        return jsonify(report.to_dict())
+        
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error importing catalog: {str(e)}")
+        return jsonify({'message': 'Internal server error'}), 500
+
+# Bulk export cakes or customization options
+@admin_bp.route('/cakes/export', methods=['GET'])
+@jwt_required()
+def export_cakes():
+    """
+    Stream the catalog as CSV or NDJSON (same columns the import accepts).
+    
+    Query Parameters:
+        - type (str): 'cake' (default) or 'option'
+        - format (str): 'csv' or 'ndjson' (default: ndjson)
+    """
+    if not require_admin():
+        return jsonify({'message': 'Admin access required'}), 403
+    
+    kind = request.args.get('type', 'cake')
+    if kind not in IMPORT_SPECS:
+        return jsonify({'message': f'Invalid type: {kind}'}), 400
+    
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in CATALOG_FORMATS:
+        return jsonify({'message': 'Format must be csv or ndjson'}), 400
+    
+    rows = export_catalog(kind, fmt, current_app.config['CATALOG_IMPORT_BATCH_SIZE'])
+    response = Response(stream_with_context(rows), mimetype=CATALOG_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={kind}s.{fmt}'
+    return response
+
 # Get all users
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
@@ -300,26 +471,36 @@ def get_all_users():
         return jsonify({'message': 'Admin access required'}), 403
     
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+        page, per_page = validate_pagination_params()
+        
+        # Sparse fieldsets (?fields=): only load what the requested keys read
+        query = User.query
+        fields = requested_fields(ADMIN_USER_FIELDS)
+        if fields is not None:
+            query = query.options(*projection_options(
+                User, mapped_attributes(ADMIN_USER_FIELDS, fields), always=('created_at',)
+            ))
+        
+        # Keyset mode: seek on (created_at, id) instead of COUNT + OFFSET
+        if cursor_requested():
+            users, next_cursor = keyset_paginate(
+                query,
+                [(User.created_at, True), (User.id, True)],
+                request.args.get('cursor', ''),
+                per_page
+            )
+            return jsonify({
+                'users': [user_to_admin_dict(user, fields) for user in users],
+                'next_cursor': next_cursor
+            })
         
-        users = User.query.order_by(User.created_at.desc()).paginate(
+        users = query.order_by(User.created_at.desc()).paginate(
             page=page, 
             per_page=per_page, 
             error_out=False
         )
         
-        users_data = []
-        for user in users.items:
-            users_data.append({
-                'id': user.id,
-                'name': user.name,
-                'email': user.email,
-                'phone': user.phone,
-                'is_admin': user.is_admin,
-                'created_at': user.created_at.isoformat() if user.created_at else None,
-                'order_count': len(user.orders)
-            })
+        users_data = [user_to_admin_dict(user, fields) for user in users.items]
         
         return jsonify({
             'users': users_data,
@@ -328,6 +509,8 @@ def get_all_users():
             'current_page': page
         })
         
+    except ValidationError:
+        raise
     except Exception as e:
         print(f"Error fetching users: {str(e)}")
         return jsonify({'message': 'Internal server error'}), 500
\ No newline at end of file
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, make_response # 👈 ADD make_response
+from flask import Blueprint, request, jsonify, make_response, current_app # 👈 ADD make_response
 from flask_jwt_extended import (
     create_access_token, 
     jwt_required, 
@@ -8,11 +8,21 @@ from flask_jwt_extended import (
 )
 from extensions import db
 from models.User import User
+from services.cart_service import merge_guest_cart
 from marshmallow import Schema, fields, validate, EXCLUDE
 import json
 
 auth_bp = Blueprint('auth', __name__)
 
+
+def _adopt_guest_cart(user_id):
+    """Merge the visitor's guest cart into their account; never fails the login."""
+    try:
+        merge_guest_cart(user_id)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Guest cart merge failed: {e}", exc_info=True)
+
 # Marshmallow schemas (No change needed here)
 class UserSchema(Schema):
     class Meta:
@@ -85,6 +95,9 @@ def register():
         db.session.add(new_user)
         db.session.commit()
         
+        # Keep whatever they put in the cart before signing up
+        _adopt_guest_cart(new_user.id)
+        
         # 1. Generate access token with string identity (Using user ID)
         access_token = create_access_token(identity=str(new_user.id))
         
@@ -121,6 +134,9 @@ def login():
         if not user or not user.check_password(data['password']):
             return jsonify({'message': 'Invalid credentials'}), 401
         
+        # Keep whatever they put in the cart before logging in
+        _adopt_guest_cart(user.id)
+        
         # 1. Generate access token with string identity (Using user ID)
         access_token = create_access_token(identity=str(user.id))
         
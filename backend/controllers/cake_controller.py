@@ -5,64 +5,142 @@ from models.cake import Cake
 from schemas.cake_schema import CakeBaseSchema, CakeCreateSchema, CakeUpdateSchema
 from utils.exceptions import ResourceNotFoundError, ValidationError, DatabaseError
 from utils.validators import validate_request, validate_pagination_params
+from utils.cache import catalog_cache, serialize_body, cached_json_response
+from utils.fast_serializer import compile_schema
+from utils.pagination import cursor_requested, keyset_paginate
+from utils.fieldsets import (
+    requested_fields, schema_fields, schema_attributes, projected_schema, projection_options
+)
+from services.typeahead_service import typeahead_index
 
 cake_bp = Blueprint('cakes', __name__)
 
-# Initialize schemas
-cake_schema = CakeBaseSchema()
-cakes_schema = CakeBaseSchema(many=True)
+# Initialize schemas (compiled: the catalog is the hottest dump path)
+cake_schema = compile_schema(CakeBaseSchema())
+cakes_schema = compile_schema(CakeBaseSchema(many=True))
 
 
 @cake_bp.route('/cakes', methods=['GET'])   
 def get_cakes():
-    """Get all cakes with optional pagination."""
+    """
+    Get all cakes with optional pagination (served from the catalog cache).
+    
+    Query Parameters:
+        - page, per_page (int): Offset pagination
+        - cursor (str): Keyset pagination ('' for the first page)
+        - fields (str): Sparse fieldset, e.g. id,name,price,image_url
+    """
     try:
+        fields = requested_fields(schema_fields(CakeBaseSchema))
+        
+        # Keyset pagination (?cursor=) skips the COUNT and the OFFSET scan
+        if cursor_requested():
+            _, per_page = validate_pagination_params()
+            cursor = request.args.get('cursor', '')
+            body = catalog_cache.get_or_build(
+                ('cursor', cursor, per_page, fields),
+                lambda: _build_cakes_cursor_page(cursor, per_page, fields)
+            )
         # Check if pagination is requested
-        if 'page' in request.args or 'per_page' in request.args:
+        elif 'page' in request.args or 'per_page' in request.args:
             page, per_page = validate_pagination_params()
-            
-            cakes_paginated = Cake.query.paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
+            body = catalog_cache.get_or_build(
+                ('page', page, per_page, fields),
+                lambda: _build_cakes_page(page, per_page, fields)
             )
-            
-            current_app.logger.info(
-                f"Cakes retrieved with pagination",
-                extra={'page': page, 'per_page': per_page, 'total': cakes_paginated.total}
-            )
-            
-            return jsonify({
-                'cakes': cakes_schema.dump(cakes_paginated.items),
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': cakes_paginated.total,
-                    'pages': cakes_paginated.pages
-                }
-            }), 200
         else:
             # Return all cakes without pagination
-            cakes = Cake.query.all()
-            current_app.logger.info(f"Retrieved {len(cakes)} cakes")
-            return jsonify(cakes_schema.dump(cakes)), 200
+            body = catalog_cache.get_or_build(
+                ('all', fields),
+                lambda: _build_all_cakes(fields)
+            )
+        
+        return cached_json_response(body)
             
+    except ValidationError:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error retrieving cakes: {e}", exc_info=True)
         raise DatabaseError("Failed to retrieve cakes")
 
 
+def _cake_listing(fields):
+    """Query and schema for a cake listing, projected to the requested fields."""
+    if fields is None:
+        return Cake.query, cakes_schema
+    query = Cake.query.options(*projection_options(
+        Cake, schema_attributes(CakeBaseSchema, fields)
+    ))
+    return query, projected_schema(CakeBaseSchema, fields)
+
+
+def _build_all_cakes(fields):
+    """Load and serialize the full cake list (catalog cache miss)."""
+    query, schema = _cake_listing(fields)
+    cakes = query.all()
+    current_app.logger.info(f"Retrieved {len(cakes)} cakes")
+    return serialize_body(schema.dump(cakes))
+
+
+def _build_cakes_page(page, per_page, fields):
+    """Load and serialize one page of cakes (catalog cache miss)."""
+    query, schema = _cake_listing(fields)
+    cakes_paginated = query.paginate(
+        page=page,
+        per_page=per_page,
+        error_out=False
+    )
+    
+    current_app.logger.info(
+        f"Cakes retrieved with pagination",
+        extra={'page': page, 'per_page': per_page, 'total': cakes_paginated.total}
+    )
+    
+    return serialize_body({
+        'cakes': schema.dump(cakes_paginated.items),
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': cakes_paginated.total,
+            'pages': cakes_paginated.pages
+        }
+    })
+
+
+def _build_cakes_cursor_page(cursor, per_page, fields):
+    """Load and serialize one keyset page of cakes (catalog cache miss)."""
+    query, schema = _cake_listing(fields)
+    cakes, next_cursor = keyset_paginate(
+        query, [(Cake.id, False)], cursor, per_page
+    )
+    return serialize_body({
+        'cakes': schema.dump(cakes),
+        'pagination': {
+            'per_page': per_page,
+            'next_cursor': next_cursor
+        }
+    })
+
+
 @cake_bp.route('/cakes/<int:id>', methods=['GET'])
 def get_cake(id):
     """Get a specific cake by ID."""
-    cake = Cake.query.get(id)
+    body = catalog_cache.get(('cake', id))
     
-    if not cake:
-        current_app.logger.warning(f"Cake not found: {id}")
-        raise ResourceNotFoundError(f"Cake with id {id} not found")
+    if body is None:
+        version = catalog_cache.version
+        cake = Cake.query.get(id)
+        
+        if not cake:
+            current_app.logger.warning(f"Cake not found: {id}")
+            raise ResourceNotFoundError(f"Cake with id {id} not found")
+        
+        current_app.logger.info(f"Cake retrieved: {id}")
+        body = catalog_cache.set(
+            ('cake', id), serialize_body(cake_schema.dump(cake)), version=version
+        )
     
-    current_app.logger.info(f"Cake retrieved: {id}")
-    return jsonify(cake_schema.dump(cake)), 200
+    return cached_json_response(body)
 
 
 @cake_bp.route('/cakes', methods=['POST'])
@@ -81,10 +159,12 @@ def create_cake():
         
         db.session.add(new_cake)
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.upsert('cake', new_cake.id, new_cake.name)
         
         current_app.logger.info(
             f"Cake created: {new_cake.id}",
-            extra={'cake_id': new_cake.id, 'name': new_cake.name}
+            extra={'cake_id': new_cake.id, 'cake_name': new_cake.name}
         )
         
         return jsonify(cake_schema.dump(new_cake)), 201
@@ -113,6 +193,8 @@ def update_cake(id):
                 setattr(cake, key, value)
         
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.upsert('cake', cake.id, cake.name)
         
         current_app.logger.info(
             f"Cake updated: {id}",
@@ -140,6 +222,8 @@ def delete_cake(id):
         
         db.session.delete(cake)
         db.session.commit()
+        catalog_cache.bump()
+        typeahead_index.remove('cake', id)
         
         current_app.logger.info(
             f"Cake deleted: {id}",
@@ -1,68 +1,134 @@
 # backend/controllers/cart_controller.py
-from flask import Blueprint, request, jsonify, current_app, session
-from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
-from sqlalchemy import and_
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
 import json
-import uuid
 
 from extensions import db
 from models.cart import Cart, CartItem, CartItemImage
 from models.cake import Cake
-from models.customization import CustomizationOption
 from schemas.cart_schema import (
-    CartSchema, CartItemSchema, CartItemCreateSchema
+    CartSchema, CartItemSchema, CartItemCreateSchema, CartOperationsSchema
 )
 from utils.validators import validate_request
+from utils.fast_serializer import compile_schema
+from services.cart_service import (
+    find_cart, get_or_create_cart, empty_cart, cart_store, cart_item_count
+)
+from services.pricing_service import get_pricing_table, load_cake_prices, missing_cake_ids
 from utils.exceptions import (
-    ResourceNotFoundError, ValidationError, DatabaseError
+    ResourceNotFoundError, ValidationError, ConflictError, DatabaseError
 )
 from utils.image_upload import upload_image_to_cloudinary as upload_image # Import image upload utility
 
 cart_bp = Blueprint('cart', __name__)
 
 # Initialize schemas
-cart_schema = CartSchema()
-cart_item_schema = CartItemSchema()
+cart_schema = compile_schema(CartSchema())
+cart_item_schema = compile_schema(CartItemSchema())
+
+# ?response= values of the mutation endpoints
+RESPONSE_MODES = ('full', 'delta')
+
 
+def _response_mode():
+    """Requested response mode: the whole cart ('full') or only what changed ('delta')."""
+    mode = request.args.get('response', 'full')
+    if mode not in RESPONSE_MODES:
+        raise ValidationError(f"response must be one of {', '.join(RESPONSE_MODES)}")
+    return mode
 
-def get_or_create_cart():
+
+def _delta_response(store, cart, item=None, removed_id=None):
     """
-    Get cart for logged-in user or create/retrieve guest cart.
-    Works for both authenticated and guest users.
+    Body of a ?response=delta mutation: the changed item (or the removed id),
+    the new totals and the cart version. Costs the same however big the
+    cart is: the item and the totals are read on their own.
     """
-    cart = None
-    user_id = None
-    
-    # Try to get authenticated user
-    try:
-        verify_jwt_in_request(optional=True)
-        user_id = get_jwt_identity()
-    except:
-        pass
-    
-    if user_id:
-        # Logged in user - find or create their cart
-        cart = Cart.query.filter_by(user_id=user_id).first()
-        if not cart:
-            cart = Cart(user_id=user_id)
-            db.session.add(cart)
-            db.session.commit()
-    else:
-        # Guest user - use session
-        session_id = session.get('cart_session_id')
-        
-        if session_id:
-            cart = Cart.query.filter_by(session_id=session_id).first()
-        
-        if not cart:
-            # Create new guest cart
-            session_id = str(uuid.uuid4())
-            cart = Cart(session_id=session_id)
-            db.session.add(cart)
-            db.session.commit()
-            session['cart_session_id'] = session_id
-    
-    return cart
+    total, item_count, version = store.totals(cart)
+    body = {'total': total, 'item_count': item_count, 'version': version}
+    if item is not None:
+        body['item'] = cart_item_schema.dump(store.render_item(cart, item))
+    if removed_id is not None:
+        body['removed_id'] = removed_id
+    return body
+
+
+def _diet_conflict_error(conflicts, **payload):
+    """ValidationError listing the options that break the item's diet."""
+    return ValidationError(
+        message="Selected options do not fit the dietary requirements",
+        payload=dict(payload, incompatible_options=[
+            {'id': entry.id, 'category': entry.category, 'name': entry.name}
+            for entry in conflicts
+        ])
+    )
+
+
+def _new_cart_item(data, base_price, customization_price):
+    """CartItem for validated CartItemCreateSchema data and its prices."""
+    return CartItem(
+        cake_id=data.get('cake_id'),
+        quantity=data['quantity'],
+        cake_shape=data.get('cake_shape'),
+        cake_size=data.get('cake_size'),
+        cake_layers=data.get('cake_layers', 2),
+        flavor=data.get('flavor'),
+        filling=data.get('filling'),
+        frosting=data.get('frosting'),
+        is_gluten_free=data.get('is_gluten_free', False),
+        is_vegan=data.get('is_vegan', False),
+        is_sugar_free=data.get('is_sugar_free', False),
+        is_dairy_free=data.get('is_dairy_free', False),
+        # Stored as JSON
+        toppings=json.dumps(data['toppings']) if data.get('toppings') else None,
+        decorations=data.get('decorations'),
+        message_on_cake=data.get('message_on_cake'),
+        base_price=base_price,
+        customization_price=customization_price,
+        notes=data.get('notes')
+    )
+
+
+def _update_cart_item_fields(cart_item, data):
+    """Apply the editable fields of an update; returns (old_subtotal, old_quantity)."""
+    old = cart_item.get_subtotal(), cart_item.quantity
+    cart_item.quantity = data.get('quantity', cart_item.quantity)
+    cart_item.cake_shape = data.get('cake_shape', cart_item.cake_shape)
+    cart_item.cake_size = data.get('cake_size', cart_item.cake_size)
+    cart_item.message_on_cake = data.get('message_on_cake', cart_item.message_on_cake)
+    cart_item.notes = data.get('notes', cart_item.notes)
+    return old
+
+
+def _apply_item_update(store, cart, cart_item, data):
+    """
+    Apply an update to an existing item and shift the cart totals by the
+    difference. A new cake_size is priced from the pricing table like an
+    add (PUT and PATCH share this path).
+    """
+    old_size = cart_item.cake_size
+    old_subtotal, old_quantity = _update_cart_item_fields(cart_item, data)
+    if cart_item.cake_size != old_size:
+        _reprice_cart_item(get_pricing_table(), cart_item)
+    store.update_item(cart, cart_item, old_subtotal, old_quantity)
+
+
+def _reprice_cart_item(table, cart_item):
+    """
+    Price an existing item again (after a size change) from its stored
+    configuration. Catalog cakes and portfolio designs keep the price
+    they were added at.
+    """
+    data = {
+        'cake_size': cart_item.cake_size,
+        'toppings': json.loads(cart_item.toppings) if cart_item.toppings else None,
+        **{flag: getattr(cart_item, flag) for flag in (
+            'is_gluten_free', 'is_vegan', 'is_sugar_free', 'is_dairy_free'
+        )},
+    }
+    cart_item.base_price, cart_item.customization_price = table.price_item(
+        data, cart_item.base_price if cart_item.cake_id or cart_item.template_id else None
+    )
 
 
 @cart_bp.route('/cart', methods=['GET'])
@@ -70,11 +136,14 @@ def get_cart():
     """
     Get current user's cart (works for both logged-in and guest users).
     
+    Visitors without a cart get an empty one that is not saved; the row is
+    created by the first add_to_cart, so page views never write.
+    
     Returns:
         JSON: Cart with items and total
     """
     try:
-        cart = get_or_create_cart()
+        cart = find_cart(load_items=True) or empty_cart()
         
         current_app.logger.info(
             f"Cart retrieved",
@@ -88,84 +157,56 @@ def get_cart():
         raise DatabaseError("Failed to retrieve cart")
 
 
+@cart_bp.route('/cart/count', methods=['GET'])
+def get_cart_count():
+    """
+    Item count for the cart badge.
+    
+    Reads the maintained item_count column in a single query; never loads
+    items and never creates a cart.
+    
+    Returns:
+        JSON: {"item_count": <int>}
+    """
+    return jsonify({'item_count': cart_item_count()}), 200
+
+
 @cart_bp.route('/cart/items', methods=['POST'])
 @validate_request(CartItemCreateSchema)
 def add_to_cart():
     """
     Add an item to cart with full customization.
+    
+    Query Parameters:
+        response (str): 'full' (default) for the whole cart, 'delta' for the
+                        new item, totals and version only
     """
     try:
-        cart = get_or_create_cart()
+        mode = _response_mode()
         data = request.validated_data
         
-        # Calculate pricing
-        base_price = 0.0
-        customization_price = 0.0
-        
-        # Get base price from cake or size
+        # Get base price from cake, or from the size option for custom cakes
+        cake_price = None
         if data.get('cake_id'):
             cake = Cake.query.get(data['cake_id'])
             if not cake:
                 raise ResourceNotFoundError("Cake not found")
-            base_price = cake.price
-        else:
-            # Price based on size for custom cakes, fetched dynamically
-            cake_size_option = CustomizationOption.query.filter_by(
-                category='size',
-                name=data.get('cake_size', 'Medium')
-            ).first()
-            base_price = cake_size_option.price if cake_size_option else 0.0
-        
-        # Add customization costs
-        if data.get('toppings'):
-            topping_ids = data['toppings']
-            toppings = CustomizationOption.query.filter(
-                and_(
-                    CustomizationOption.id.in_(topping_ids),
-                    CustomizationOption.category == 'topping'
-                )
-            ).all()
-            customization_price += sum(t.price for t in toppings)
-            data['toppings'] = json.dumps(topping_ids)  # Store as JSON
-        
-        # Dietary restrictions may add cost, fetched dynamically
-        if data.get('is_gluten_free'):
-            gluten_free_option = CustomizationOption.query.filter_by(
-                category='dietary_restriction',
-                name='Gluten-Free'
-            ).first()
-            customization_price += gluten_free_option.price if gluten_free_option else 0.0
-        if data.get('is_vegan'):
-            vegan_option = CustomizationOption.query.filter_by(
-                category='dietary_restriction',
-                name='Vegan'
-            ).first()
-            customization_price += vegan_option.price if vegan_option else 0.0
-        
-        cart_item = CartItem(
-            cart_id=cart.id,
-            cake_id=data.get('cake_id'),
-            quantity=data['quantity'],
-            cake_shape=data.get('cake_shape'),
-            cake_size=data.get('cake_size'),
-            cake_layers=data.get('cake_layers', 2),
-            flavor=data.get('flavor'),
-            filling=data.get('filling'),
-            frosting=data.get('frosting'),
-            is_gluten_free=data.get('is_gluten_free', False),
-            is_vegan=data.get('is_vegan', False),
-            is_sugar_free=data.get('is_sugar_free', False),
-            is_dairy_free=data.get('is_dairy_free', False),
-            toppings=data.get('toppings'),
-            decorations=data.get('decorations'),
-            message_on_cake=data.get('message_on_cake'),
-            base_price=base_price,
-            customization_price=customization_price,
-            notes=data.get('notes')
-        )
+            cake_price = cake.price
+        
+        # Option prices and dietary masks come from the in-memory pricing table (no queries)
+        table = get_pricing_table()
+        conflicts = table.diet_conflicts(data)
+        if conflicts:
+            raise _diet_conflict_error(conflicts)
+        base_price, customization_price = table.price_item(data, cake_price)
+        
+        # First item of a new visitor: only now is the cart row created
+        cart = get_or_create_cart()
+        cart_item = _new_cart_item(data, base_price, customization_price)
         
-        db.session.add(cart_item)
-        db.session.commit()
+        store = cart_store(cart)
+        store.add_item(cart, cart_item)
+        store.commit(cart)
         
         current_app.logger.info(
             f"Item added to cart",
@@ -177,10 +218,13 @@ def add_to_cart():
             }
         )
         
+        if mode == 'delta':
+            return jsonify(_delta_response(store, cart, item=cart_item)), 201
+        
         # Return updated cart
-        return jsonify(cart_schema.dump(cart)), 201
+        return jsonify(cart_schema.dump(store.render(cart))), 201
         
-    except (ResourceNotFoundError, ValidationError):
+    except (ResourceNotFoundError, ValidationError, ConflictError):
         raise
     except Exception as e:
         current_app.logger.error(f"Error adding to cart: {e}", exc_info=True)
@@ -188,37 +232,127 @@ def add_to_cart():
         raise DatabaseError("Failed to add item to cart")
 
 
+@cart_bp.route('/cart/items', methods=['PATCH'])
+@validate_request(CartOperationsSchema)
+def apply_cart_operations():
+    """
+    Apply an ordered list of add/update/remove operations in one transaction.
+    
+    Everything is validated and priced before the cart is touched: catalog
+    cake prices in one IN query for all adds, options from the in-memory
+    pricing table, and the referenced items in one more query. Either every
+    operation is applied and committed together, or none is.
+    
+    Request Body:
+        operations (list): {"op": "add", ...item fields},
+                           {"op": "update", "id": <item id>, ...fields to change},
+                           {"op": "remove", "id": <item id>}
+                           Updates take quantity, cake_shape, cake_size,
+                           message_on_cake and notes; a new cake_size is
+                           priced from the same pricing table as the adds.
+    
+    Returns:
+        JSON: The updated cart
+    """
+    try:
+        operations = request.validated_data['operations']
+        adds = [operation['item'] for operation in operations if operation['op'] == 'add']
+        
+        # Catalog cake prices for all adds at once
+        cake_prices = load_cake_prices(item.get('cake_id') for item in adds)
+        missing = missing_cake_ids(adds, cake_prices)
+        if missing:
+            raise ResourceNotFoundError("Cake not found", payload={'missing_cake_ids': missing})
+        
+        table = get_pricing_table()
+        prices = {}
+        for index, operation in enumerate(operations):
+            if operation['op'] != 'add':
+                continue
+            data = operation['item']
+            conflicts = table.diet_conflicts(data)
+            if conflicts:
+                raise _diet_conflict_error(conflicts, operation=index)
+            prices[index] = table.price_item(
+                data, cake_prices[data['cake_id']] if data.get('cake_id') else None
+            )
+        
+        # Every referenced item must exist when its operation runs
+        cart = find_cart()
+        items = cart_store(cart).get_items(cart, {
+            operation['id'] for operation in operations if operation['op'] != 'add'
+        }) if cart else {}
+        present = set(items)
+        for index, operation in enumerate(operations):
+            if operation['op'] == 'add':
+                continue
+            if operation['id'] not in present:
+                raise ResourceNotFoundError(
+                    "Cart item not found", payload={'operation': index, 'item_id': operation['id']}
+                )
+            if operation['op'] == 'remove':
+                present.discard(operation['id'])
+        
+        # Only now, and only for adds, is a missing cart created
+        if cart is None:
+            cart = get_or_create_cart()
+        store = cart_store(cart)
+        for index, operation in enumerate(operations):
+            if operation['op'] == 'add':
+                store.add_item(cart, _new_cart_item(operation['item'], *prices[index]))
+            elif operation['op'] == 'update':
+                _apply_item_update(store, cart, items[operation['id']], operation['item'])
+            else:
+                store.remove_item(cart, items[operation['id']])
+        store.commit(cart)
+        
+        current_app.logger.info(
+            f"Cart operations applied",
+            extra={'cart_id': cart.id, 'operations': len(operations)}
+        )
+        
+        return jsonify(cart_schema.dump(store.render(cart))), 200
+        
+    except (ResourceNotFoundError, ValidationError, ConflictError):
+        db.session.rollback()
+        raise
+    except Exception as e:
+        current_app.logger.error(f"Error applying cart operations: {e}", exc_info=True)
+        db.session.rollback()
+        raise DatabaseError("Failed to update cart")
+
+
 @cart_bp.route('/cart/items/<int:item_id>', methods=['PUT'])
 @validate_request(CartItemCreateSchema)
 def update_cart_item(item_id):
-    """Update cart item."""
+    """
+    Update cart item.
+    
+    Query Parameters:
+        response (str): 'full' (default) for the whole cart, 'delta' for the
+                        updated item, totals and version only
+    """
     try:
-        cart = get_or_create_cart()
+        mode = _response_mode()
+        cart = find_cart()
         
-        cart_item = CartItem.query.filter_by(
-            id=item_id,
-            cart_id=cart.id
-        ).first()
+        # No cart yet means no items to find (and nothing to create)
+        cart_item = cart_store(cart).get_item(cart, item_id) if cart else None
         
         if not cart_item:
             raise ResourceNotFoundError("Cart item not found")
         
-        data = request.validated_data
-        
-        # Update fields
-        cart_item.quantity = data.get('quantity', cart_item.quantity)
-        cart_item.cake_shape = data.get('cake_shape', cart_item.cake_shape)
-        cart_item.cake_size = data.get('cake_size', cart_item.cake_size)
-        cart_item.message_on_cake = data.get('message_on_cake', cart_item.message_on_cake)
-        cart_item.notes = data.get('notes', cart_item.notes)
-        
-        db.session.commit()
+        store = cart_store(cart)
+        _apply_item_update(store, cart, cart_item, request.validated_data)
+        store.commit(cart)
         
         current_app.logger.info(f"Cart item updated: {item_id}")
         
-        return jsonify(cart_schema.dump(cart)), 200
+        if mode == 'delta':
+            return jsonify(_delta_response(store, cart, item=cart_item)), 200
+        return jsonify(cart_schema.dump(store.render(cart))), 200
         
-    except ResourceNotFoundError:
+    except (ResourceNotFoundError, ValidationError, ConflictError):
         raise
     except Exception as e:
         current_app.logger.error(f"Error updating cart item: {e}", exc_info=True)
@@ -228,26 +362,34 @@ def update_cart_item(item_id):
 
 @cart_bp.route('/cart/items/<int:item_id>', methods=['DELETE'])
 def remove_from_cart(item_id):
-    """Remove item from cart."""
+    """
+    Remove item from cart.
+    
+    Query Parameters:
+        response (str): 'full' (default) for the whole cart, 'delta' for the
+                        removed id, totals and version only
+    """
     try:
-        cart = get_or_create_cart()
+        mode = _response_mode()
+        cart = find_cart()
         
-        cart_item = CartItem.query.filter_by(
-            id=item_id,
-            cart_id=cart.id
-        ).first()
+        # No cart yet means no items to find (and nothing to create)
+        cart_item = cart_store(cart).get_item(cart, item_id) if cart else None
         
         if not cart_item:
             raise ResourceNotFoundError("Cart item not found")
         
-        db.session.delete(cart_item)
-        db.session.commit()
+        store = cart_store(cart)
+        store.remove_item(cart, cart_item)
+        store.commit(cart)
         
         current_app.logger.info(f"Cart item removed: {item_id}")
         
-        return jsonify(cart_schema.dump(cart)), 200
+        if mode == 'delta':
+            return jsonify(_delta_response(store, cart, removed_id=item_id)), 200
+        return jsonify(cart_schema.dump(store.render(cart))), 200
         
-    except ResourceNotFoundError:
+    except (ResourceNotFoundError, ValidationError, ConflictError):
         raise
     except Exception as e:
         current_app.logger.error(f"Error removing cart item: {e}", exc_info=True)
@@ -259,15 +401,19 @@ def remove_from_cart(item_id):
 def clear_cart():
     """Clear all items from cart."""
     try:
-        cart = get_or_create_cart()
-        
-        CartItem.query.filter_by(cart_id=cart.id).delete()
-        db.session.commit()
+        cart = find_cart()
         
-        current_app.logger.info(f"Cart cleared: {cart.id}")
+        if cart:
+            store = cart_store(cart)
+            store.clear(cart)
+            store.commit(cart)
+            
+            current_app.logger.info(f"Cart cleared: {cart.id or cart.session_id}")
         
         return jsonify({'message': 'Cart cleared successfully'}), 200
         
+    except ConflictError:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error clearing cart: {e}", exc_info=True)
         db.session.rollback()
@@ -280,12 +426,10 @@ def upload_reference_image(item_id):
     Upload reference image for custom cake using Cloudinary.
     """
     try:
-        cart = get_or_create_cart()
+        cart = find_cart()
         
-        cart_item = CartItem.query.filter_by(
-            id=item_id,
-            cart_id=cart.id
-        ).first()
+        # No cart yet means no items to find (and nothing to create)
+        cart_item = cart_store(cart).get_item(cart, item_id) if cart else None
         
         if not cart_item:
             raise ResourceNotFoundError("Cart item not found")
@@ -304,14 +448,14 @@ def upload_reference_image(item_id):
         
         # Save image record
         image = CartItemImage(
-            cart_item_id=cart_item.id,
             image_url=upload_result['secure_url'],
             image_filename=file.filename,
             description=request.form.get('description', '')
         )
         
-        db.session.add(image)
-        db.session.commit()
+        store = cart_store(cart)
+        store.add_image(cart, cart_item, image)
+        store.commit(cart)
         
         current_app.logger.info(
             f"Reference image uploaded for cart item: {item_id}"
@@ -326,7 +470,7 @@ def upload_reference_image(item_id):
             }
         }), 201
         
-    except (ResourceNotFoundError, ValidationError):
+    except (ResourceNotFoundError, ValidationError, ConflictError):
         raise
     except Exception as e:
         current_app.logger.error(f"Error uploading image: {e}", exc_info=True)
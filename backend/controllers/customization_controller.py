@@ -61,10 +61,18 @@
 #     db.session.commit()
 #     return "", 204
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from extensions import db
 from models.customization import CustomizationOption
 from marshmallow import Schema, fields
+from utils.cache import option_cache, cached_json_response
+from utils.http_cache import conditional_get
+from services.typeahead_service import typeahead_index
+from services.option_payload_service import (
+    build_grouped_payloads, active_options, get_grouped_payloads
+)
+from services.pricing_service import parse_diets
+from utils.exceptions import ValidationError
 
 customization_bp = Blueprint("customizations", __name__, url_prefix="/api")
 
@@ -81,32 +89,44 @@ customization_option_schema = CustomizationOptionSchema()
 customization_options_schema = CustomizationOptionSchema(many=True)
 
 
+def _sync_flavor_suggestion(option):
+    """Keep the typeahead index in step with active flavor options."""
+    if option.category == 'flavor' and option.active:
+        typeahead_index.upsert('flavor', option.id, option.name)
+    else:
+        typeahead_index.remove('flavor', option.id)
+
+
+def _build_customization_payloads():
+    """Grouped payloads in the array structure the frontend expects:
+    [{"category": "Design", "options": [...]}, ...]"""
+    return build_grouped_payloads(
+        active_options(CustomizationOption.category, CustomizationOption.price),
+        customization_options_schema.dump,
+        lambda groups: [
+            {"category": cat, "options": options_list}
+            for cat, options_list in groups.items()
+        ],
+    )
+
+
 # Get all active customizations, GROUPED BY CATEGORY (Crucial for the frontend)
+# Revalidated against the option table's fingerprint, then served from
+# pre-serialized bytes; rebuilt only after an option changes.
+# ?category=<name> returns just that category's group.
+# ?diet=vegan,gluten_free keeps only options compatible with every listed
+# diet (filtered in memory by bitmask, no query).
 @customization_bp.route("/customizations", methods=["GET"])
+@conditional_get(CustomizationOption)
 def get_customizations():
-    # Fetch all active options
-    customizations = CustomizationOption.query.filter_by(active=True).order_by(CustomizationOption.category, CustomizationOption.price).all()
-    grouped = {}
-    
-    # Group the options into a dictionary: { "Category": [option1, option2], ... }
-    for c in customizations:
-        # Use a sensible display name for the category if needed, otherwise use the category itself
-        category_name = c.category 
-        if category_name not in grouped:
-            grouped[category_name] = []
-            
-        # Append the serialized option data
-        grouped[category_name].append(customization_option_schema.dump(c))
-        
-    # Convert the grouped dictionary into the array structure the frontend expects:
-    # [{"category": "Design", "options": [...]}, ...]
-    result_array = [
-        {"category": cat, "options": options_list}
-        for cat, options_list in grouped.items()
-    ]
-
-    # Return the structured array
-    return jsonify(result_array), 200
+    try:
+        diet = parse_diets(request.args.get("diet", ""))
+    except ValueError as e:
+        raise ValidationError(str(e))
+    payloads = get_grouped_payloads(
+        'customizations', _build_customization_payloads, g.table_fingerprint
+    )
+    return cached_json_response(payloads.body(request.args.get("category"), diet))
 
 @customization_bp.route("/customizations/categories", methods=["GET"])
 def get_unique_categories():
@@ -129,6 +149,8 @@ def add_customization():
     )
     db.session.add(new_item)
     db.session.commit()
+    option_cache.bump()
+    _sync_flavor_suggestion(new_item)
     return jsonify(customization_option_schema.dump(new_item)), 201
 
 
@@ -149,6 +171,8 @@ def update_customization(id):
         customization.active = data.get("active")
         
     db.session.commit()
+    option_cache.bump()
+    _sync_flavor_suggestion(customization)
     return jsonify(customization_option_schema.dump(customization)), 200
 
 
@@ -158,4 +182,6 @@ def delete_customization(id):
     customization = CustomizationOption.query.get_or_404(id)
     db.session.delete(customization)
     db.session.commit()
+    option_cache.bump()
+    typeahead_index.remove('flavor', id)
     return "", 204
\ No newline at end of file
@@ -1,17 +1,27 @@
 # backend/controllers/order_controller.py
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy.orm import selectinload
 import json
 
 from extensions import db
 from models.order import Order, OrderItem, OrderItemImage
 from models.cart import Cart, CartItem
 from models.User import User
+from marshmallow import ValidationError as MarshmallowValidationError
 from schemas.order_schema import (
-    OrderSchema, OrderCreateSchema, OrderUpdateStatusSchema
+    OrderSchema, OrderCreateSchema, OrderItemCreateSchema, OrderUpdateStatusSchema
 )
 from utils.validators import validate_request
+from utils.fast_serializer import compile_schema
+from services.pricing_service import (
+    PricingTable, load_cake_prices, missing_cake_ids, load_template_prices,
+    missing_template_ids, unpriced_item_indexes, quote_items
+)
+from utils.fieldsets import (
+    requested_fields, schema_fields, schema_attributes, projected_schema, projection_options
+)
 from utils.exceptions import (
     ResourceNotFoundError, ValidationError, DatabaseError, AuthorizationError
 )
@@ -22,14 +32,24 @@ from utils.email_service import (
 
 order_bp = Blueprint('orders', __name__)
 
-order_schema = OrderSchema()
-orders_schema = OrderSchema(many=True)
+order_schema = compile_schema(OrderSchema())
+orders_schema = compile_schema(OrderSchema(many=True))
+order_item_create_schema = OrderItemCreateSchema(many=True)
+
+# VAT applied to the item subtotal at checkout
+TAX_RATE = 0.16
 
 def generate_order_number():
     """Generate unique order number."""
-    date_str = datetime.now().strftime('%Y%m%d')
+    today = datetime.now()
+    date_str = today.strftime('%Y%m%d')
+    next_str = (today + timedelta(days=1)).strftime('%Y%m%d')
+    # Range between today's and tomorrow's prefixes instead of LIKE, so the
+    # unique order_number index is used (PostgreSQL only uses a btree index
+    # for LIKE under the C collation)
     count = Order.query.filter(
-        Order.order_number.like(f'ORD-{date_str}-%')
+        Order.order_number >= f'ORD-{date_str}-',
+        Order.order_number < f'ORD-{next_str}-'
     ).count()
     return f'ORD-{date_str}-{count + 1:03d}'
 
@@ -54,11 +74,52 @@ def create_order():
         if not cart_items_data:
             return jsonify({"message": "No items in order"}), 400
         
-        # 🛡️ CHANGE 2: Use prices calculated by Frontend (or recalculate here)
-        subtotal = float(data.get('subtotal', 0))
-        delivery_fee = float(data.get('delivery_fee', 500.0))
-        tax = float(data.get('tax', subtotal * 0.16))
-        total = float(data.get('total_price', subtotal + delivery_fee + tax))
+        # 🛡️ CHANGE 2: Recompute every price server-side; client prices are ignored
+        try:
+            priced_items = order_item_create_schema.load(cart_items_data)
+        except MarshmallowValidationError as err:
+            raise ValidationError(
+                message="Validation failed",
+                payload={'validation_errors': {'cart_items': err.messages}}
+            )
+        
+        # One IN query each for the cakes, the portfolio designs and the
+        # options of the whole order
+        cake_prices = load_cake_prices(item.get('cake_id') for item in priced_items)
+        missing = missing_cake_ids(priced_items, cake_prices)
+        if missing:
+            raise ResourceNotFoundError("Cake not found", payload={'missing_cake_ids': missing})
+        template_prices = load_template_prices(item.get('template_id') for item in priced_items)
+        missing = missing_template_ids(priced_items, template_prices)
+        if missing:
+            raise ResourceNotFoundError(
+                "Cake template not found", payload={'missing_template_ids': missing}
+            )
+        table = PricingTable.load_for(priced_items)
+        # Every line is priced from the same source the cart used; a line
+        # with nothing to price it from is rejected, never charged as 0
+        unpriced = unpriced_item_indexes(priced_items, table)
+        if unpriced:
+            raise ValidationError(
+                "Some items cannot be priced", payload={'unpriced_items': unpriced}
+            )
+        quote = quote_items(priced_items, cake_prices, table, template_prices)
+        
+        subtotal = quote['total']
+        # The fee comes from configuration; a client value must match it
+        delivery_fee = current_app.config['DELIVERY_FEE']
+        if 'delivery_fee' in data:
+            try:
+                client_fee = float(data['delivery_fee'])
+            except (TypeError, ValueError):
+                client_fee = None
+            if client_fee != delivery_fee:
+                raise ValidationError(
+                    "Invalid delivery fee",
+                    payload={'delivery_fee': delivery_fee}
+                )
+        tax = subtotal * TAX_RATE
+        total = subtotal + delivery_fee + tax
         
         order = Order(
             order_number=generate_order_number(),
@@ -81,19 +142,11 @@ def create_order():
         db.session.flush() # Gets us the order.id
         
         # 🛡️ CHANGE 3: Loop through the JSON items from frontend
-        # Inside create_order function, after db.session.flush()
-        
-        for item in data.get('cart_items', []):
-            # Calculate a fallback price if not provided
-            item_base_price = float(item.get('base_price', 0))
-            if item_base_price <= 0:
-                # If frontend didn't send base_price, use subtotal / quantity as safety
-                item_base_price = float(data.get('subtotal', 0)) / len(data.get('cart_items', [1]))
-
+        for item, priced, line in zip(cart_items_data, priced_items, quote['items']):
             order_item = OrderItem(
                 order_id=order.id,
-                cake_id=item.get('cake_id'),
-                quantity=item.get('quantity', 1),
+                cake_id=priced.get('cake_id'),
+                quantity=priced['quantity'],
                 
                 # 🔑 FIX: Provide default strings for "NOT NULL" columns 
                 # to prevent the psycopg2.errors.NotNullViolation
@@ -104,24 +157,30 @@ def create_order():
                 filling=item.get('filling', 'None'),
                 frosting=item.get('frosting', 'Standard'),
                 
-                # 💰 THE CRITICAL FIX: Ensure these are never None
-                base_price=item_base_price,
-                customization_price=float(item.get('customization_price', 0.0)),
-                unit_price=float(item.get('unit_price', item_base_price)),
-                subtotal=float(item.get('subtotal', item_base_price * item.get('quantity', 1))),
+                # 💰 Prices from the catalog, never from the request
+                base_price=line['base_price'],
+                customization_price=line['customization_price'],
+                unit_price=line['unit_price'],
+                subtotal=line['subtotal'],
+                toppings=json.dumps(priced['toppings']) if priced['toppings'] else None,
                 
                 notes=str(item.get('customizations', '')),
                 
-                # Defaults for booleans (from your SQL log, these seem to be f/false)
-                is_gluten_free=item.get('is_gluten_free', False),
-                is_vegan=item.get('is_vegan', False),
-                is_sugar_free=item.get('is_sugar_free', False),
-                is_dairy_free=item.get('is_dairy_free', False)
+                is_gluten_free=priced['is_gluten_free'],
+                is_vegan=priced['is_vegan'],
+                is_sugar_free=priced['is_sugar_free'],
+                is_dairy_free=priced['is_dairy_free']
             )
             db.session.add(order_item)
         
         db.session.commit()
         
+        # Reload with items, cakes and images in a fixed number of queries
+        order = Order.query.options(
+            selectinload(Order.items).selectinload(OrderItem.cake),
+            selectinload(Order.items).selectinload(OrderItem.reference_images)
+        ).filter_by(id=order.id).one()
+        
         try:
             send_order_confirmation_email(order)
         except Exception as e:
@@ -129,6 +188,9 @@ def create_order():
             
         return jsonify(order_schema.dump(order)), 201
         
+    except (ResourceNotFoundError, ValidationError):
+        db.session.rollback()
+        raise
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Order Error: {e}")
@@ -147,13 +209,25 @@ def get_my_orders():
         user = User.query.get(int(user_id))
         if not user:
             return jsonify({"message": "User not found"}), 404
-            
-        if user.is_admin:
-            orders = Order.query.order_by(Order.created_at.desc()).all()
-        else:
-            orders = Order.query.filter_by(user_id=user_id).order_by(Order.created_at.desc()).all()
         
-        return jsonify(orders_schema.dump(orders)), 200
+        query = Order.query
+        if not user.is_admin:
+            query = query.filter_by(user_id=user_id)
+        
+        # Sparse fieldsets (?fields=): skip unused columns and nested items
+        schema = orders_schema
+        fields = requested_fields(schema_fields(OrderSchema))
+        if fields is not None:
+            schema = projected_schema(OrderSchema, fields)
+            query = query.options(*projection_options(
+                Order, schema_attributes(OrderSchema, fields)
+            ))
+        
+        orders = query.order_by(Order.created_at.desc()).all()
+        
+        return jsonify(schema.dump(orders)), 200
+    except ValidationError:
+        raise
     except Exception as e:
         return jsonify({"message": str(e)}), 401
 
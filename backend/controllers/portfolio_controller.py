@@ -1,18 +1,32 @@
 # backend/controllers/portfolio_controller.py
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, g
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 
 from extensions import db
 from models.customization import CakeTemplate, CakeTemplateImage, CustomizationOption
+from models.cart import CartItem
 from models.User import User
 from schemas.customization_schema import (
     CakeTemplateSchema, CakeTemplateCreateSchema,
     CustomizationOptionSchema, CustomizationOptionCreateSchema
 )
+from schemas.cart_schema import CartSchema, TemplateCartItemSchema
 from utils.validators import validate_request, validate_pagination_params
+from utils.fast_serializer import compile_schema
+from utils.http_cache import conditional_get
+from utils.cache import cached_json_response
+from utils.pagination import cursor_requested, keyset_paginate
+from utils.fieldsets import (
+    requested_fields, schema_fields, schema_attributes, projected_schema, projection_options
+)
 from utils.exceptions import (
-    ResourceNotFoundError, ValidationError, AuthorizationError, DatabaseError
+    ResourceNotFoundError, ValidationError, AuthorizationError, ConflictError, DatabaseError
+)
+from services.option_payload_service import (
+    build_grouped_payloads, active_options, get_grouped_payloads
 )
+from services.cart_service import get_or_create_cart, cart_store
+from services.pricing_service import get_pricing_table
 
 portfolio_bp = Blueprint('portfolio', __name__)
 
@@ -20,6 +34,7 @@ template_schema = CakeTemplateSchema()
 templates_schema = CakeTemplateSchema(many=True)
 option_schema = CustomizationOptionSchema()
 options_schema = CustomizationOptionSchema(many=True)
+cart_schema = compile_schema(CartSchema())
 
 # --- HELPER FOR OPTIONS REQUESTS ---
 def handle_options():
@@ -28,6 +43,7 @@ def handle_options():
     return False
 
 @portfolio_bp.route('/portfolio', methods=['GET', 'OPTIONS'])
+@conditional_get(CakeTemplate, CakeTemplateImage)
 def get_portfolio_cakes():
     if handle_options(): return '', 200
     
@@ -46,6 +62,37 @@ def get_portfolio_cakes():
         if featured_only:
             query = query.filter_by(is_featured=True)
         
+        # Sparse fieldsets: only select the columns the response needs
+        schema = templates_schema
+        fields = requested_fields(schema_fields(CakeTemplateSchema))
+        if fields is not None:
+            schema = projected_schema(CakeTemplateSchema, fields)
+            query = query.options(*projection_options(
+                CakeTemplate,
+                schema_attributes(CakeTemplateSchema, fields),
+                always=('is_featured', 'sort_order', 'created_at')
+            ))
+        
+        if cursor_requested():
+            cakes, next_cursor = keyset_paginate(
+                query,
+                [
+                    (CakeTemplate.is_featured, True),
+                    (CakeTemplate.sort_order, False),
+                    (CakeTemplate.created_at, True),
+                    (CakeTemplate.id, True)
+                ],
+                request.args.get('cursor', ''),
+                per_page
+            )
+            return jsonify({
+                'cakes': schema.dump(cakes),
+                'pagination': {
+                    'per_page': per_page,
+                    'next_cursor': next_cursor
+                }
+            }), 200
+        
         cakes = query.order_by(
             CakeTemplate.is_featured.desc(),
             CakeTemplate.sort_order,
@@ -53,7 +100,7 @@ def get_portfolio_cakes():
         ).paginate(page=page, per_page=per_page, error_out=False)
         
         return jsonify({
-            'cakes': templates_schema.dump(cakes.items),
+            'cakes': schema.dump(cakes.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -62,52 +109,47 @@ def get_portfolio_cakes():
             }
         }), 200
         
+    except ValidationError:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error retrieving portfolio: {e}")
         return jsonify({"error": "Failed to retrieve portfolio"}), 500
 
+def _build_option_payloads():
+    """Options grouped as {category: [options]} (whole and per category)."""
+    return build_grouped_payloads(
+        active_options(CustomizationOption.category, CustomizationOption.sort_order),
+        options_schema.dump,
+        dict,
+    )
+
 @portfolio_bp.route('/customization/options', methods=['GET', 'OPTIONS'])
+@conditional_get(CustomizationOption)
 def get_customization_options():
     if handle_options(): return '', 200
     
     try:
-        category = request.args.get('category')
-        
-        # NOTE: Updated from is_active to match your DB error logic
-        # If your DB column is 'active', change is_active=True to active=True
-        query = CustomizationOption.query
-        
-        # Only filter if the column exists to avoid 500 errors
-        if hasattr(CustomizationOption, 'is_active'):
-            query = query.filter_by(is_active=True)
-        elif hasattr(CustomizationOption, 'active'):
-            query = query.filter_by(active=True)
-        
-        if category:
-            query = query.filter_by(category=category)
-        
-        options = query.order_by(
-            CustomizationOption.category,
-            CustomizationOption.sort_order
-        ).all()
-        
-        # Use schema instead of to_dict() for consistency
-        data = options_schema.dump(options)
-        
-        # Group by category
-        grouped = {}
-        for option in data:
-            cat = option.get('category', 'Other')
-            if cat not in grouped:
-                grouped[cat] = []
-            grouped[cat].append(option)
-        
-        return jsonify(grouped), 200
+        # Pre-serialized grouped payload; rebuilt only after an option changes
+        payloads = get_grouped_payloads(
+            'customization_options', _build_option_payloads, g.table_fingerprint
+        )
+        return cached_json_response(payloads.body(request.args.get('category')))
         
     except Exception as e:
         current_app.logger.error(f"Error retrieving options: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _increment_counter(template_id, column):
+    """
+    Atomic counter increment in the caller's transaction. updated_at is
+    set to itself so counters never change the portfolio's fingerprint
+    (and so its ETag).
+    """
+    CakeTemplate.query.filter_by(id=template_id).update(
+        {column: db.func.coalesce(column, 0) + 1, CakeTemplate.updated_at: CakeTemplate.updated_at},
+        synchronize_session=False
+    )
+
 @portfolio_bp.route('/portfolio/cakes/<int:cake_id>', methods=['GET', 'OPTIONS'])
 def get_portfolio_cake(cake_id):
     if handle_options(): return '', 200
@@ -117,13 +159,92 @@ def get_portfolio_cake(cake_id):
         if not cake:
             return jsonify({"error": "Cake not found"}), 404
         
-        cake.views_count += 1
+        _increment_counter(cake.id, CakeTemplate.views_count)
         db.session.commit()
         
         return jsonify(template_schema.dump(cake)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@portfolio_bp.route('/portfolio/cakes/<int:cake_id>/add-to-cart', methods=['POST'])
+@validate_request(TemplateCartItemSchema)
+def add_template_to_cart(cake_id):
+    """
+    "Order this design": add a portfolio cake to the cart as designed.
+    
+    The cart item takes the template's default shape, size, layers, flavor,
+    frosting and base price; dietary surcharges come from the cached
+    pricing table. The template's orders_count is incremented in the same
+    transaction as the insert.
+    
+    Request Body:
+        quantity (int): Defaults to 1
+        is_vegan, is_gluten_free (bool): Only where the design allows it
+        message_on_cake, notes (str): Optional
+    
+    Returns:
+        JSON: The updated cart
+    """
+    try:
+        template = CakeTemplate.query.get(cake_id)
+        if not template or not template.is_available:
+            raise ResourceNotFoundError("Cake not found")
+        
+        data = request.validated_data
+        if data['is_vegan'] and not template.can_be_vegan:
+            raise ValidationError("This design cannot be made vegan")
+        if data['is_gluten_free'] and not template.can_be_gluten_free:
+            raise ValidationError("This design cannot be made gluten-free")
+        
+        item = dict(
+            data,
+            cake_shape=template.default_shape,
+            cake_size=template.default_size,
+            cake_layers=template.default_layers,
+            flavor=template.default_flavor,
+            frosting=template.default_frosting,
+        )
+        
+        # Dietary masks and surcharges from the in-memory pricing table (no queries)
+        table = get_pricing_table()
+        conflicts = table.diet_conflicts(item)
+        if conflicts:
+            raise ValidationError(
+                message="This design's options do not fit the dietary requirements",
+                payload={'incompatible_options': [
+                    {'id': entry.id, 'category': entry.category, 'name': entry.name}
+                    for entry in conflicts
+                ]}
+            )
+        base_price, customization_price = table.price_item(item, template.base_price)
+        
+        cart = get_or_create_cart()
+        cart_item = CartItem(
+            template_id=template.id,
+            base_price=base_price,
+            customization_price=customization_price,
+            notes=data.get('notes') or f"Portfolio design: {template.name}",
+            **{field: item.get(field) for field in (
+                'quantity', 'cake_shape', 'cake_size', 'cake_layers', 'flavor',
+                'frosting', 'is_gluten_free', 'is_vegan', 'message_on_cake'
+            )}
+        )
+        store = cart_store(cart)
+        store.add_item(cart, cart_item)
+        # Atomic increment, committed together with the cart item and totals
+        _increment_counter(template.id, CakeTemplate.orders_count)
+        store.commit(cart)
+        
+        return jsonify(cart_schema.dump(store.render(cart))), 201
+        
+    except (ResourceNotFoundError, ValidationError, ConflictError):
+        db.session.rollback()
+        raise
+    except Exception as e:
+        current_app.logger.error(f"Error adding design to cart: {e}", exc_info=True)
+        db.session.rollback()
+        raise DatabaseError("Failed to add design to cart")
+
 # --- ADMIN ROUTES (Ensured they handle OPTIONS) ---
 
 @portfolio_bp.route('/admin/portfolio/cakes', methods=['POST', 'OPTIONS'])
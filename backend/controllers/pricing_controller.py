@@ -0,0 +1,48 @@
+# backend/controllers/pricing_controller.py
+from flask import Blueprint, jsonify, request
+from schemas.pricing_schema import PriceQuoteSchema
+from services.pricing_service import (
+    load_cake_prices, missing_cake_ids, load_template_prices, missing_template_ids, quote_items
+)
+from utils.exceptions import ResourceNotFoundError
+from utils.validators import validate_request
+
+pricing_bp = Blueprint('pricing', __name__)
+
+
+@pricing_bp.route('/pricing/quote', methods=['POST'])
+@validate_request(PriceQuoteSchema)
+def quote():
+    """
+    Price a batch of cake configurations without adding anything to a cart.
+
+    Request Body:
+        items (list): Up to 100 configurations, each with cake_id,
+                      template_id or cake_size, plus quantity, toppings
+                      and dietary flags
+
+    Returns:
+        JSON: Per-line base, customization, unit and subtotal prices (in
+              request order) and the batch total
+
+    Example:
+        POST /api/pricing/quote
+        {"items": [{"cake_size": "Large", "toppings": [3, 4], "is_vegan": true},
+                   {"cake_id": 12, "quantity": 2}]}
+    """
+    items = request.validated_data['items']
+
+    # One IN query each for catalog cakes and portfolio designs; option
+    # prices come from the pricing table
+    cake_prices = load_cake_prices(item.get('cake_id') for item in items)
+    missing = missing_cake_ids(items, cake_prices)
+    if missing:
+        raise ResourceNotFoundError("Cake not found", payload={'missing_cake_ids': missing})
+    template_prices = load_template_prices(item.get('template_id') for item in items)
+    missing = missing_template_ids(items, template_prices)
+    if missing:
+        raise ResourceNotFoundError(
+            "Cake template not found", payload={'missing_template_ids': missing}
+        )
+
+    return jsonify(quote_items(items, cake_prices, template_prices=template_prices)), 200
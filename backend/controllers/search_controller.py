@@ -0,0 +1,100 @@
+# backend/controllers/search_controller.py
+from flask import Blueprint, jsonify, request, current_app
+from schemas.cake_schema import CakeBaseSchema
+from schemas.customization_schema import CakeTemplateSchema
+from services.search_service import search_catalog
+from services.typeahead_service import typeahead_index
+from utils.exceptions import ValidationError, DatabaseError
+from utils.validators import validate_pagination_params
+
+search_bp = Blueprint('search', __name__)
+
+cake_schema = CakeBaseSchema()
+template_schema = CakeTemplateSchema()
+
+
+@search_bp.route('/search', methods=['GET'])
+def search():
+    """
+    Full-text search over cakes and portfolio templates.
+    
+    Query Parameters:
+        - q (str): Search text (required)
+        - page (int): Page number (default: 1)
+        - per_page (int): Results per page (default: 20, max: 100)
+    
+    Returns:
+        JSON: Ranked results, each tagged with its type ('cake' or 'template')
+    
+    Example:
+        GET /api/search?q=chocolate+birthday
+    """
+    q = request.args.get('q', '').strip()
+    if not q:
+        raise ValidationError("Search query 'q' is required")
+    if len(q) > 200:
+        raise ValidationError("Search query is too long")
+    
+    page, per_page = validate_pagination_params()
+    
+    try:
+        hits, has_next = search_catalog(q, page, per_page)
+    except Exception as e:
+        current_app.logger.error(f"Error searching catalog: {e}", exc_info=True)
+        raise DatabaseError("Failed to search catalog")
+    
+    results = []
+    for kind, instance, rank in hits:
+        schema = cake_schema if kind == 'cake' else template_schema
+        results.append({
+            'type': kind,
+            'rank': rank,
+            'item': schema.dump(instance)
+        })
+    
+    current_app.logger.info(
+        f"Catalog search",
+        extra={'q': q, 'page': page, 'results': len(results)}
+    )
+    
+    return jsonify({
+        'query': q,
+        'results': results,
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'has_next': has_next
+        }
+    }), 200
+
+
+@search_bp.route('/search/suggest', methods=['GET'])
+def suggest():
+    """
+    Search-as-you-type suggestions answered from the in-memory index.
+    
+    Query Parameters:
+        - prefix (str): What the user has typed so far
+        - limit (int): Maximum suggestions (default: 10, max: 20)
+    
+    Returns:
+        JSON: Matching cake, template, category and flavor names
+    
+    Example:
+        GET /api/search/suggest?prefix=choc
+    """
+    prefix = request.args.get('prefix', '')
+    if len(prefix) > 100:
+        raise ValidationError("Prefix is too long")
+    
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        raise ValidationError("Invalid limit")
+    if limit < 1 or limit > 20:
+        raise ValidationError("Limit must be between 1 and 20")
+    
+    return jsonify({
+        'prefix': prefix,
+        'suggestions': typeahead_index.suggest(prefix, limit)
+    }), 200
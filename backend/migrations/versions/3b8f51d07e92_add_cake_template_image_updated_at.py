@@ -0,0 +1,26 @@
+"""add cake template image updated_at
+
+Revision ID: 3b8f51d07e92
+Revises: 7d2e9b41c6a3
+Create Date: 2026-10-17 10:03:17.552190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8f51d07e92'
+down_revision = '7d2e9b41c6a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cake_template_image', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('cake_template_image', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
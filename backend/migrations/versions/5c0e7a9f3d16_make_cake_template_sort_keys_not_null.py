@@ -0,0 +1,69 @@
+"""make cake template sort keys not null
+
+Revision ID: 5c0e7a9f3d16
+Revises: 3b8f51d07e92
+Create Date: 2026-10-17 10:41:09.873521
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e7a9f3d16'
+down_revision = '3b8f51d07e92'
+branch_labels = None
+depends_on = None
+
+
+# SQLite rebuilds cake_template for these ALTERs, which drops the triggers
+# keeping cake_template_fts in sync (see fbbff6321d0c); they are re-created
+FTS_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS cake_template_fts_ai AFTER INSERT ON cake_template BEGIN "
+    "INSERT INTO cake_template_fts(rowid, name, description, category) "
+    "VALUES (new.id, new.name, new.description, new.category); END",
+    "CREATE TRIGGER IF NOT EXISTS cake_template_fts_ad AFTER DELETE ON cake_template BEGIN "
+    "INSERT INTO cake_template_fts(cake_template_fts, rowid, name, description, category) "
+    "VALUES ('delete', old.id, old.name, old.description, old.category); END",
+    "CREATE TRIGGER IF NOT EXISTS cake_template_fts_au AFTER UPDATE ON cake_template BEGIN "
+    "INSERT INTO cake_template_fts(cake_template_fts, rowid, name, description, category) "
+    "VALUES ('delete', old.id, old.name, old.description, old.category); "
+    "INSERT INTO cake_template_fts(rowid, name, description, category) "
+    "VALUES (new.id, new.name, new.description, new.category); END",
+]
+
+
+def _restore_fts_triggers():
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def upgrade():
+    # Keyset pages of the portfolio seek on these columns; NULL keys would
+    # never match the > / < conditions, so give existing rows the defaults
+    op.execute("UPDATE cake_template SET is_featured = false WHERE is_featured IS NULL")
+    op.execute("UPDATE cake_template SET sort_order = 0 WHERE sort_order IS NULL")
+    op.execute(
+        "UPDATE cake_template SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    )
+    with op.batch_alter_table('cake_template', schema=None) as batch_op:
+        batch_op.alter_column('is_featured', existing_type=sa.Boolean(), nullable=False,
+                              server_default=sa.false())
+        batch_op.alter_column('sort_order', existing_type=sa.Integer(), nullable=False,
+                              server_default='0')
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False,
+                              server_default=sa.func.current_timestamp())
+    _restore_fts_triggers()
+
+
+def downgrade():
+    with op.batch_alter_table('cake_template', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True,
+                              server_default=None)
+        batch_op.alter_column('sort_order', existing_type=sa.Integer(), nullable=True,
+                              server_default=None)
+        batch_op.alter_column('is_featured', existing_type=sa.Boolean(), nullable=True,
+                              server_default=None)
+    _restore_fts_triggers()
@@ -0,0 +1,30 @@
+"""add cart item template
+
+Revision ID: 7d2e9b41c6a3
+Revises: e5c81f0d2b47
+Create Date: 2026-10-17 09:12:44.218306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2e9b41c6a3'
+down_revision = 'e5c81f0d2b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('template_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            batch_op.f('cart_item_template_id_fkey'), 'cake_template', ['template_id'], ['id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.drop_constraint(batch_op.f('cart_item_template_id_fkey'), type_='foreignkey')
+        batch_op.drop_column('template_id')
@@ -0,0 +1,25 @@
+"""add cart updated_at index
+
+Revision ID: a94daeed75a2
+Revises: bb3729fd1a21
+Create Date: 2026-10-16 18:12:47.093125
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a94daeed75a2'
+down_revision = 'bb3729fd1a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Abandoned guest cart GC picks the oldest carts through this index
+    op.create_index('ix_cart_updated_at', 'cart', ['updated_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_cart_updated_at', table_name='cart')
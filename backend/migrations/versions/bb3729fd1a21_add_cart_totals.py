@@ -0,0 +1,37 @@
+"""add cart totals
+
+Revision ID: bb3729fd1a21
+Revises: c3a6a841b5ec
+Create Date: 2026-10-16 16:40:02.518364
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bb3729fd1a21'
+down_revision = 'c3a6a841b5ec'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cart', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_amount', sa.Float(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('item_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from the existing items; from here on they are kept by deltas
+    op.execute(
+        "UPDATE cart SET "
+        "total_amount = (SELECT coalesce(sum((base_price + coalesce(customization_price, 0)) * quantity), 0) "
+        "FROM cart_item WHERE cart_item.cart_id = cart.id), "
+        "item_count = (SELECT coalesce(sum(quantity), 0) "
+        "FROM cart_item WHERE cart_item.cart_id = cart.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('cart', schema=None) as batch_op:
+        batch_op.drop_column('item_count')
+        batch_op.drop_column('total_amount')
@@ -0,0 +1,64 @@
+"""add lookup indexes
+
+Revision ID: c3a6a841b5ec
+Revises: fbbff6321d0c
+Create Date: 2026-10-16 14:05:19.377214
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a6a841b5ec'
+down_revision = 'fbbff6321d0c'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) for every filter, join and sort the controllers issue
+INDEXES = [
+    # Orders: my orders, admin status filter, admin listing / keyset pages
+    ('ix_order_user_id_created_at', 'order', ['user_id', 'created_at']),
+    ('ix_order_status_created_at', 'order', ['status', 'created_at']),
+    ('ix_order_created_at_id', 'order', ['created_at', 'id']),
+    ('ix_order_item_order_id', 'order_item', ['order_id']),
+    ('ix_order_item_image_order_item_id', 'order_item_image', ['order_item_id']),
+    ('ix_order_customization_order_id', 'order_customization', ['order_id']),
+
+    # Carts: lookup by user or guest session, items and images per parent
+    ('ix_cart_user_id', 'cart', ['user_id']),
+    ('ix_cart_session_id', 'cart', ['session_id']),
+    ('ix_cart_item_cart_id', 'cart_item', ['cart_id']),
+    ('ix_cart_item_image_cart_item_id', 'cart_item_image', ['cart_item_id']),
+
+    # Customization options: pricing lookups by (category, name), listings
+    ('ix_customization_option_category_name_active', 'customization_option',
+     ['category', 'name', 'active']),
+    ('ix_customization_option_active_category_sort_order', 'customization_option',
+     ['active', 'category', 'sort_order']),
+
+    # Portfolio: gallery images, listing in display order
+    ('ix_cake_template_image_template_id', 'cake_template_image', ['template_id']),
+    ('ix_cake_template_listing', 'cake_template', [
+        'is_available',
+        sa.text('is_featured DESC'),
+        'sort_order',
+        sa.text('created_at DESC'),
+        sa.text('id DESC'),
+    ]),
+
+    # Admin listings
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+    ('ix_cake_name', 'cake', ['name']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,26 @@
+"""add cart version
+
+Revision ID: e5c81f0d2b47
+Revises: a94daeed75a2
+Create Date: 2026-10-16 19:26:31.804517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c81f0d2b47'
+down_revision = 'a94daeed75a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cart', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('cart', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,103 @@
+"""add full text search
+
+Revision ID: fbbff6321d0c
+Revises: 2f948b034560
+Create Date: 2026-10-16 09:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fbbff6321d0c'
+down_revision = '2f948b034560'
+branch_labels = None
+depends_on = None
+
+
+# Generated tsvector columns (names weigh more than categories and descriptions)
+SEARCH_VECTORS = {
+    'cake': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    'cake_template': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+}
+
+
+# FTS5 columns per table on SQLite, in bm25 weight order
+SEARCH_COLUMNS = {
+    'cake': ('name', 'description'),
+    'cake_template': ('name', 'description', 'category'),
+}
+
+
+def sqlite_fts_triggers(table):
+    """Triggers keeping the external-content FTS5 table in step with its source."""
+    fts = f"{table}_fts"
+    columns = SEARCH_COLUMNS[table]
+    names = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+    ]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # Same FTS5 tables and triggers models/search.py adds on create_all
+        for table, columns in SEARCH_COLUMNS.items():
+            op.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5("
+                f"{', '.join(columns)}, content='{table}', content_rowid='id', "
+                f"tokenize='porter unicode61')"
+            )
+            for statement in sqlite_fts_triggers(table):
+                op.execute(statement)
+            op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+        return
+
+    if dialect != 'postgresql':
+        return
+
+    for table, expression in SEARCH_VECTORS.items():
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        for table in SEARCH_COLUMNS:
+            for suffix in ('ai', 'ad', 'au'):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        return
+
+    if dialect != 'postgresql':
+        return
+
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -3,6 +3,10 @@ from werkzeug.security import generate_password_hash, check_password_hash
 import json
 
 class User(db.Model):
+    __table_args__ = (
+        db.Index('ix_user_created_at_id', 'created_at', 'id'),  # Admin user listing / keyset
+    )
+
     # FIX: Explicitly set autoincrement=True for PostgreSQL compatibility 
     # to ensure the application uses the database's SEQUENCE when inserting.
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -7,21 +7,30 @@ class Cart(db.Model):
     __tablename__ = 'cart'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # Null for guest carts
-    session_id = db.Column(db.String(255), nullable=True)  # For guest users
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True, index=True)  # Null for guest carts
+    session_id = db.Column(db.String(255), nullable=True, index=True)  # For guest users
+    
+    # Denormalized totals, kept in step with the items by delta updates
+    # (services.cart_service.apply_cart_delta); `flask carts check` repairs drift
+    total_amount = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    item_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Bumped with every change to the items, so clients can order delta responses
+    version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Abandoned-cart GC
     
-    # Relationships
-    items = db.relationship('CartItem', back_populates='cart', cascade='all, delete-orphan', lazy='dynamic')
+    # Relationships (a plain list, so it can be eager-loaded; see load_cart)
+    items = db.relationship('CartItem', back_populates='cart', cascade='all, delete-orphan',
+                            order_by='CartItem.id')
     
     def get_total(self):
-        """Calculate total cart value."""
-        return sum(item.get_subtotal() for item in self.items)
+        """Total cart value (maintained column, no aggregation)."""
+        return self.total_amount
     
     def get_item_count(self):
-        """Get total number of items in cart."""
-        return sum(item.quantity for item in self.items)
+        """Total number of items in cart (maintained column, no aggregation)."""
+        return self.item_count
     
     def __repr__(self):
         return f'<Cart {self.id} - User: {self.user_id or "Guest"}>'
@@ -32,8 +41,9 @@ class CartItem(db.Model):
     __tablename__ = 'cart_item'
     
     id = db.Column(db.Integer, primary_key=True)
-    cart_id = db.Column(db.Integer, db.ForeignKey('cart.id'), nullable=False)
+    cart_id = db.Column(db.Integer, db.ForeignKey('cart.id'), nullable=False, index=True)
     cake_id = db.Column(db.Integer, db.ForeignKey('cake.id'), nullable=True)  # Null for custom cakes
+    template_id = db.Column(db.Integer, db.ForeignKey('cake_template.id'), nullable=True)  # Portfolio design
     quantity = db.Column(db.Integer, nullable=False, default=1)
     
     # Customization details (stored as JSON for flexibility)
@@ -72,7 +82,7 @@ class CartItem(db.Model):
     
     def get_subtotal(self):
         """Calculate subtotal for this cart item."""
-        return (self.base_price + self.customization_price) * self.quantity
+        return (self.base_price + (self.customization_price or 0.0)) * self.quantity
     
     def __repr__(self):
         return f'<CartItem {self.id} - Cart: {self.cart_id}>'
@@ -83,7 +93,7 @@ class CartItemImage(db.Model):
     __tablename__ = 'cart_item_image'
     
     id = db.Column(db.Integer, primary_key=True)
-    cart_item_id = db.Column(db.Integer, db.ForeignKey('cart_item.id'), nullable=False)
+    cart_item_id = db.Column(db.Integer, db.ForeignKey('cart_item.id'), nullable=False, index=True)
     image_url = db.Column(db.String(500), nullable=False)
     image_filename = db.Column(db.String(255))
     description = db.Column(db.String(500))  # User's description of what they want
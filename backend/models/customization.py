@@ -5,6 +5,10 @@ from datetime import datetime
 class CustomizationOption(db.Model):
     """Available customization options for cakes."""
     __tablename__ = 'customization_option'
+    __table_args__ = (
+        db.Index('ix_customization_option_category_name_active', 'category', 'name', 'active'),  # Pricing lookups
+        db.Index('ix_customization_option_active_category_sort_order', 'active', 'category', 'sort_order'),  # Option listings
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     category = db.Column(db.String(50), nullable=False)  # shape, size, flavor, filling, frosting, topping
@@ -63,18 +67,21 @@ class CakeTemplate(db.Model):
     
     # Availability
     is_available = db.Column(db.Boolean, default=True)
-    is_featured = db.Column(db.Boolean, default=False)
+    # Listing sort keys (is_featured, sort_order, created_at) are NOT NULL:
+    # keyset pages seek with > / <, which never match a NULL key
+    is_featured = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     
     # Dietary options available
     can_be_vegan = db.Column(db.Boolean, default=False)
     can_be_gluten_free = db.Column(db.Boolean, default=False)
     
     # Display settings
-    sort_order = db.Column(db.Integer, default=0)
+    sort_order = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     views_count = db.Column(db.Integer, default=0)
     orders_count = db.Column(db.Integer, default=0)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           server_default=db.func.current_timestamp())
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
@@ -104,16 +111,29 @@ class CakeTemplate(db.Model):
         return f'<CakeTemplate {self.name}>'
 
 
+# Portfolio listing: available templates in display order (matches the
+# ORDER BY and keyset sort keys of GET /portfolio/cakes)
+db.Index(
+    'ix_cake_template_listing',
+    CakeTemplate.is_available,
+    CakeTemplate.is_featured.desc(),
+    CakeTemplate.sort_order,
+    CakeTemplate.created_at.desc(),
+    CakeTemplate.id.desc(),
+)
+
+
 class CakeTemplateImage(db.Model):
     """Additional images for cake templates (gallery)."""
     __tablename__ = 'cake_template_image'
     
     id = db.Column(db.Integer, primary_key=True)
-    template_id = db.Column(db.Integer, db.ForeignKey('cake_template.id'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('cake_template.id'), nullable=False, index=True)
     image_url = db.Column(db.String(500), nullable=False)
     caption = db.Column(db.String(200))
     sort_order = db.Column(db.Integer, default=0)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     template = db.relationship('CakeTemplate', back_populates='images')
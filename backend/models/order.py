@@ -5,6 +5,11 @@ from datetime import datetime
 class Order(db.Model):
     """Customer orders with full customization support."""  
     __tablename__ = 'order'
+    __table_args__ = (
+        db.Index('ix_order_user_id_created_at', 'user_id', 'created_at'),  # My orders
+        db.Index('ix_order_status_created_at', 'status', 'created_at'),  # Admin status filter
+        db.Index('ix_order_created_at_id', 'created_at', 'id'),  # Admin listing / keyset
+    )
 
     # Inside class Order(db.Model):
     customizations = db.relationship('OrderCustomization', back_populates='order', cascade='all, delete-orphan')
@@ -63,7 +68,7 @@ class OrderItem(db.Model):
     __tablename__ = 'order_item'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=False, index=True)
     cake_id = db.Column(db.Integer, db.ForeignKey('cake.id'), nullable=True)  # Null for custom cakes
     quantity = db.Column(db.Integer, nullable=False, default=1)
     
@@ -111,7 +116,7 @@ class OrderItemImage(db.Model):
     __tablename__ = 'order_item_image'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_item_id = db.Column(db.Integer, db.ForeignKey('order_item.id'), nullable=False)
+    order_item_id = db.Column(db.Integer, db.ForeignKey('order_item.id'), nullable=False, index=True)
     image_url = db.Column(db.String(500), nullable=False)
     image_filename = db.Column(db.String(255))
     description = db.Column(db.String(500))
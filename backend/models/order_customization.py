@@ -5,7 +5,7 @@ class OrderCustomization(db.Model): # Use db.Model instead of Base
     __tablename__ = "order_customization"
 
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False, index=True)
     # FIX: Reference the correct table name 'customization_options'
     customization_option_id = db.Column(db.Integer, db.ForeignKey("customization_options.id"), nullable=False)
 
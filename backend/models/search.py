@@ -0,0 +1,81 @@
+# backend/models/search.py
+"""
+Full-text search structures for the cake catalog and portfolio.
+
+PostgreSQL: a generated `search_vector` tsvector column with a GIN index on
+`cake` and `cake_template` (also created by the matching Alembic migration).
+
+SQLite (tests / local dev): external-content FTS5 tables kept in sync with
+triggers, so MATCH queries hit the FTS index instead of scanning rows (also
+created by the migration, which inlines the same DDL).
+"""
+from sqlalchemy import event, DDL
+from models.cake import Cake
+from models.customization import CakeTemplate
+
+
+# Columns indexed per table, in FTS5 column order (also the bm25 weight order)
+SEARCH_COLUMNS = {
+    'cake': ('name', 'description'),
+    'cake_template': ('name', 'description', 'category'),
+}
+
+# Weighted tsvector expressions: names rank above categories above descriptions
+POSTGRES_VECTORS = {
+    'cake': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+    'cake_template': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(category, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ),
+}
+
+
+def postgres_search_ddl(table):
+    """Statements adding the generated tsvector column and its GIN index."""
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({POSTGRES_VECTORS[table]}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+        f"ON {table} USING GIN (search_vector)",
+    ]
+
+
+def sqlite_search_ddl(table):
+    """Statements creating the FTS5 table and the triggers that keep it in sync."""
+    fts = f"{table}_fts"
+    columns = SEARCH_COLUMNS[table]
+    names = ', '.join(columns)
+    new_values = ', '.join(f"new.{c}" for c in columns)
+    old_values = ', '.join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table}', content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _register(model):
+    table = model.__table__
+    for statement in postgres_search_ddl(table.name):
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in sqlite_search_ddl(table.name):
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(
+        table, 'before_drop',
+        DDL(f"DROP TABLE IF EXISTS {table.name}_fts").execute_if(dialect='sqlite')
+    )
+
+
+_register(Cake)
+_register(CakeTemplate)
@@ -1,5 +1,7 @@
 # backend/schemas/cart_schema.py
-from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from marshmallow import (
+    Schema, fields, validate, validates_schema, post_load, ValidationError, INCLUDE
+)
 
 class CartItemImageSchema(Schema):
     """Schema for cart item reference images."""
@@ -15,6 +17,7 @@ class CartItemSchema(Schema):
     id = fields.Int(dump_only=True)
     cart_id = fields.Int(dump_only=True)
     cake_id = fields.Int(allow_none=True)
+    template_id = fields.Int(dump_only=True)
     quantity = fields.Int(required=True, validate=validate.Range(min=1, max=50))
     
     # Customization
@@ -83,12 +86,71 @@ class CartItemCreateSchema(Schema):
             raise ValidationError('Either cake_id or customization details required')
 
 
+class CartItemUpdateSchema(Schema):
+    """Editable fields of an existing cart item (all optional)."""
+    quantity = fields.Int(validate=validate.Range(min=1, max=50))
+    cake_shape = fields.Str(validate=validate.OneOf(['Round', 'Square', 'Rectangle', 'Heart', 'Custom']))
+    cake_size = fields.Str(validate=validate.OneOf(['Small', 'Medium', 'Large', 'XL']))
+    message_on_cake = fields.Str(validate=validate.Length(max=200))
+    notes = fields.Str(validate=validate.Length(max=1000))
+
+
+class CartOperationSchema(Schema):
+    """
+    One operation of a bulk cart edit.
+    
+    add takes the CartItemCreateSchema fields, update the
+    CartItemUpdateSchema fields plus the item id, remove only the id.
+    """
+    class Meta:
+        unknown = INCLUDE
+    
+    op = fields.Str(required=True, validate=validate.OneOf(['add', 'update', 'remove']))
+    id = fields.Int()
+    
+    @post_load
+    def load_item(self, data, **kwargs):
+        """Validate the item fields for the operation: {'op', 'id', 'item'}."""
+        op = data.pop('op')
+        item_id = data.pop('id', None)
+        if op != 'add' and item_id is None:
+            raise ValidationError({'id': ['Missing data for required field.']})
+        
+        item = {}
+        if op == 'add':
+            item = CartItemCreateSchema().load(data)
+        elif op == 'update':
+            item = CartItemUpdateSchema().load(data)
+        return {'op': op, 'id': item_id, 'item': item}
+
+
+class CartOperationsSchema(Schema):
+    """Schema for applying an ordered list of cart operations at once."""
+    operations = fields.List(
+        fields.Nested(CartOperationSchema), required=True,
+        validate=validate.Length(min=1, max=100)
+    )
+
+
+class TemplateCartItemSchema(Schema):
+    """Schema for adding a portfolio design to the cart as designed."""
+    quantity = fields.Int(load_default=1, validate=validate.Range(min=1, max=50))
+    
+    # Dietary (only where the design allows it)
+    is_gluten_free = fields.Bool(load_default=False)
+    is_vegan = fields.Bool(load_default=False)
+    
+    message_on_cake = fields.Str(validate=validate.Length(max=200))
+    notes = fields.Str(validate=validate.Length(max=1000))
+
+
 class CartSchema(Schema):
     """Schema for shopping cart."""
     id = fields.Int(dump_only=True)
     user_id = fields.Int(allow_none=True)
     session_id = fields.Str()
     items = fields.List(fields.Nested(CartItemSchema))
+    version = fields.Int(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
     
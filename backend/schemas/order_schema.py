@@ -1,5 +1,6 @@
 # backend/schemas/order_schema.py
-from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError, EXCLUDE
+from .pricing_schema import PricedItemSchema
 from datetime import datetime, timedelta
 
 class OrderItemImageSchema(Schema):
@@ -137,6 +138,12 @@ class OrderCreateSchema(Schema):
                 )
 
 
+class OrderItemCreateSchema(PricedItemSchema):
+    """Pricing inputs of one checkout line (display fields are read separately)."""
+    class Meta:
+        unknown = EXCLUDE
+
+
 class OrderUpdateStatusSchema(Schema):
     """Schema for updating order status (admin only)."""
     status = fields.Str(
@@ -0,0 +1,40 @@
+# backend/schemas/pricing_schema.py
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+# Upper bound on configurations priced per request
+MAX_QUOTE_ITEMS = 100
+
+
+class PricedItemSchema(Schema):
+    """Fields that determine the price of a cake (same as a cart item)."""
+    cake_id = fields.Int(allow_none=True)
+    template_id = fields.Int(allow_none=True)  # Portfolio design
+    cake_size = fields.Str(validate=validate.OneOf(['Small', 'Medium', 'Large', 'XL']))
+    quantity = fields.Int(load_default=1, validate=validate.Range(min=1, max=50))
+
+    # Dietary
+    is_gluten_free = fields.Bool(load_default=False)
+    is_vegan = fields.Bool(load_default=False)
+    is_sugar_free = fields.Bool(load_default=False)
+    is_dairy_free = fields.Bool(load_default=False)
+
+    toppings = fields.List(fields.Int(), load_default=list)  # List of topping IDs
+
+
+class QuoteItemSchema(PricedItemSchema):
+    """One configuration to price."""
+
+    @validates_schema
+    def validate_configuration(self, data, **kwargs):
+        """Ensure a cake_id, a template_id or a size is provided."""
+        if not data.get('cake_id') and not data.get('template_id') and not data.get('cake_size'):
+            raise ValidationError('Either cake_id, template_id or cake_size required')
+
+
+class PriceQuoteSchema(Schema):
+    """Schema for batch price quotes."""
+    items = fields.List(
+        fields.Nested(QuoteItemSchema),
+        required=True,
+        validate=validate.Length(min=1, max=MAX_QUOTE_ITEMS)
+    )
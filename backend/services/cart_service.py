@@ -0,0 +1,280 @@
+# backend/services/cart_service.py
+from flask import current_app, session
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import func, inspect, or_, select
+from sqlalchemy.orm import selectinload
+import time
+import uuid
+
+from extensions import db
+from models.cart import Cart, CartItem, CartItemImage
+
+
+def cart_load_options():
+    """
+    Loader options for rendering a cart: items with their cake in one
+    query, reference images in one more. With the cart row itself that is
+    three statements however many items the cart holds.
+    """
+    items = selectinload(Cart.items)
+    return (
+        items.joinedload(CartItem.cake),
+        items.selectinload(CartItem.reference_images),
+    )
+
+
+def load_cart(cart_id):
+    """Reload a cart with everything CartSchema reads (e.g. after a commit)."""
+    return Cart.query.options(*cart_load_options()).execution_options(
+        populate_existing=True
+    ).filter_by(id=cart_id).one()
+
+
+def _cart_owner():
+    """
+    Owner of the current request's cart: (user_id, None) when logged in,
+    otherwise (None, guest session id or None).
+    """
+    user_id = None
+    try:
+        verify_jwt_in_request(optional=True)
+        user_id = get_jwt_identity()
+    except:
+        pass
+    
+    if user_id:
+        return user_id, None
+    return None, session.get('cart_session_id')
+
+
+def _store(user_id):
+    """Store holding this owner's cart (see services.cart_store)."""
+    stores = current_app.extensions['cart_stores']
+    return stores['user'] if user_id else stores['guest']
+
+
+def cart_store(cart):
+    """Store a cart came from: rows have an identity, key-value carts do not."""
+    stores = current_app.extensions['cart_stores']
+    return stores['user'] if inspect(cart).has_identity else stores['guest']
+
+
+def find_cart(load_items=False):
+    """
+    Existing cart of the current user or guest session, or None.
+    
+    Never writes: visitors without a cart stay without one until they add
+    an item (see get_or_create_cart).
+    
+    Args:
+        load_items: Eager-load items, cakes and images for rendering
+    """
+    user_id, session_id = _cart_owner()
+    if not user_id and not session_id:
+        return None
+    
+    cart = _store(user_id).find(user_id, session_id, load_items=load_items)
+    if cart is not None and cart.id is not None:
+        # Remembered so the badge can read the cart by primary key
+        session['cart_id'] = cart.id
+    return cart
+
+
+def get_or_create_cart():
+    """
+    Get cart for logged-in user or create/retrieve guest cart.
+    Works for both authenticated and guest users.
+    
+    Only for requests that put something in the cart; reads use find_cart.
+    """
+    cart = find_cart()
+    if cart is not None:
+        return cart
+    
+    user_id, _ = _cart_owner()
+    # Guest user - new cart keyed by a fresh session id
+    session_id = None if user_id else str(uuid.uuid4())
+    cart = _store(user_id).create(user_id, session_id)
+    
+    if not user_id:
+        session['cart_session_id'] = cart.session_id
+    if cart.id is not None:
+        session['cart_id'] = cart.id
+    return cart
+
+
+def empty_cart():
+    """Unsaved empty cart, rendered for visitors who have no cart yet."""
+    return Cart(total_amount=0.0, item_count=0, version=0)
+
+
+def cart_item_count():
+    """
+    Item count for the cart badge, in a single read and without creating
+    a cart: by primary key once the session knows the cart, otherwise by
+    owner. The owner is always part of the filter, so a stale or foreign
+    cart id in the session reads as an empty cart.
+    """
+    user_id, session_id = _cart_owner()
+    if not user_id and not session_id:
+        return 0
+    return _store(user_id).item_count(user_id, session_id, session.get('cart_id'))
+
+
+def merge_guest_cart(user_id):
+    """
+    Move the session's guest cart into the user's cart (on login/register).
+    
+    Returns:
+        Cart id holding the merged items, or None if there was no guest cart
+    """
+    session_id = session.get('cart_session_id')
+    if not session_id:
+        session.pop('cart_id', None)
+        return None
+    
+    # Forget the guest cart only once the merge has committed: if it fails,
+    # the visitor keeps the guest cart and the next login retries the merge.
+    user_cart_id = _store(None).merge(session_id, user_id)
+    session.pop('cart_session_id', None)
+    session.pop('cart_id', None)
+    if user_cart_id is not None:
+        session['cart_id'] = user_cart_id
+    return user_cart_id
+
+
+def apply_cart_delta(cart_id, amount, count):
+    """
+    Shift a cart's stored total_amount and item_count by a delta and bump
+    its version.
+    
+    One UPDATE ... SET col = col + delta, so concurrent writers never lose
+    each other's changes. Runs in the caller's transaction: commit it
+    together with the item change it accounts for.
+    """
+    Cart.query.filter_by(id=cart_id).update({
+        Cart.total_amount: Cart.total_amount + amount,
+        Cart.item_count: Cart.item_count + count,
+        Cart.version: Cart.version + 1,
+    }, synchronize_session=False)
+
+
+def reset_cart_totals(cart_id):
+    """Zero a cart's stored totals and bump its version (in the caller's transaction)."""
+    Cart.query.filter_by(id=cart_id).update(
+        {Cart.total_amount: 0.0, Cart.item_count: 0, Cart.version: Cart.version + 1},
+        synchronize_session=False
+    )
+
+
+def bump_cart_version(cart_id):
+    """Bump a cart's version for a change that leaves the totals alone."""
+    Cart.query.filter_by(id=cart_id).update(
+        {Cart.version: Cart.version + 1}, synchronize_session=False
+    )
+
+
+# --- Consistency checks (flask carts check) ---
+
+# Tolerance for float drift in total_amount
+TOTAL_TOLERANCE = 0.005
+
+
+def _item_subtotal():
+    return (CartItem.base_price + func.coalesce(CartItem.customization_price, 0.0)) * CartItem.quantity
+
+
+def find_cart_total_drift():
+    """
+    Carts whose stored totals disagree with their items, in one aggregate query.
+    
+    Returns:
+        list: (cart_id, stored_total, actual_total, stored_count, actual_count)
+    """
+    items = select(
+        CartItem.cart_id,
+        func.sum(_item_subtotal()).label('total_amount'),
+        func.sum(CartItem.quantity).label('item_count'),
+    ).group_by(CartItem.cart_id).subquery()
+    
+    actual_total = func.coalesce(items.c.total_amount, 0.0)
+    actual_count = func.coalesce(items.c.item_count, 0)
+    rows = db.session.query(
+        Cart.id, Cart.total_amount, actual_total, Cart.item_count, actual_count
+    ).outerjoin(items, items.c.cart_id == Cart.id).filter(or_(
+        Cart.item_count != actual_count,
+        func.abs(Cart.total_amount - actual_total) > TOTAL_TOLERANCE,
+    )).order_by(Cart.id)
+    return [tuple(row) for row in rows]
+
+
+def recompute_cart_totals(cart_ids, chunk_size=500):
+    """
+    Rewrite the stored totals of the given carts from their items.
+    
+    Set-based: one UPDATE with correlated aggregates per chunk of carts.
+    
+    Returns:
+        int: Number of carts updated
+    """
+    total = select(func.coalesce(func.sum(_item_subtotal()), 0.0)).where(
+        CartItem.cart_id == Cart.id
+    ).scalar_subquery()
+    count = select(func.coalesce(func.sum(CartItem.quantity), 0)).where(
+        CartItem.cart_id == Cart.id
+    ).scalar_subquery()
+    
+    cart_ids = list(cart_ids)
+    updated = 0
+    for start in range(0, len(cart_ids), chunk_size):
+        updated += Cart.query.filter(Cart.id.in_(cart_ids[start:start + chunk_size])).update(
+            {Cart.total_amount: total, Cart.item_count: count}, synchronize_session=False
+        )
+    db.session.commit()
+    return updated
+
+
+# --- Abandoned guest carts (flask carts gc) ---
+
+def collect_abandoned_carts(cutoff, chunk_size=5000, on_chunk=None):
+    """
+    Delete guest carts (no user) untouched since cutoff, with their items
+    and reference images.
+    
+    Works in chunks of at most chunk_size carts, each its own short
+    transaction: pick the oldest ids through the updated_at index (skipping
+    rows another transaction has locked), delete images, items and carts by
+    id, commit. Live carts are never locked for longer than one chunk.
+    
+    Args:
+        cutoff: datetime; carts with updated_at before it are abandoned
+        chunk_size: Carts deleted per transaction
+        on_chunk: Optional callable(deleted_in_chunk, deleted_so_far, elapsed_seconds)
+    
+    Returns:
+        tuple: (carts deleted, elapsed seconds)
+    """
+    started = time.perf_counter()
+    deleted = 0
+    while True:
+        ids = [id for (id,) in db.session.query(Cart.id).filter(
+            Cart.user_id.is_(None),
+            Cart.updated_at < cutoff,
+        ).order_by(Cart.updated_at).limit(chunk_size).with_for_update(skip_locked=True)]
+        if not ids:
+            break
+        
+        item_ids = select(CartItem.id).where(CartItem.cart_id.in_(ids))
+        CartItemImage.query.filter(CartItemImage.cart_item_id.in_(item_ids)).delete(
+            synchronize_session=False
+        )
+        CartItem.query.filter(CartItem.cart_id.in_(ids)).delete(synchronize_session=False)
+        Cart.query.filter(Cart.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+        
+        deleted += len(ids)
+        if on_chunk:
+            on_chunk(len(ids), deleted, time.perf_counter() - started)
+        if len(ids) < chunk_size:
+            break
+    return deleted, time.perf_counter() - started
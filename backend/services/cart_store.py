@@ -0,0 +1,498 @@
+# backend/services/cart_store.py
+"""
+Cart storage backends.
+
+- SqlCartStore: cart/cart_item rows (the only store for user carts, and the
+  default for guest carts).
+- KeyValueCartStore: guest carts as one JSON document per session in a
+  key-value store, so browsing guests never write to the primary database.
+  Backed by an in-process dict (MemoryKeyValue, for development) or by a
+  Redis-protocol client (CART_STORE = 'redis').
+
+Both stores hand out Cart/CartItem/CartItemImage objects: the key-value
+store builds transient ones from the document, so CartSchema, get_subtotal
+and the controllers work the same on either. Mutations change the cart in
+place and are persisted together by commit(cart): one database commit, or
+one compare-and-set of the document.
+
+Key-value guest carts become cart/cart_item rows only when they matter to
+the database: when the visitor logs in (merge). Checkout leaves the cart
+as it is in either store; the order holds its own copy of the items.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from extensions import db
+from models.cake import Cake
+from models.cart import Cart, CartItem, CartItemImage
+from services.cart_service import (
+    apply_cart_delta, reset_cart_totals, bump_cart_version, cart_load_options, load_cart
+)
+from utils.exceptions import ConflictError
+
+CART_STORES = ('sql', 'memory', 'redis')
+
+
+class SqlCartStore:
+    """Carts as cart/cart_item rows, totals kept by delta updates."""
+
+    def find(self, user_id, session_id, load_items=False):
+        query = Cart.query.options(*cart_load_options()) if load_items else Cart.query
+        if user_id:
+            return query.filter_by(user_id=user_id).first()
+        return query.filter_by(session_id=session_id).first()
+
+    def create(self, user_id, session_id):
+        # The row is created straight away so items can reference its id
+        cart = Cart(user_id=user_id, session_id=session_id)
+        db.session.add(cart)
+        db.session.commit()
+        return cart
+
+    def get_item(self, cart, item_id):
+        return CartItem.query.filter_by(id=item_id, cart_id=cart.id).first()
+
+    def get_items(self, cart, item_ids):
+        """{id: item} for the cart's items among item_ids, in one IN query."""
+        if not item_ids:
+            return {}
+        items = CartItem.query.filter(CartItem.cart_id == cart.id, CartItem.id.in_(item_ids))
+        return {item.id: item for item in items}
+
+    def add_item(self, cart, item):
+        item.cart_id = cart.id
+        db.session.add(item)
+        apply_cart_delta(cart.id, item.get_subtotal(), item.quantity)
+
+    def update_item(self, cart, item, old_subtotal, old_quantity):
+        apply_cart_delta(cart.id, item.get_subtotal() - old_subtotal, item.quantity - old_quantity)
+
+    def remove_item(self, cart, item):
+        db.session.delete(item)
+        apply_cart_delta(cart.id, -item.get_subtotal(), -item.quantity)
+
+    def clear(self, cart):
+        CartItem.query.filter_by(cart_id=cart.id).delete()
+        reset_cart_totals(cart.id)
+
+    def add_image(self, cart, item, image):
+        image.cart_item_id = item.id
+        db.session.add(image)
+        bump_cart_version(cart.id)
+
+    def commit(self, cart):
+        db.session.commit()
+
+    def render(self, cart):
+        """The cart with everything CartSchema reads, as committed."""
+        return load_cart(cart.id)
+
+    # Identity keys rather than attributes: reading an attribute of an
+    # object expired by the commit would reload the whole row first
+
+    def render_item(self, cart, item):
+        """One committed item with its cake and images (two queries)."""
+        return CartItem.query.options(
+            joinedload(CartItem.cake), selectinload(CartItem.reference_images)
+        ).execution_options(populate_existing=True).filter_by(
+            id=inspect(item).identity[0]
+        ).one()
+
+    def totals(self, cart):
+        """Committed (total_amount, item_count, version) in one read."""
+        return tuple(db.session.query(Cart.total_amount, Cart.item_count, Cart.version).filter_by(
+            id=inspect(cart).identity[0]
+        ).one())
+
+    def item_count(self, user_id, session_id, cart_id=None):
+        """Badge count in one read, by primary key when the session knows it."""
+        if user_id:
+            owner = Cart.user_id == user_id
+        else:
+            owner = Cart.session_id == session_id
+
+        query = db.session.query(Cart.item_count).filter(owner)
+        if cart_id:
+            query = query.filter(Cart.id == cart_id)
+        return query.limit(1).scalar() or 0
+
+    def merge(self, session_id, user_id):
+        """
+        Move a guest cart into the user's cart.
+
+        Set-based whatever the cart size: without a user cart the guest cart
+        is simply adopted (one UPDATE of the cart row); otherwise one
+        UPDATE cart_item SET cart_id moves every item, the guest totals are
+        added to the user cart by delta and the empty guest cart is deleted.
+        """
+        guest = Cart.query.filter_by(session_id=session_id, user_id=None).first()
+        if guest is None:
+            return None
+
+        user_cart_id = db.session.query(Cart.id).filter_by(user_id=user_id).limit(1).scalar()
+        if user_cart_id is None:
+            guest.user_id = user_id
+            guest.session_id = None
+            user_cart_id = guest.id
+        else:
+            CartItem.query.filter_by(cart_id=guest.id).update(
+                {CartItem.cart_id: user_cart_id}, synchronize_session=False
+            )
+            apply_cart_delta(user_cart_id, guest.total_amount, guest.item_count)
+            Cart.query.filter_by(id=guest.id).delete(synchronize_session=False)
+        db.session.commit()
+        return user_cart_id
+
+
+# Columns carried in a key-value cart document (the cart reference is implied)
+ITEM_FIELDS = [column.name for column in CartItem.__table__.columns if column.name != 'cart_id']
+IMAGE_FIELDS = [
+    column.name for column in CartItemImage.__table__.columns if column.name != 'cart_item_id'
+]
+DATETIME_FIELDS = {
+    column.name for table in (CartItem.__table__, CartItemImage.__table__)
+    for column in table.columns if isinstance(column.type, DateTime)
+}
+
+
+def _dump_row(obj, fields):
+    row = {}
+    for field in fields:
+        value = getattr(obj, field)
+        row[field] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+
+def _load_row(model, row, fields):
+    values = {}
+    for field in fields:
+        value = row.get(field)
+        if value is not None and field in DATETIME_FIELDS:
+            value = datetime.fromisoformat(value)
+        values[field] = value
+    return model(**values)
+
+
+def _copy_item(item, cart_id):
+    """New CartItem row (with its images) copied from a key-value cart item."""
+    copy = CartItem(cart_id=cart_id, **{
+        field: getattr(item, field) for field in ITEM_FIELDS if field != 'id'
+    })
+    copy.reference_images = [
+        CartItemImage(**{field: getattr(image, field) for field in IMAGE_FIELDS if field != 'id'})
+        for image in item.reference_images
+    ]
+    return copy
+
+
+class KeyValueCartStore:
+    """
+    Guest carts as JSON documents in a key-value store.
+
+    Works with any client offering get(key), set(key, value, ex=seconds) and
+    delete(key): redis-py (or fakeredis) clients and MemoryKeyValue. Every
+    write refreshes the TTL, so abandoned carts expire by themselves.
+
+    Writes are a compare-and-set against the document as it was read, so
+    two requests changing the same cart cannot overwrite each other: the
+    later one fails with a ConflictError (409) and can be retried.
+
+    Item and image ids come from a per-cart counter kept in the document;
+    they are only meaningful within the cart (rows get fresh ids when the
+    cart is materialized).
+    """
+
+    def __init__(self, client, ttl, prefix='cart:guest:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def key(self, session_id):
+        return f'{self.prefix}{session_id}'
+
+    def _read(self, session_id):
+        raw = self.client.get(self.key(session_id))
+        return json.loads(raw) if raw is not None else None
+
+    def _swap(self, key, expected, value):
+        """Set key to value only if it still holds expected (None: absent)."""
+        compare_and_set = getattr(self.client, 'compare_and_set', None)
+        if compare_and_set is not None:
+            return compare_and_set(key, expected, value, ex=self.ttl)
+        return _watch_and_set(self.client, key, expected, value, ex=self.ttl)
+
+    def _build(self, session_id, document):
+        """Transient Cart (and items) from a stored document."""
+        cart = Cart(
+            session_id=session_id,
+            total_amount=document['total_amount'],
+            item_count=document['item_count'],
+            version=document.get('version', 0),
+            created_at=datetime.fromisoformat(document['created_at']),
+            updated_at=datetime.fromisoformat(document['updated_at']),
+        )
+        items = []
+        for row in document['items']:
+            item = _load_row(CartItem, row, ITEM_FIELDS)
+            item.reference_images = [
+                _load_row(CartItemImage, image, IMAGE_FIELDS) for image in row['images']
+            ]
+            items.append(item)
+        cart.items = items
+        cart.next_id = document['next_id']
+        return cart
+
+    def find(self, user_id, session_id, load_items=False):
+        raw = self.client.get(self.key(session_id))
+        if raw is None:
+            return None
+        cart = self._build(session_id, json.loads(raw))
+        cart.stored_raw = raw
+        return self.render(cart) if load_items else cart
+
+    def create(self, user_id, session_id):
+        # Nothing is stored until the first commit
+        now = datetime.utcnow()
+        cart = Cart(session_id=session_id, total_amount=0.0, item_count=0, version=0,
+                    created_at=now, updated_at=now)
+        cart.items = []
+        cart.next_id = 1
+        cart.stored_raw = None
+        return cart
+
+    def _allocate_id(self, cart):
+        allocated = cart.next_id
+        cart.next_id += 1
+        return allocated
+
+    def get_item(self, cart, item_id):
+        return next((item for item in cart.items if item.id == item_id), None)
+
+    def get_items(self, cart, item_ids):
+        return {item.id: item for item in cart.items if item.id in item_ids}
+
+    def add_item(self, cart, item):
+        now = datetime.utcnow()
+        item.id = self._allocate_id(cart)
+        item.created_at = item.updated_at = now
+        # Column defaults only apply on INSERT; set them for the document
+        if item.cake_layers is None:
+            item.cake_layers = 2
+        for flag in ('is_gluten_free', 'is_vegan', 'is_sugar_free', 'is_dairy_free'):
+            if getattr(item, flag) is None:
+                setattr(item, flag, False)
+        if item.customization_price is None:
+            item.customization_price = 0.0
+        cart.items.append(item)
+        cart.total_amount += item.get_subtotal()
+        cart.item_count += item.quantity
+
+    def update_item(self, cart, item, old_subtotal, old_quantity):
+        item.updated_at = datetime.utcnow()
+        cart.total_amount += item.get_subtotal() - old_subtotal
+        cart.item_count += item.quantity - old_quantity
+
+    def remove_item(self, cart, item):
+        cart.items.remove(item)
+        cart.total_amount -= item.get_subtotal()
+        cart.item_count -= item.quantity
+
+    def clear(self, cart):
+        cart.items = []
+        cart.total_amount = 0.0
+        cart.item_count = 0
+
+    def add_image(self, cart, item, image):
+        image.id = self._allocate_id(cart)
+        image.uploaded_at = datetime.utcnow()
+        item.reference_images.append(image)
+
+    def commit(self, cart):
+        """
+        Store the document (and commit any database work done alongside).
+
+        Raises:
+            ConflictError: The cart was stored by another request since it
+                           was read; nothing is written
+        """
+        db.session.flush()
+        cart.updated_at = datetime.utcnow()
+        cart.version += 1
+        document = {
+            'created_at': cart.created_at.isoformat(),
+            'updated_at': cart.updated_at.isoformat(),
+            'total_amount': cart.total_amount,
+            'item_count': cart.item_count,
+            'version': cart.version,
+            'next_id': cart.next_id,
+            'items': [
+                dict(_dump_row(item, ITEM_FIELDS), images=[
+                    _dump_row(image, IMAGE_FIELDS) for image in item.reference_images
+                ])
+                for item in cart.items
+            ],
+        }
+        raw = json.dumps(document)
+        if not self._swap(self.key(cart.session_id), cart.stored_raw, raw):
+            db.session.rollback()
+            raise ConflictError("The cart was changed by another request, please retry")
+        cart.stored_raw = raw
+        db.session.commit()
+
+    def render(self, cart):
+        """
+        Attach the catalog cakes the items reference (one IN query).
+
+        set_committed_value, not assignment: the cake's cart_items backref
+        would otherwise cascade the transient items into the session.
+        """
+        cake_ids = {item.cake_id for item in cart.items if item.cake_id}
+        cakes = {cake.id: cake for cake in Cake.query.filter(Cake.id.in_(cake_ids))} \
+            if cake_ids else {}
+        for item in cart.items:
+            set_committed_value(item, 'cake', cakes.get(item.cake_id))
+        return cart
+
+    def render_item(self, cart, item):
+        cake = Cake.query.get(item.cake_id) if item.cake_id else None
+        set_committed_value(item, 'cake', cake)
+        return item
+
+    def totals(self, cart):
+        return cart.total_amount, cart.item_count, cart.version
+
+    def item_count(self, user_id, session_id, cart_id=None):
+        document = self._read(session_id)
+        return document['item_count'] if document else 0
+
+    def merge(self, session_id, user_id):
+        """
+        Materialize the guest cart into the user's cart (creating it if
+        needed) in one transaction, then drop the document.
+        """
+        guest = self.find(None, session_id)
+        if guest is None:
+            return None
+
+        cart = Cart.query.filter_by(user_id=user_id).first()
+        if cart is None:
+            cart = Cart(user_id=user_id, total_amount=0.0, item_count=0)
+            db.session.add(cart)
+            db.session.flush()
+        db.session.add_all(_copy_item(item, cart.id) for item in guest.items)
+        apply_cart_delta(cart.id, guest.total_amount, guest.item_count)
+        db.session.commit()
+
+        self.client.delete(self.key(session_id))
+        return cart.id
+
+
+class MemoryKeyValue:
+    """
+    In-process key-value client with expiry, for development.
+
+    Speaks the subset of the redis-py API the cart store uses. Carts live
+    only as long as the process and are not shared between workers.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.data[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        expires_at = time.monotonic() + ex if ex else None
+        with self.lock:
+            self.data[key] = (value, expires_at)
+        return True
+
+    def delete(self, *keys):
+        with self.lock:
+            return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def compare_and_set(self, key, expected, value, ex=None):
+        """Set key to value only if it still holds expected (None: absent)."""
+        expires_at = time.monotonic() + ex if ex else None
+        with self.lock:
+            entry = self.data.get(key)
+            current = None
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                current = entry[0]
+            if current != expected:
+                return False
+            self.data[key] = (value, expires_at)
+        return True
+
+
+def _as_bytes(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+def _watch_and_set(client, key, expected, value, ex=None):
+    """
+    Compare-and-set on a Redis-protocol client: WATCH the key, compare, then
+    SET in a MULTI/EXEC transaction that fails if the key changed meanwhile.
+    """
+    from redis.exceptions import WatchError
+
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if _as_bytes(pipe.get(key)) != _as_bytes(expected):
+                return False
+            pipe.multi()
+            pipe.set(key, value, ex=ex)
+            pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+def make_guest_cart_store(app):
+    """
+    Build the guest cart store selected by the CART_STORE setting.
+
+    'sql' keeps guest carts as rows, 'memory' in an in-process dict and
+    'redis' in the Redis server at CART_STORE_URL (requires redis-py).
+    """
+    choice = app.config.get('CART_STORE', 'sql')
+    if choice not in CART_STORES:
+        raise ValueError(
+            f"CART_STORE must be one of {', '.join(CART_STORES)}, not {choice!r}"
+        )
+
+    if choice == 'sql':
+        return SqlCartStore()
+    ttl = app.config.get('CART_STORE_TTL')
+    if choice == 'memory':
+        return KeyValueCartStore(MemoryKeyValue(), ttl)
+
+    try:
+        import redis
+    except ImportError:
+        raise ValueError("CART_STORE is 'redis' but redis is not installed")
+    return KeyValueCartStore(redis.Redis.from_url(app.config['CART_STORE_URL']), ttl)
+
+
+def init_cart_stores(app):
+    """User carts always live in SQL; guest carts in the configured store."""
+    app.extensions['cart_stores'] = {
+        'user': SqlCartStore(),
+        'guest': make_guest_cart_store(app),
+    }
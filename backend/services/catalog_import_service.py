@@ -0,0 +1,252 @@
+# backend/services/catalog_import_service.py
+import csv
+import io
+import json
+from itertools import islice
+from sqlalchemy import insert, update, tuple_
+from marshmallow import ValidationError as MarshmallowValidationError
+
+from extensions import db
+from models.cake import Cake
+from models.customization import CustomizationOption
+from schemas.cake_schema import CakeCreateSchema
+from schemas.customization_schema import CustomizationOptionCreateSchema
+
+
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportSpec:
+    """How rows of one type are validated, matched and written."""
+
+    def __init__(self, model, schema_class, natural_key, export_columns, renames=None):
+        self.model = model
+        self.schema = schema_class(many=True)
+        self.fields = set(schema_class._declared_fields)
+        self.natural_key = natural_key            # columns identifying an existing row
+        self.export_columns = export_columns      # CSV / NDJSON column order
+        self.renames = renames or {}              # schema field -> model column
+
+    def to_columns(self, data):
+        return {self.renames.get(key, key): value for key, value in data.items()}
+
+    def export_header(self):
+        """Export column names, using schema field names where they differ."""
+        reverse = {column: field for field, column in self.renames.items()}
+        return [reverse.get(column, column) for column in self.export_columns]
+
+
+IMPORT_SPECS = {
+    'cake': ImportSpec(
+        model=Cake,
+        schema_class=CakeCreateSchema,
+        natural_key=('name',),
+        export_columns=('id', 'name', 'description', 'price', 'image_url'),
+    ),
+    'option': ImportSpec(
+        model=CustomizationOption,
+        schema_class=CustomizationOptionCreateSchema,
+        natural_key=('category', 'name'),
+        export_columns=(
+            'id', 'category', 'name', 'description', 'price', 'image_url', 'active',
+            'sort_order', 'is_vegan_compatible', 'is_gluten_free_compatible'
+        ),
+        renames={'is_active': 'active'},
+    ),
+}
+
+
+def iter_records(stream, fmt):
+    """
+    Lazily parse an uploaded byte stream into dict records.
+
+    Only one line is held in memory at a time, whatever the upload size.
+    Empty CSV cells are treated as missing so optional fields keep their
+    defaults.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        for record in csv.DictReader(text):
+            yield {k.strip(): v for k, v in record.items() if k and v not in (None, '')}
+    else:
+        for line in text:
+            line = line.strip()
+            if line:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield record if isinstance(record, dict) else {'__invalid__': line[:100]}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _validate_chunk(spec, records, first_row, report):
+    """
+    Validate one chunk with the resource's create schema.
+
+    Returns:
+        list: (insert_row, update_row) per valid record. The insert row has
+        the schema defaults filled in; the update row keeps only the fields
+        present in the source, so re-importing a partial row never resets
+        the columns it leaves out (active, sort_order, diet flags, ...).
+    """
+    cleaned = []
+    for record in records:
+        if '__invalid__' in record:
+            cleaned.append(None)
+        else:
+            # Ignore export-only columns such as id
+            cleaned.append({k: v for k, v in record.items() if k in spec.fields})
+
+    try:
+        loaded = spec.schema.load([r for r in cleaned if r is not None])
+        errors = {}
+    except MarshmallowValidationError as err:
+        loaded = err.valid_data
+        errors = err.messages
+
+    valid = []
+    position = 0
+    for offset, record in enumerate(cleaned):
+        row_number = first_row + offset
+        if record is None:
+            report.add_error(row_number, {'_schema': ['Invalid JSON record']})
+            continue
+        if position in errors:
+            report.add_error(row_number, errors[position])
+        else:
+            row = loaded[position]
+            valid.append((
+                spec.to_columns(row),
+                spec.to_columns({key: value for key, value in row.items() if key in record}),
+            ))
+        position += 1
+    return valid
+
+
+def _upsert_chunk(spec, rows, report):
+    """
+    Insert new rows and update existing ones: one statement of each per chunk
+    (updates are grouped by the set of columns they write).
+    """
+    model = spec.model
+    key_columns = [getattr(model, name) for name in spec.natural_key]
+
+    # Last occurrence wins within a chunk
+    by_key = {tuple(row[name] for name in spec.natural_key): (row, changes) for row, changes in rows}
+
+    existing = dict(
+        (tuple(found[1:]), found[0])
+        for found in db.session.query(model.id, *key_columns).filter(
+            tuple_(*key_columns).in_(list(by_key))
+        )
+    )
+
+    to_insert = [row for key, (row, _) in by_key.items() if key not in existing]
+    to_update = [
+        dict(changes, id=existing[key]) for key, (_, changes) in by_key.items() if key in existing
+    ]
+
+    if to_insert:
+        db.session.execute(insert(model), to_insert)
+    if to_update:
+        db.session.execute(update(model), to_update)
+    db.session.commit()
+
+    report.inserted += len(to_insert)
+    report.updated += len(to_update)
+
+
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.processed = 0
+        self.inserted = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, row, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': messages})
+
+    def to_dict(self):
+        return {
+            'type': self.kind,
+            'processed': self.processed,
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def import_catalog(stream, kind, fmt, batch_size):
+    """
+    Stream-import cakes or customization options.
+
+    Records are parsed lazily, validated `batch_size` at a time with the
+    existing create schemas, and upserted on their natural key (cake name,
+    or option category + name) with one bulk INSERT and one bulk UPDATE per
+    batch. Each batch commits on its own, so memory use stays flat and a bad
+    row only drops that row.
+
+    Args:
+        stream: Binary file-like object with the upload
+        kind: 'cake' or 'option'
+        fmt: 'csv' or 'ndjson'
+        batch_size: Rows validated and written per statement
+
+    Returns:
+        ImportReport
+    """
+    spec = IMPORT_SPECS[kind]
+    report = ImportReport(kind)
+    row_number = 1
+
+    for records in _chunks(iter_records(stream, fmt), batch_size):
+        report.processed += len(records)
+        rows = _validate_chunk(spec, records, row_number, report)
+        row_number += len(records)
+        if rows:
+            _upsert_chunk(spec, rows, report)
+
+    return report
+
+
+def export_catalog(kind, fmt, batch_size):
+    """
+    Stream cakes or customization options as CSV or NDJSON.
+
+    Rows are fetched `batch_size` at a time (yield_per) and written out in
+    small pieces, so the export never holds the table in memory. The output
+    uses the same field names the import accepts.
+    """
+    spec = IMPORT_SPECS[kind]
+    columns = [getattr(spec.model, name) for name in spec.export_columns]
+    rows = db.session.query(*columns).order_by(spec.model.id).yield_per(batch_size)
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(spec.export_header())
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() > 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    else:
+        header = spec.export_header()
+        for row in rows:
+            yield json.dumps(dict(zip(header, row)), default=str) + '\n'
@@ -0,0 +1,105 @@
+# backend/services/option_payload_service.py
+from flask import current_app
+
+from models.customization import CustomizationOption
+from services.pricing_service import diet_mask
+from utils.cache import CachedBody, option_cache
+
+
+class GroupedPayloads:
+    """
+    Serialized option payloads for one endpoint: all categories together
+    and each category on its own, every one a CachedBody with its ETag.
+
+    Also keeps the serialized options with their dietary bitmasks, so a
+    diet-filtered variant is built with one AND per option (no query) and
+    memoized.
+    """
+
+    def __init__(self, whole, by_category, empty, options=(), render=None):
+        self.whole = whole
+        self.by_category = by_category
+        self.empty = empty
+        self.options = list(options)  # [(category, diet_mask, option dict)]
+        self.render = render
+        self.filtered = {}
+
+    def body(self, category=None, diet=0):
+        """
+        Body for one category (empty payload if unknown), or for all of them.
+
+        Args:
+            category: Only this category's options
+            diet: Dietary profile mask; only options compatible with every
+                  diet in it are included
+        """
+        if category is not None and category not in self.by_category:
+            return self.empty
+        if diet:
+            return self.diet_body(category, diet)
+        if category is None:
+            return self.whole
+        return self.by_category[category]
+
+    def diet_body(self, category, diet):
+        """Memoized body of the options compatible with the diet mask."""
+        key = (category, diet)
+        body = self.filtered.get(key)
+        if body is None:
+            groups = {}
+            for option_category, mask, data in self.options:
+                if (mask & diet) == diet and category in (None, option_category):
+                    groups.setdefault(option_category, []).append(data)
+            body = CachedBody(current_app.json.dumps_bytes(self.render(groups)))
+            self.filtered[key] = body
+        return body
+
+
+def build_grouped_payloads(options, dump, render):
+    """
+    Group options by category and serialize every variant once.
+
+    Args:
+        options: Active options in display order
+        dump: Callable serializing a list of options to a list of dicts
+        render: Callable turning {category: [option dicts]} into the
+                endpoint's response shape
+
+    Returns:
+        GroupedPayloads
+    """
+    groups = {}
+    rows = []
+    for option, data in zip(options, dump(options)):
+        groups.setdefault(option.category, []).append(data)
+        rows.append((option.category, diet_mask(option), data))
+
+    encode = current_app.json.dumps_bytes
+    return GroupedPayloads(
+        whole=CachedBody(encode(render(groups))),
+        by_category={
+            category: CachedBody(encode(render({category: items})))
+            for category, items in groups.items()
+        },
+        empty=CachedBody(encode(render({}))),
+        options=rows,
+        render=render,
+    )
+
+
+def active_options(*order_by):
+    """Active options in the given order (id breaks ties deterministically)."""
+    return CustomizationOption.query.filter_by(active=True).order_by(
+        *order_by, CustomizationOption.id
+    ).all()
+
+
+def get_grouped_payloads(name, builder, fingerprint=None):
+    """
+    Cached GroupedPayloads for one endpoint, built on first use.
+
+    Stored in the option cache, so any option write rebuilds it. Keyed by
+    the option table's fingerprint too, so rows changed outside the admin
+    endpoints (scripts, other workers) are picked up on the next request.
+    """
+    return option_cache.get_or_build(('payloads', name, fingerprint), builder)
@@ -0,0 +1,313 @@
+# backend/services/pricing_service.py
+from collections import namedtuple
+from sqlalchemy import and_, or_
+
+from models.cake import Cake
+from models.customization import CakeTemplate, CustomizationOption
+from utils.cache import option_cache
+
+
+# One row of the pricing table (a snapshot, safe to share across requests)
+PriceEntry = namedtuple('PriceEntry', [
+    'id', 'category', 'name', 'price', 'active',
+    'is_vegan_compatible', 'is_gluten_free_compatible'
+])
+
+# Dietary flags on a cart item and the option that prices each of them
+DIETARY_PRICE_OPTIONS = {
+    'is_gluten_free': 'Gluten-Free',
+    'is_vegan': 'Vegan',
+}
+
+DEFAULT_SIZE = 'Medium'
+
+# Dietary profile bits. An option's mask has a bit set for every diet it is
+# compatible with; a customer's profile is the OR of the diets they follow,
+# so an option fits when (mask & profile) == profile.
+DIET_VEGAN = 1 << 0
+DIET_GLUTEN_FREE = 1 << 1
+
+# ?diet= names, cart item flags and option columns for each bit
+DIETS = {
+    'vegan': DIET_VEGAN,
+    'gluten_free': DIET_GLUTEN_FREE,
+}
+DIET_ITEM_FLAGS = {
+    'is_vegan': DIET_VEGAN,
+    'is_gluten_free': DIET_GLUTEN_FREE,
+}
+DIET_OPTION_COLUMNS = {
+    DIET_VEGAN: 'is_vegan_compatible',
+    DIET_GLUTEN_FREE: 'is_gluten_free_compatible',
+}
+
+# Cart item fields holding an option name, by option category
+NAMED_OPTION_FIELDS = {
+    'flavor': 'flavor',
+    'filling': 'filling',
+    'frosting': 'frosting',
+}
+
+
+def diet_mask(option):
+    """Compatibility bitmask of an option (entry or model); only True counts."""
+    mask = 0
+    for bit, column in DIET_OPTION_COLUMNS.items():
+        if getattr(option, column) is True:
+            mask |= bit
+    return mask
+
+
+def parse_diets(value):
+    """
+    Turn a comma-separated diet list (e.g. "vegan,gluten_free") into a mask.
+
+    Raises:
+        ValueError: If a diet name is unknown
+    """
+    profile = 0
+    for name in filter(None, (part.strip() for part in value.split(','))):
+        if name not in DIETS:
+            raise ValueError(f"Unknown diet '{name}'; expected one of: {', '.join(DIETS)}")
+        profile |= DIETS[name]
+    return profile
+
+
+def item_diet_profile(data):
+    """Diet mask a cart item asks for through its is_vegan / is_gluten_free flags."""
+    profile = 0
+    for flag, bit in DIET_ITEM_FLAGS.items():
+        if data.get(flag):
+            profile |= bit
+    return profile
+
+
+class PricingTable:
+    """
+    Immutable snapshot of customization option prices.
+
+    Indexed by (category, name) and by id so pricing a configuration is a
+    handful of dict lookups instead of one query per option. Dietary
+    compatibility is precomputed as one bitmask per option id.
+    """
+
+    def __init__(self, entries):
+        self.by_id = {entry.id: entry for entry in entries}
+        self.diet_masks = {entry.id: diet_mask(entry) for entry in entries}
+        self.by_key = {}
+        for entry in entries:
+            # First row wins, like the .first() lookups it replaces
+            self.by_key.setdefault((entry.category, entry.name), entry)
+
+    @staticmethod
+    def _query():
+        return CustomizationOption.query.with_entities(
+            *(getattr(CustomizationOption, field) for field in PriceEntry._fields)
+        ).order_by(CustomizationOption.id)
+
+    @classmethod
+    def load(cls):
+        """Build the table from customization_option in a single query."""
+        return cls([PriceEntry(*row) for row in cls._query()])
+
+    @classmethod
+    def load_for(cls, items):
+        """
+        Build a table holding only the options the given items reference.
+
+        Reads current prices straight from the database (bypassing the
+        process-local cache) in one query: topping ids, plus the size and
+        dietary options looked up by (category, name).
+        """
+        ids = {id for item in items for id in item.get('toppings') or ()}
+        keys = {
+            ('size', item.get('cake_size', DEFAULT_SIZE))
+            for item in items if not item.get('cake_id') and not item.get('template_id')
+        }
+        keys.update(
+            ('dietary_restriction', name)
+            for item in items
+            for flag, name in DIETARY_PRICE_OPTIONS.items() if item.get(flag)
+        )
+
+        conditions = []
+        if ids:
+            conditions.append(CustomizationOption.id.in_(ids))
+        # One (category = ? AND name IN (...)) branch per category: unlike a
+        # row-value IN, each branch can seek the (category, name, active) index
+        names_by_category = {}
+        for category, name in keys:
+            names_by_category.setdefault(category, set()).add(name)
+        conditions.extend(
+            and_(CustomizationOption.category == category, CustomizationOption.name.in_(sorted(names)))
+            for category, names in sorted(names_by_category.items())
+        )
+        if not conditions:
+            return cls([])
+        return cls([PriceEntry(*row) for row in cls._query().filter(or_(*conditions))])
+
+    def option(self, category, name):
+        """Entry for (category, name), or None."""
+        return self.by_key.get((category, name))
+
+    def option_price(self, category, name):
+        entry = self.by_key.get((category, name))
+        return (entry.price or 0.0) if entry else 0.0
+
+    def options_by_id(self, ids, category):
+        """Entries for the given ids in one category (unknown ids are skipped)."""
+        entries = (self.by_id.get(id) for id in dict.fromkeys(ids))
+        return [entry for entry in entries if entry is not None and entry.category == category]
+
+    def diet_conflicts(self, data):
+        """
+        Options a cart item selects that do not fit its dietary flags.
+
+        Checks the toppings (by id) and the flavor, filling and frosting (by
+        name, when they name a known option).
+
+        Returns:
+            list: Conflicting PriceEntry rows (empty when the item is consistent)
+        """
+        profile = item_diet_profile(data)
+        if not profile:
+            return []
+
+        selected = self.options_by_id(data.get('toppings') or (), 'topping')
+        for category, field in NAMED_OPTION_FIELDS.items():
+            entry = data.get(field) and self.by_key.get((category, data[field]))
+            if entry:
+                selected.append(entry)
+
+        masks = self.diet_masks
+        return [entry for entry in selected if (masks[entry.id] & profile) != profile]
+
+    def price_item(self, data, cake_price=None):
+        """
+        Price one cart item configuration.
+
+        Args:
+            data: Validated cart item fields (cake_size, toppings, dietary flags)
+            cake_price: Price of the catalog cake, or None for a custom cake
+
+        Returns:
+            tuple: (base_price, customization_price)
+        """
+        if cake_price is not None:
+            base_price = cake_price
+        else:
+            base_price = self.option_price('size', data.get('cake_size', DEFAULT_SIZE))
+
+        customization_price = 0.0
+        if data.get('toppings'):
+            customization_price += sum(
+                entry.price or 0.0 for entry in self.options_by_id(data['toppings'], 'topping')
+            )
+        for flag, option_name in DIETARY_PRICE_OPTIONS.items():
+            if data.get(flag):
+                customization_price += self.option_price('dietary_restriction', option_name)
+        return base_price, customization_price
+
+
+def get_pricing_table():
+    """Current pricing table, loaded on first use after each invalidation."""
+    return option_cache.get_or_build('pricing_table', PricingTable.load)
+
+
+def load_cake_prices(cake_ids):
+    """Prices of the given catalog cakes in one IN query: {cake_id: price}."""
+    ids = {id for id in cake_ids if id}
+    if not ids:
+        return {}
+    rows = Cake.query.with_entities(Cake.id, Cake.price).filter(Cake.id.in_(ids))
+    return {row.id: row.price for row in rows}
+
+
+def missing_cake_ids(items, cake_prices):
+    """Sorted cake ids referenced by items but absent from cake_prices."""
+    return sorted({
+        item['cake_id'] for item in items
+        if item.get('cake_id') and item['cake_id'] not in cake_prices
+    })
+
+
+def load_template_prices(template_ids):
+    """
+    Base prices of the given available portfolio designs in one IN query:
+    {template_id: base_price}.
+    """
+    ids = {id for id in template_ids if id}
+    if not ids:
+        return {}
+    rows = CakeTemplate.query.with_entities(CakeTemplate.id, CakeTemplate.base_price).filter(
+        CakeTemplate.id.in_(ids), CakeTemplate.is_available.is_(True)
+    )
+    return {row.id: row.base_price for row in rows}
+
+
+def missing_template_ids(items, template_prices):
+    """Sorted template ids referenced by items but absent from template_prices."""
+    return sorted({
+        item['template_id'] for item in items
+        if item.get('template_id') and item['template_id'] not in template_prices
+    })
+
+
+def unpriced_item_indexes(items, table):
+    """
+    Indexes of custom cakes (no cake_id or template_id) whose size has no
+    option in the table: price_item would silently price them at 0.
+    """
+    return [
+        index for index, item in enumerate(items)
+        if not item.get('cake_id') and not item.get('template_id')
+        and table.option('size', item.get('cake_size', DEFAULT_SIZE)) is None
+    ]
+
+
+def quote_items(items, cake_prices, table=None, template_prices=None):
+    """
+    Price a batch of configurations without touching the database.
+
+    Catalog cakes and portfolio designs are priced from their own price;
+    custom cakes from their size option.
+
+    Args:
+        items: Validated configurations (QuoteItemSchema)
+        cake_prices: {cake_id: price} for every cake_id in items
+        table: PricingTable (defaults to the current one)
+        template_prices: {template_id: base_price} for every template_id in items
+
+    Returns:
+        dict: Per-line prices in request order plus the batch total
+    """
+    table = table or get_pricing_table()
+    lines = []
+    total = 0.0
+    for index, item in enumerate(items):
+        if item.get('cake_id'):
+            cake_price = cake_prices[item['cake_id']]
+        elif item.get('template_id'):
+            cake_price = template_prices[item['template_id']]
+        else:
+            cake_price = None
+        base_price, customization_price = table.price_item(item, cake_price)
+        unit_price = base_price + customization_price
+        subtotal = unit_price * item['quantity']
+        total += subtotal
+        lines.append({
+            'index': index,
+            'cake_id': item.get('cake_id'),
+            'template_id': item.get('template_id'),
+            'cake_size': item.get('cake_size'),
+            'quantity': item['quantity'],
+            'base_price': base_price,
+            'customization_price': customization_price,
+            'unit_price': unit_price,
+            'subtotal': subtotal,
+        })
+    return {
+        'items': lines,
+        'item_count': sum(item['quantity'] for item in items),
+        'total': total,
+    }
@@ -0,0 +1,108 @@
+# backend/services/search_service.py
+import re
+from sqlalchemy import text
+from sqlalchemy.orm import selectinload
+
+from extensions import db
+from models.cake import Cake
+from models.customization import CakeTemplate
+
+
+# Union of both indexes, ranked in the database, one page at a time.
+# Only the matching (kind, id, rank) tuples come back; rows are loaded after.
+POSTGRES_SEARCH_SQL = text("""
+    SELECT kind, id, rank FROM (
+        SELECT 'cake' AS kind, c.id AS id,
+               ts_rank_cd(c.search_vector, query) AS rank
+        FROM cake c, websearch_to_tsquery('english', :q) AS query
+        WHERE c.search_vector @@ query
+        UNION ALL
+        SELECT 'template' AS kind, t.id AS id,
+               ts_rank_cd(t.search_vector, query) AS rank
+        FROM cake_template t, websearch_to_tsquery('english', :q) AS query
+        WHERE t.search_vector @@ query AND t.is_available
+    ) AS hits
+    ORDER BY rank DESC, kind, id
+    LIMIT :limit OFFSET :offset
+""")
+
+# bm25() is "lower is better", so it is negated to rank like ts_rank.
+# Column weights follow SEARCH_COLUMNS: name, description(, category).
+SQLITE_SEARCH_SQL = text("""
+    SELECT kind, id, rank FROM (
+        SELECT 'cake' AS kind, cake_fts.rowid AS id,
+               -bm25(cake_fts, 10.0, 1.0) AS rank
+        FROM cake_fts
+        WHERE cake_fts MATCH :q
+        UNION ALL
+        SELECT 'template' AS kind, cake_template_fts.rowid AS id,
+               -bm25(cake_template_fts, 10.0, 1.0, 5.0) AS rank
+        FROM cake_template_fts
+        JOIN cake_template ON cake_template.id = cake_template_fts.rowid
+        WHERE cake_template_fts MATCH :q AND cake_template.is_available
+    ) AS hits
+    ORDER BY rank DESC, kind, id
+    LIMIT :limit OFFSET :offset
+""")
+
+
+def to_fts5_query(q):
+    """
+    Turn free text into a safe FTS5 query.
+
+    Every word becomes a quoted prefix term and all terms must match, so
+    user input can never inject FTS5 operators or column filters.
+    """
+    terms = re.findall(r'\w+', q.lower())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_catalog(q, page, per_page):
+    """
+    Full-text search over cakes and available portfolio templates.
+
+    Args:
+        q: Free-text query from the user
+        page: 1-based page number
+        per_page: Results per page
+
+    Returns:
+        tuple: (hits, has_next) where hits is a list of
+               (kind, model instance, rank) in rank order
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        statement, query = POSTGRES_SEARCH_SQL, q
+    else:
+        statement, query = SQLITE_SEARCH_SQL, to_fts5_query(q)
+        if not query:
+            return [], False
+
+    rows = db.session.execute(statement, {
+        'q': query,
+        'limit': per_page + 1,
+        'offset': (page - 1) * per_page,
+    }).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    # One IN query per table for the rows on this page
+    cake_ids = [row.id for row in rows if row.kind == 'cake']
+    template_ids = [row.id for row in rows if row.kind == 'template']
+    cakes = {}
+    templates = {}
+    if cake_ids:
+        cakes = {c.id: c for c in Cake.query.filter(Cake.id.in_(cake_ids))}
+    if template_ids:
+        templates = {
+            t.id: t for t in CakeTemplate.query
+            .options(selectinload(CakeTemplate.images))
+            .filter(CakeTemplate.id.in_(template_ids))
+        }
+
+    hits = []
+    for row in rows:
+        instance = (cakes if row.kind == 'cake' else templates).get(row.id)
+        if instance is not None:
+            hits.append((row.kind, instance, float(row.rank)))
+    return hits, has_next
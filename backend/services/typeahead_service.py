@@ -0,0 +1,177 @@
+# backend/services/typeahead_service.py
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from flask import current_app
+
+from models.cake import Cake
+from models.customization import CakeTemplate, CustomizationOption
+from utils.http_cache import table_fingerprint
+
+
+# Upper bound on index entries inspected per lookup; keeps every keystroke
+# O(log n + SCAN_LIMIT) no matter how popular a prefix is.
+SCAN_LIMIT = 200
+
+
+def normalize(text):
+    """Lower-case and collapse whitespace so lookups are case-insensitive."""
+    return ' '.join(text.lower().split())
+
+
+class SuggestionIndex:
+    """
+    In-memory typeahead index over catalog names.
+
+    Every label is stored once per word start ("chocolate fudge cake",
+    "fudge cake", "cake") in a sorted list, so a prefix lookup is a bisect
+    to the first candidate followed by a short forward scan. The index is
+    built lazily on the first lookup and then maintained incrementally with
+    upsert() / remove() from the controllers that write catalog rows.
+
+    Those hooks only reach this process. Every TYPEAHEAD_TTL seconds a
+    lookup also compares the source tables' fingerprint with the one the
+    index was built from and rebuilds on a change, so writes made by other
+    workers or scripts show up within that interval.
+    """
+
+    SOURCES = (Cake, CakeTemplate, CustomizationOption)
+
+    def __init__(self):
+        self._keys = []      # sorted (suffix, kind, id)
+        self._labels = {}    # (kind, id) -> label
+        self._loaded = False
+        self._fingerprint = None
+        self._checked_at = None  # monotonic time of the last fingerprint check
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _suffixes(label):
+        text = normalize(label)
+        return [text[m.start():] for m in re.finditer(r'\S+', text)]
+
+    def _add(self, kind, id, label):
+        self._labels[(kind, id)] = label
+        for suffix in self._suffixes(label):
+            insort(self._keys, (suffix, kind, id))
+
+    def _discard(self, kind, id):
+        label = self._labels.pop((kind, id), None)
+        if label is None:
+            return
+        for suffix in self._suffixes(label):
+            i = bisect_left(self._keys, (suffix, kind, id))
+            if i < len(self._keys) and self._keys[i] == (suffix, kind, id):
+                del self._keys[i]
+
+    def _load(self, fingerprint=None):
+        """Build the index from the database (one query per source)."""
+        self._fingerprint = fingerprint or table_fingerprint(*self.SOURCES)
+        self._checked_at = time.monotonic()
+        self._keys = []
+        self._labels = {}
+        entries = []
+        entries += [('cake', c.id, c.name) for c in Cake.query.with_entities(Cake.id, Cake.name)]
+        entries += [
+            ('template', t.id, t.name) for t in CakeTemplate.query
+            .with_entities(CakeTemplate.id, CakeTemplate.name)
+            .filter_by(is_available=True)
+        ]
+        categories = CakeTemplate.query.with_entities(CakeTemplate.category).filter(
+            CakeTemplate.category.isnot(None), CakeTemplate.is_available.is_(True)
+        ).distinct()
+        entries += [('category', c.category, c.category) for c in categories]
+        entries += [
+            ('flavor', o.id, o.name) for o in CustomizationOption.query
+            .with_entities(CustomizationOption.id, CustomizationOption.name)
+            .filter_by(category='flavor', active=True)
+        ]
+
+        for kind, id, label in entries:
+            self._labels[(kind, id)] = label
+            self._keys.extend((suffix, kind, id) for suffix in self._suffixes(label))
+        self._keys.sort()
+        self._loaded = True
+
+    def _check_due(self):
+        """Whether the fingerprint of an index built from the database is due a check."""
+        return self._checked_at is not None and (
+            time.monotonic() - self._checked_at > current_app.config.get('TYPEAHEAD_TTL', 60)
+        )
+
+    def ensure_loaded(self):
+        if self._loaded and not self._check_due():
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            elif self._check_due():
+                self._checked_at = time.monotonic()
+                fingerprint = table_fingerprint(*self.SOURCES)
+                if fingerprint != self._fingerprint:
+                    self._load(fingerprint)
+
+    def upsert(self, kind, id, label):
+        """Add or rename one entry (no-op until the index is first built)."""
+        with self._lock:
+            if not self._loaded:
+                return
+            self._discard(kind, id)
+            if label:
+                self._add(kind, id, label)
+
+    def remove(self, kind, id):
+        """Drop one entry (no-op until the index is first built)."""
+        with self._lock:
+            if self._loaded:
+                self._discard(kind, id)
+
+    def invalidate(self):
+        """Force a full rebuild on the next lookup."""
+        with self._lock:
+            self._loaded = False
+
+    def suggest(self, prefix, limit=10):
+        """
+        Return up to `limit` suggestions whose words start with `prefix`.
+
+        Labels that start with the prefix come before mid-label word matches;
+        ties are broken alphabetically.
+        """
+        self.ensure_loaded()
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        # Copy the candidate window (and its labels) under the lock: writers
+        # insert into and delete from the same list in place
+        with self._lock:
+            start = bisect_left(self._keys, (prefix,))
+            window = [
+                (kind, id, self._labels.get((kind, id)))
+                for suffix, kind, id in self._keys[start:start + SCAN_LIMIT]
+                if suffix.startswith(prefix)
+            ]
+
+        matches = {}
+        for kind, id, label in window:
+            if label is not None:
+                starts_label = normalize(label).startswith(prefix)
+                best = matches.get((kind, id))
+                if best is None or (starts_label and not best[0]):
+                    matches[(kind, id)] = (starts_label, label)
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (not item[1][0], item[1][1].lower())
+        )
+        return [
+            {'text': label, 'type': kind, 'id': id}
+            for (kind, id), (_, label) in ranked[:limit]
+        ]
+
+
+# Process-wide index shared by all requests
+typeahead_index = SuggestionIndex()
@@ -2,6 +2,7 @@
 import pytest
 import os
 import sys
+from datetime import datetime
 
 # Add backend directory to path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
@@ -10,6 +11,10 @@ from app import create_app
 from extensions import db
 from models.User import User
 from models.cake import Cake
+from models.customization import CustomizationOption
+from models.order import Order, OrderItem, OrderItemImage
+from utils.cache import clear_all_caches
+from services.typeahead_service import typeahead_index
 from werkzeug.security import generate_password_hash
 
 
@@ -37,6 +42,8 @@ def db_session(app):
     """Create database session for testing."""
     with app.app_context():
         db.create_all()
+        clear_all_caches()
+        typeahead_index.invalidate()
         yield db
         db.session.remove()
         db.drop_all()
@@ -109,3 +116,76 @@ def admin_headers(client, admin_user):
     if cookie:
         return {'Cookie': cookie}
     return {}
+
+
+@pytest.fixture
+def admin_csrf_headers(client, admin_user):
+    """Log the test client in as admin and return the CSRF header for writes."""
+    client.post('/api/auth/login', json={
+        'email': 'admin@example.com',
+        'password': 'AdminPass123'
+    })
+    csrf_cookie = client.get_cookie('csrf_access_token')
+    if csrf_cookie is None:
+        return {}
+    return {'X-CSRF-TOKEN': csrf_cookie.value}
+
+
+@pytest.fixture
+def sql_statements(db_session):
+    """Record every SQL statement sent to the database during a test."""
+    from sqlalchemy import event
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db_session.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db_session.engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def make_orders():
+    """Factory for transient orders with items, a reference image and a nested cake."""
+    def factory(count, items_per_order=3):
+        now = datetime(2026, 3, 1, 12, 30, 15, 123456)
+        cake = Cake(id=1, name='Chocolate Cake', description='Rich chocolate layers', price=25.5)
+        orders = []
+        for i in range(count):
+            order = Order(
+                id=i, order_number=f'ORD-20260301-{i:04d}', customer_name='Jane Doe',
+                customer_email='jane@example.com', customer_phone='0712345678',
+                delivery_address='1 Cake Street', delivery_date=now, subtotal=51.0,
+                delivery_fee=5.0, total_price=56.0, status='pending', created_at=now
+            )
+            for j in range(items_per_order):
+                item = OrderItem(
+                    id=i * items_per_order + j, cake_id=1, quantity=2, flavor='Vanilla',
+                    is_vegan=bool(j % 2), base_price=25.5, customization_price=0,
+                    unit_price=25.5, subtotal=51, created_at=now
+                )
+                item.cake = cake
+                item.reference_images.append(OrderItemImage(id=j, image_url='http://x/i.png'))
+                order.items.append(item)
+            orders.append(order)
+        return orders
+    
+    return factory
+
+
+@pytest.fixture
+def pricing_options(db_session):
+    """Size, topping and dietary options used to price custom cakes."""
+    options = [
+        CustomizationOption(category='size', name='Medium', price=1500.0),
+        CustomizationOption(category='size', name='Large', price=2500.0),
+        CustomizationOption(category='topping', name='Sprinkles', price=150.0),
+        CustomizationOption(category='topping', name='Berries', price=300.0),
+        CustomizationOption(category='flavor', name='Vanilla', price=400.0),
+        CustomizationOption(category='dietary_restriction', name='Gluten-Free', price=200.0),
+        CustomizationOption(category='dietary_restriction', name='Vegan', price=250.0),
+    ]
+    db_session.session.add_all(options)
+    db_session.session.commit()
+    return {option.name: option for option in options}
@@ -0,0 +1,192 @@
+# backend/tests/test_api/test_admin.py
+import pytest
+from datetime import datetime, timedelta
+from flask import json
+from models.order import Order
+
+
+@pytest.fixture
+def sample_orders(db_session):
+    """Create orders spread over several days (two share a timestamp)."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    created = [base, base + timedelta(days=1), base + timedelta(days=1), base + timedelta(days=2)]
+    orders = []
+    for i, created_at in enumerate(created):
+        orders.append(Order(
+            order_number=f'ORD-TEST-{i:03d}',
+            customer_name=f'Customer {i}',
+            customer_email=f'customer{i}@example.com',
+            customer_phone='0700000000',
+            delivery_address='1 Bakery Lane, Nairobi',
+            delivery_date=base + timedelta(days=7),
+            subtotal=1000.0,
+            total_price=1660.0,
+            status='pending' if i % 2 else 'confirmed',
+            created_at=created_at
+        ))
+    db_session.session.add_all(orders)
+    db_session.session.commit()
+    return orders
+
+
+def test_admin_orders_cursor_pagination(client, admin_csrf_headers, sample_orders):
+    """Test keyset pagination over (created_at, id) returns every order once."""
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get(f'/api/admin/orders?cursor={cursor}&per_page=3')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert 'total' not in data
+        seen.extend(order['order_number'] for order in data['orders'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    
+    expected = sorted(sample_orders, key=lambda o: (o.created_at, o.id), reverse=True)
+    assert seen == [order.order_number for order in expected]
+
+
+def test_admin_orders_offset_pagination(client, admin_csrf_headers, sample_orders):
+    """Test the classic page/per_page mode still reports totals."""
+    response = client.get('/api/admin/orders?page=1&per_page=3&status=pending')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['total'] == 2
+    assert len(data['orders']) == 2
+
+
+def test_admin_users_cursor_pagination(client, admin_csrf_headers, sample_user, admin_user, db_session):
+    """Test keyset pagination over users."""
+    sample_user.created_at = datetime(2026, 1, 1, 9, 0, 0)
+    admin_user.created_at = datetime(2026, 1, 1, 9, 0, 0)
+    db_session.session.commit()
+    
+    response = client.get('/api/admin/users?cursor=&per_page=1')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['users']) == 1
+    assert data['next_cursor']
+    
+    response = client.get(f"/api/admin/users?cursor={data['next_cursor']}&per_page=1")
+    data2 = json.loads(response.data)
+    assert len(data2['users']) == 1
+    assert data2['users'][0]['id'] != data['users'][0]['id']
+    assert data2['next_cursor'] is None
+
+
+def test_admin_listings_reject_out_of_range_per_page(client, admin_csrf_headers, sample_user):
+    """per_page is bounded like every other paginated endpoint, in both modes."""
+    for url in ('/api/admin/users?cursor=&per_page=0', '/api/admin/users?per_page=0',
+                '/api/admin/orders?cursor=&per_page=0', '/api/admin/orders?per_page=1000'):
+        assert client.get(url).status_code == 400
+
+
+def test_admin_orders_sparse_fieldset(client, admin_csrf_headers, sample_orders, sql_statements):
+    """Test ?fields= on the admin order list skips unrequested columns and relations."""
+    response = client.get('/api/admin/orders?fields=order_number,status&per_page=2')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert all(set(order) == {'order_number', 'status'} for order in data['orders'])
+    # paginate()'s COUNT(*) wraps the unprojected query; only the row SELECT is projected
+    row_selects = [s for s in sql_statements if s.startswith('SELECT "order"')]
+    assert row_selects
+    assert not any('delivery_address' in s for s in row_selects)
+    assert not any('order_item' in s for s in sql_statements)
+
+
+def test_admin_import_cakes_csv(client, admin_csrf_headers, app, monkeypatch):
+    """Test streaming CSV import validates per row and upserts by name."""
+    monkeypatch.setitem(app.config, 'CATALOG_IMPORT_BATCH_SIZE', 2)
+    body = (
+        "name,description,price,image_url\n"
+        "Vanilla Dream,Light vanilla sponge cake,20.5,\n"
+        "Bad,too short,-1,\n"
+        "Mocha Delight,Coffee and chocolate layers,31,https://example.com/mocha.jpg\n"
+    )
+    response = client.post(
+        '/api/admin/cakes/import?format=csv',
+        headers=admin_csrf_headers,
+        data=body,
+        content_type='text/csv'
+    )
+    
+    assert response.status_code == 200
+    report = json.loads(response.data)
+    assert (report['processed'], report['inserted'], report['updated']) == (3, 2, 0)
+    assert report['error_count'] == 1
+    assert report['errors'][0]['row'] == 2
+    
+    # Re-importing updates in place instead of duplicating
+    response = client.post(
+        '/api/admin/cakes/import',
+        headers=admin_csrf_headers,
+        data='{"name": "Vanilla Dream", "description": "Now with berries on top", "price": 22}\n',
+        content_type='application/x-ndjson'
+    )
+    report = json.loads(response.data)
+    assert (report['inserted'], report['updated']) == (0, 1)
+    
+    cakes = {c['name']: c for c in json.loads(client.get('/api/cakes').data)}
+    assert set(cakes) == {'Vanilla Dream', 'Mocha Delight'}
+    assert cakes['Vanilla Dream']['price'] == 22.0
+
+
+def test_admin_import_export_options_round_trip(client, admin_csrf_headers):
+    """Test NDJSON option import and a streamed CSV export of the same rows."""
+    body = (
+        '{"category": "topping", "name": "Sprinkles", "price": 150, "is_active": true}\n'
+        'not json\n'
+        '{"category": "size", "name": "Large", "price": 2500, "is_vegan_compatible": false}\n'
+    )
+    response = client.post(
+        '/api/admin/cakes/import?type=option&format=ndjson',
+        headers=admin_csrf_headers,
+        data=body
+    )
+    report = json.loads(response.data)
+    assert (report['inserted'], report['error_count']) == (2, 1)
+    
+    response = client.get('/api/admin/cakes/export?type=option&format=csv')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).strip().splitlines()
+    assert lines[0].split(',')[:3] == ['id', 'category', 'name']
+    assert 'is_active' in lines[0]
+    assert len(lines) == 3
+    
+    response = client.get('/api/admin/cakes/export?type=option')
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert {r['name'] for r in records} == {'Sprinkles', 'Large'}
+
+
+def test_admin_reimport_partial_row_keeps_omitted_columns(client, admin_csrf_headers, db_session):
+    """Columns a re-imported row leaves out are not reset to schema defaults."""
+    from models.customization import CustomizationOption
+    option = CustomizationOption(
+        category='topping', name='Gold Leaf', price=900.0, active=False, sort_order=7,
+        is_vegan_compatible=False, is_gluten_free_compatible=False
+    )
+    db_session.session.add(option)
+    db_session.session.commit()
+    
+    response = client.post(
+        '/api/admin/cakes/import?type=option&format=csv',
+        headers=admin_csrf_headers,
+        data='category,name,price\ntopping,Gold Leaf,950\ntopping,Silver Leaf,400\n'
+    )
+    report = json.loads(response.data)
+    assert (report['inserted'], report['updated']) == (1, 1)
+    
+    db_session.session.expire_all()
+    option = CustomizationOption.query.filter_by(name='Gold Leaf').one()
+    assert option.price == 950.0
+    assert (option.active, option.sort_order) == (False, 7)
+    assert (option.is_vegan_compatible, option.is_gluten_free_compatible) == (False, False)
+    
+    # New rows still get the schema defaults
+    option = CustomizationOption.query.filter_by(name='Silver Leaf').one()
+    assert (option.active, option.sort_order, option.is_vegan_compatible) == (True, 0, True)
@@ -1,6 +1,8 @@
 # backend/tests/test_api/test_cakes.py
 import pytest
 from flask import json
+from models.cake import Cake
+from utils.cache import catalog_cache
 
 
 def test_get_all_cakes(client, sample_cake):
@@ -129,3 +131,114 @@ def test_delete_cake(client, admin_headers, sample_cake):
     
     # Accept various status codes
     assert response.status_code in [200, 204, 401, 404]
+
+
+def test_cake_list_served_from_catalog_cache(client, sample_cake, db_session):
+    """Test that repeated catalog reads do not hit the database."""
+    first = client.get('/api/cakes')
+    assert first.status_code == 200
+    
+    # Change the row behind the cache's back: the cached bytes are still served
+    sample_cake.name = 'Changed Directly'
+    db_session.session.commit()
+    
+    second = client.get('/api/cakes')
+    assert second.data == first.data
+    assert json.loads(second.data)[0]['name'] == 'Chocolate Cake'
+
+
+def test_catalog_cache_is_bounded(client, sample_cake, monkeypatch):
+    """Arbitrary page parameters cannot grow the cache past its limit."""
+    monkeypatch.setattr(catalog_cache, 'max_entries', 5)
+    
+    for page in range(1, 21):
+        assert client.get(f'/api/cakes?page={page}&per_page=1').status_code == 200
+    
+    assert len(catalog_cache._entries) == 5
+    # Least recently used pages were evicted; the latest are still cached
+    assert catalog_cache.get(('page', 20, 1, None)) is not None
+    assert catalog_cache.get(('page', 1, 1, None)) is None
+
+
+def test_admin_write_invalidates_catalog_cache(client, admin_csrf_headers, sample_cake):
+    """Test that admin cake writes bump the catalog version."""
+    if not admin_csrf_headers:
+        pytest.skip("Auth headers not available")
+    
+    client.get('/api/cakes')
+    client.get(f'/api/cakes/{sample_cake.id}')
+    
+    response = client.put(
+        f'/api/admin/cakes/{sample_cake.id}',
+        headers=admin_csrf_headers,
+        json={'name': 'Renamed Chocolate Cake'}
+    )
+    assert response.status_code == 200
+    
+    data = json.loads(client.get('/api/cakes').data)
+    assert data[0]['name'] == 'Renamed Chocolate Cake'
+    
+    data = json.loads(client.get(f'/api/cakes/{sample_cake.id}').data)
+    assert data['name'] == 'Renamed Chocolate Cake'
+
+
+def test_cake_list_conditional_get(client, sample_cake):
+    """Test that a matching If-None-Match returns 304 without a body."""
+    response = client.get('/api/cakes')
+    etag = response.headers.get('ETag')
+    assert etag
+    
+    cached = client.get('/api/cakes', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    
+    stale = client.get('/api/cakes', headers={'If-None-Match': '"stale"'})
+    assert stale.status_code == 200
+
+
+def test_get_cakes_with_cursor(client, db_session):
+    """Test keyset pagination walks every cake exactly once."""
+    for i in range(5):
+        db_session.session.add(Cake(name=f'Cake {i}', description='Layered sponge cake', price=10.0 + i))
+    db_session.session.commit()
+    
+    seen = []
+    cursor = ''
+    while True:
+        response = client.get(f'/api/cakes?cursor={cursor}&per_page=2')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert 'total' not in data['pagination']
+        seen.extend(cake['name'] for cake in data['cakes'])
+        cursor = data['pagination']['next_cursor']
+        if not cursor:
+            break
+    
+    assert seen == [f'Cake {i}' for i in range(5)]
+
+
+def test_get_cakes_with_invalid_cursor(client, db_session):
+    """Test that a tampered cursor is rejected as a validation error."""
+    response = client.get('/api/cakes?cursor=not-a-cursor')
+    assert response.status_code == 400
+
+
+def test_get_cakes_sparse_fieldset(client, sample_cake, sql_statements):
+    """Test ?fields= limits both the payload and the selected columns."""
+    response = client.get('/api/cakes?fields=id,name,price')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data == [{'id': sample_cake.id, 'name': 'Chocolate Cake', 'price': 25.0}]
+    
+    selects = [s for s in sql_statements if s.lstrip().upper().startswith('SELECT')]
+    assert selects and all('description' not in s for s in selects)
+
+
+def test_get_cakes_unknown_field(client, sample_cake):
+    """Test that unknown fields are rejected."""
+    response = client.get('/api/cakes?fields=id,secret')
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['unknown_fields'] == ['secret']
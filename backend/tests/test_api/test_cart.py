@@ -0,0 +1,436 @@
+# backend/tests/test_api/test_cart.py
+import pytest
+from extensions import db
+from models.cart import Cart, CartItem, CartItemImage
+from models.customization import CustomizationOption
+from services.cart_service import find_cart_total_drift, recompute_cart_totals
+from services.cart_store import SqlCartStore
+
+
+def test_add_custom_cake_to_cart(client, pricing_options):
+    """Custom cakes are priced from size, topping and dietary options."""
+    toppings = [pricing_options['Sprinkles'].id, pricing_options['Berries'].id,
+                pricing_options['Vanilla'].id]  # not a topping: ignored
+    response = client.post('/api/cart/items', json={
+        'cake_size': 'Large', 'quantity': 2, 'toppings': toppings,
+        'is_gluten_free': True, 'is_vegan': True,
+    })
+
+    assert response.status_code == 201
+    item = response.get_json()['items'][0]
+    assert item['base_price'] == 2500.0
+    assert item['customization_price'] == 150.0 + 300.0 + 200.0 + 250.0
+    assert response.get_json()['total'] == (2500.0 + 900.0) * 2
+
+
+def test_add_catalog_cake_to_cart(client, sample_cake, pricing_options):
+    response = client.post('/api/cart/items', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+        'toppings': [pricing_options['Sprinkles'].id],
+    })
+
+    assert response.status_code == 201
+    item = response.get_json()['items'][0]
+    assert item['base_price'] == sample_cake.price
+    assert item['customization_price'] == 150.0
+
+
+def test_add_to_cart_prices_without_option_queries(client, pricing_options, sql_statements):
+    """Once the pricing table is loaded, pricing issues no option queries."""
+    payload = {'cake_size': 'Medium', 'quantity': 1, 'is_vegan': True,
+               'toppings': [pricing_options['Berries'].id]}
+    client.post('/api/cart/items', json=payload)
+    sql_statements.clear()
+
+    response = client.post('/api/cart/items', json=payload)
+
+    assert response.status_code == 201
+    option_selects = [
+        s for s in sql_statements
+        if s.lstrip().startswith('SELECT') and 'FROM customization_option' in s
+    ]
+    assert option_selects == []
+
+
+def test_option_writes_reprice_cart_items(client, pricing_options):
+    payload = {'cake_size': 'Medium', 'quantity': 1}
+    assert client.post('/api/cart/items', json=payload).get_json()['items'][0]['base_price'] == 1500.0
+
+    medium = pricing_options['Medium']
+    client.put(f'/api/admin/customizations/{medium.id}', json={'price': 1750.0})
+    items = client.post('/api/cart/items', json=payload).get_json()['items']
+    assert sorted(item['base_price'] for item in items) == [1500.0, 1750.0]
+
+    client.delete(f'/api/admin/customizations/{medium.id}')
+    items = client.post('/api/cart/items', json=payload).get_json()['items']
+    assert sorted(item['base_price'] for item in items) == [0.0, 1500.0, 1750.0]
+
+
+def test_add_to_cart_rejects_options_outside_diet(client, pricing_options, db_session):
+    honey = CustomizationOption(category='topping', name='Honeycomb', price=250.0,
+                                is_vegan_compatible=False)
+    butter = CustomizationOption(category='flavor', name='Butter Vanilla',
+                                 is_vegan_compatible=False)
+    db_session.session.add_all([honey, butter])
+    db_session.session.commit()
+
+    response = client.post('/api/cart/items', json={
+        'cake_size': 'Medium', 'quantity': 1, 'is_vegan': True, 'flavor': 'Butter Vanilla',
+        'toppings': [pricing_options['Sprinkles'].id, honey.id],
+    })
+
+    assert response.status_code == 400
+    conflicts = response.get_json()['incompatible_options']
+    assert [option['name'] for option in conflicts] == ['Honeycomb', 'Butter Vanilla']
+
+    # The same options are fine without the vegan flag
+    response = client.post('/api/cart/items', json={
+        'cake_size': 'Medium', 'quantity': 1, 'flavor': 'Butter Vanilla', 'toppings': [honey.id],
+    })
+    assert response.status_code == 201
+
+
+def test_get_cart_query_budget(client, sample_cake, pricing_options, db_session, sql_statements):
+    """GET /api/cart costs at most three statements, however many items it holds."""
+    client.post('/api/cart/items', json={'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1})
+    cart = Cart.query.one()
+
+    def render():
+        sql_statements.clear()
+        response = client.get('/api/cart')
+        assert response.status_code == 200
+        return response.get_json(), list(sql_statements)
+
+    _, single = render()
+
+    for i in range(20):
+        item = CartItem(cart_id=cart.id, cake_id=sample_cake.id, cake_size='Large',
+                        quantity=2, base_price=25.0, customization_price=5.0)
+        item.reference_images.append(CartItemImage(image_url=f'https://example.com/ref{i}.jpg'))
+        db_session.session.add(item)
+    db_session.session.commit()
+    recompute_cart_totals([cart.id])
+
+    data, many = render()
+
+    assert len(single) <= 3
+    assert len(many) <= 3
+    assert len(data['items']) == 21
+    assert data['items'][-1]['cake']['name'] == sample_cake.name
+    assert len(data['items'][-1]['reference_images']) == 1
+    assert data['item_count'] == 1 + 20 * 2
+    assert data['total'] == sample_cake.price + 20 * 30.0 * 2
+
+
+def test_cart_totals_maintained_by_deltas(client, sample_cake, pricing_options):
+    """Stored totals follow every add, update, remove and clear."""
+    def totals(response):
+        data = response.get_json()
+        return data['total'], data['item_count']
+
+    custom = {'cake_size': 'Large', 'quantity': 2, 'toppings': [pricing_options['Berries'].id]}
+    response = client.post('/api/cart/items', json=custom)
+    assert totals(response) == ((2500.0 + 300.0) * 2, 2)
+    custom_id = response.get_json()['items'][0]['id']
+
+    response = client.post('/api/cart/items', json={'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1})
+    assert totals(response) == (5600.0 + sample_cake.price, 3)
+    catalog_id = response.get_json()['items'][1]['id']
+
+    response = client.put(f'/api/cart/items/{custom_id}', json={'cake_size': 'Large', 'quantity': 5})
+    assert totals(response) == (2800.0 * 5 + sample_cake.price, 6)
+    assert find_cart_total_drift() == []
+
+    response = client.delete(f'/api/cart/items/{catalog_id}')
+    assert totals(response) == (2800.0 * 5, 5)
+
+    client.post('/api/cart/clear')
+    assert totals(client.get('/api/cart')) == (0.0, 0)
+    assert find_cart_total_drift() == []
+
+
+def test_cart_badge_is_single_read(client, pricing_options, sql_statements):
+    assert client.get('/api/cart/count').get_json() == {'item_count': 0}
+    assert Cart.query.count() == 0  # The badge never creates a cart
+
+    client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 3})
+    sql_statements.clear()
+
+    response = client.get('/api/cart/count')
+
+    assert response.get_json() == {'item_count': 3}
+    assert len(sql_statements) == 1
+    assert 'cart.id = ' in sql_statements[0]
+
+
+def test_guest_cart_reads_never_write(client, pricing_options, sql_statements):
+    """Anonymous reads get a virtual empty cart; the row appears with the first item."""
+    for _ in range(3):
+        response = client.get('/api/cart')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert (data['items'], data['total'], data['item_count']) == ([], 0.0, 0)
+    assert client.post('/api/cart/clear').status_code == 200
+    assert client.delete('/api/cart/items/1').status_code == 404
+
+    assert not [s for s in sql_statements if not s.lstrip().startswith('SELECT')]
+    assert Cart.query.count() == 0
+
+    client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1})
+    assert Cart.query.count() == 1
+    assert client.get('/api/cart').get_json()['item_count'] == 1
+
+
+def test_failed_add_does_not_create_cart(client, db_session):
+    response = client.post('/api/cart/items', json={'cake_id': 4242, 'cake_size': 'Medium', 'quantity': 1})
+
+    assert response.status_code == 404
+    assert Cart.query.count() == 0
+
+
+def test_user_cart_read_does_not_write(client, auth_headers, sql_statements):
+    sql_statements.clear()
+
+    assert client.get('/api/cart').status_code == 200
+    assert not [s for s in sql_statements if not s.lstrip().startswith('SELECT')]
+    assert Cart.query.count() == 0
+
+
+def test_login_merges_guest_cart_set_based(client, sample_user, pricing_options, sql_statements):
+    user_cart = Cart(user_id=sample_user.id, total_amount=1500.0, item_count=1)
+    user_cart.items.append(CartItem(cake_size='Medium', quantity=1, base_price=1500.0,
+                                    customization_price=0.0))
+    db.session.add(user_cart)
+    db.session.commit()
+    for quantity in (1, 2, 3):
+        client.post('/api/cart/items', json={'cake_size': 'Large', 'quantity': quantity})
+    sql_statements.clear()
+
+    client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'TestPass123'})
+
+    item_moves = [s for s in sql_statements if s.lstrip().startswith('UPDATE cart_item')]
+    assert len(item_moves) == 1
+    assert Cart.query.count() == 1
+    data = client.get('/api/cart').get_json()
+    assert data['id'] == user_cart.id
+    assert len(data['items']) == 4
+    assert (data['total'], data['item_count']) == (1500.0 + 2500.0 * 6, 7)
+    assert find_cart_total_drift() == []
+
+
+def test_failed_merge_keeps_guest_cart(client, sample_user, pricing_options, monkeypatch):
+    guest = client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 2}).get_json()
+    with client.session_transaction() as session:
+        session_id = session['cart_session_id']
+
+    def fail_merge(self, session_id, user_id):
+        raise RuntimeError('database unavailable')
+    monkeypatch.setattr(SqlCartStore, 'merge', fail_merge)
+    response = client.post('/api/auth/login', json={
+        'email': 'test@example.com', 'password': 'TestPass123',
+    })
+
+    assert response.status_code == 200
+    with client.session_transaction() as session:
+        assert session['cart_session_id'] == session_id
+    cart = Cart.query.get(guest['id'])
+    assert (cart.session_id, cart.user_id, cart.item_count) == (session_id, None, 2)
+
+
+def test_register_adopts_guest_cart(client, pricing_options):
+    guest = client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 2}).get_json()
+
+    response = client.post('/api/auth/register', json={
+        'name': 'New Customer', 'email': 'new@example.com', 'password': 'Secret123',
+    })
+
+    assert response.status_code == 201
+    cart = Cart.query.get(guest['id'])
+    assert (cart.user_id, cart.session_id) == (response.get_json()['user']['id'], None)
+    assert client.get('/api/cart').get_json()['item_count'] == 2
+
+
+def test_bulk_cart_operations_apply_in_order(client, sample_cake, pricing_options):
+    first = client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1}).get_json()
+    second = client.post('/api/cart/items', json={'cake_size': 'Large', 'quantity': 1}).get_json()
+    medium_id, large_id = (item['id'] for item in second['items'])
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'add', 'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 2},
+        {'op': 'add', 'cake_size': 'Large', 'quantity': 1, 'toppings': [pricing_options['Berries'].id]},
+        {'op': 'update', 'id': medium_id, 'quantity': 3},
+        {'op': 'remove', 'id': large_id},
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['id'] == first['id']
+    assert [item['quantity'] for item in data['items']] == [3, 2, 1]
+    assert (data['total'], data['item_count']) == (1500.0 * 3 + 25.0 * 2 + 2800.0, 6)
+    assert find_cart_total_drift() == []
+
+
+def test_bulk_cart_operations_read_in_fixed_queries(client, sample_cake, pricing_options, sql_statements):
+    """Cakes and referenced items are each read once, whatever the batch size."""
+    item_ids = [
+        item['id'] for item in client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1})
+        .get_json()['items']
+    ]
+
+    def selects(operations):
+        sql_statements.clear()
+        assert client.patch('/api/cart/items', json={'operations': operations}).status_code == 200
+        return len([s for s in sql_statements if s.lstrip().startswith('SELECT')])
+
+    small = selects([
+        {'op': 'add', 'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1},
+        {'op': 'update', 'id': item_ids[0], 'quantity': 2},
+    ])
+    large = selects(
+        [{'op': 'add', 'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1}] * 10
+        + [{'op': 'update', 'id': item_ids[0], 'quantity': quantity} for quantity in range(1, 11)]
+    )
+
+    assert large == small
+
+
+def test_bulk_cart_operations_are_all_or_nothing(client, pricing_options):
+    before = client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1}).get_json()
+    item_id = before['items'][0]['id']
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'add', 'cake_size': 'Large', 'quantity': 1},
+        {'op': 'remove', 'id': item_id},
+        {'op': 'update', 'id': item_id, 'quantity': 2},
+    ]})
+
+    assert response.status_code == 404
+    assert response.get_json()['operation'] == 2
+    after = client.get('/api/cart').get_json()
+    assert (after['items'], after['total']) == (before['items'], before['total'])
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'add', 'cake_size': 'Medium', 'quantity': 1},
+        {'op': 'update', 'quantity': 2},
+    ]})
+    assert response.status_code == 400
+    assert response.get_json()['validation_errors'] == {
+        'operations': {'1': {'id': ['Missing data for required field.']}}
+    }
+
+
+def test_bulk_cart_update_reprices_size_changes(client, sample_cake, pricing_options):
+    custom = client.post('/api/cart/items', json={
+        'cake_size': 'Medium', 'quantity': 1, 'toppings': [pricing_options['Sprinkles'].id],
+    }).get_json()['items'][0]
+    catalog = client.post('/api/cart/items', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+    }).get_json()['items'][1]
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'update', 'id': custom['id'], 'cake_size': 'Large', 'quantity': 2},
+        {'op': 'update', 'id': catalog['id'], 'cake_size': 'Large'},
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [(item['cake_size'], item['base_price'], item['customization_price'])
+            for item in data['items']] == [('Large', 2500.0, 150.0), ('Large', 25.0, 0.0)]
+    assert data['total'] == (2500.0 + 150.0) * 2 + 25.0
+    assert find_cart_total_drift() == []
+
+
+@pytest.mark.parametrize('method', ['PUT', 'PATCH'])
+def test_size_change_is_repriced_by_put_and_patch(client, pricing_options, method):
+    added = client.post('/api/cart/items?response=delta', json={
+        'cake_size': 'Medium', 'quantity': 2, 'toppings': [pricing_options['Sprinkles'].id],
+    }).get_json()
+    item_id = added['item']['id']
+
+    if method == 'PUT':
+        response = client.put(f'/api/cart/items/{item_id}?response=delta',
+                              json={'cake_size': 'Large', 'quantity': 2})
+        delta = response.get_json()
+        assert (delta['item']['base_price'], delta['total'], delta['version']) == (
+            2500.0, (2500.0 + 150.0) * 2, 2
+        )
+    else:
+        response = client.patch('/api/cart/items', json={'operations': [
+            {'op': 'update', 'id': item_id, 'cake_size': 'Large'},
+        ]})
+        assert response.get_json()['items'][0]['base_price'] == 2500.0
+
+    assert response.status_code == 200
+    item = CartItem.query.get(item_id)
+    assert (item.cake_size, item.base_price, item.customization_price) == ('Large', 2500.0, 150.0)
+    assert Cart.query.get(item.cart_id).total_amount == (2500.0 + 150.0) * 2
+    assert find_cart_total_drift() == []
+
+
+def test_bulk_cart_update_rejects_non_editable_fields(client, pricing_options):
+    item = client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1}).get_json()
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'update', 'id': item['items'][0]['id'], 'flavor': 'Lemon', 'is_vegan': True},
+    ]})
+
+    assert response.status_code == 400
+    assert response.get_json()['validation_errors'] == {'operations': {'0': {
+        'flavor': ['Unknown field.'], 'is_vegan': ['Unknown field.'],
+    }}}
+    assert client.get('/api/cart').get_json()['items'] == item['items']
+
+
+def test_delta_responses_carry_item_totals_and_version(client, sample_cake, pricing_options):
+    response = client.post('/api/cart/items?response=delta', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+    })
+    assert response.status_code == 201
+    added = response.get_json()
+    assert (added['total'], added['item_count'], added['version']) == (25.0, 1, 1)
+    assert added['item']['cake']['name'] == sample_cake.name
+    assert 'items' not in added
+
+    response = client.put(f"/api/cart/items/{added['item']['id']}?response=delta", json={
+        'cake_size': 'Medium', 'quantity': 4,
+    })
+    updated = response.get_json()
+    assert (updated['item']['quantity'], updated['total'], updated['version']) == (4, 100.0, 2)
+
+    response = client.delete(f"/api/cart/items/{added['item']['id']}?response=delta")
+    assert response.get_json() == {
+        'removed_id': added['item']['id'], 'total': 0.0, 'item_count': 0, 'version': 3,
+    }
+    assert client.get('/api/cart').get_json()['version'] == 3
+
+    response = client.delete('/api/cart/items/1?response=patch')
+    assert response.status_code == 400
+
+
+def test_delta_response_cost_is_independent_of_cart_size(client, sample_cake, pricing_options,
+                                                         db_session, sql_statements):
+    item_id = client.post('/api/cart/items', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+    }).get_json()['items'][0]['id']
+    cart = Cart.query.one()
+
+    def update(quantity):
+        sql_statements.clear()
+        response = client.put(f'/api/cart/items/{item_id}?response=delta', json={
+            'cake_size': 'Medium', 'quantity': quantity,
+        })
+        assert response.status_code == 200
+        return len(response.data), len(sql_statements)
+
+    small = update(2)
+    for i in range(20):
+        item = CartItem(cart_id=cart.id, cake_id=sample_cake.id, cake_size='Large',
+                        quantity=1, base_price=25.0, customization_price=0.0)
+        item.reference_images.append(CartItemImage(image_url=f'https://example.com/ref{i}.jpg'))
+        db_session.session.add(item)
+    db_session.session.commit()
+    recompute_cart_totals([cart.id])
+
+    large = update(3)
+    assert large[1] == small[1]
+    assert large[0] - small[0] < 16  # Only the digits of the totals grow
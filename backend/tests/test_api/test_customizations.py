@@ -0,0 +1,166 @@
+# backend/tests/test_api/test_customizations.py
+import pytest
+from flask import json
+from models.customization import CustomizationOption
+
+
+@pytest.fixture
+def sample_options(db_session):
+    """Create a few active customization options."""
+    options = [
+        CustomizationOption(category='size', name='Small', price=1000.0),
+        CustomizationOption(category='size', name='Large', price=2500.0),
+        CustomizationOption(category='topping', name='Sprinkles', price=150.0),
+        CustomizationOption(category='topping', name='Old Topping', price=99.0, active=False),
+    ]
+    db_session.session.add_all(options)
+    db_session.session.commit()
+    return options
+
+
+def test_get_customizations_grouped(client, sample_options):
+    """Test that active options are grouped by category."""
+    response = client.get('/api/customizations')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    grouped = {group['category']: group['options'] for group in data}
+    assert [o['name'] for o in grouped['size']] == ['Small', 'Large']
+    assert [o['name'] for o in grouped['topping']] == ['Sprinkles']
+
+
+def test_customizations_conditional_get(client, sample_options, db_session):
+    """Test ETag revalidation and invalidation when an option changes."""
+    response = client.get('/api/customizations')
+    etag = response.headers.get('ETag')
+    assert etag
+    
+    cached = client.get('/api/customizations', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+    assert cached.data == b''
+    
+    db_session.session.add(CustomizationOption(category='topping', name='Berries', price=300.0))
+    db_session.session.commit()
+    
+    changed = client.get('/api/customizations', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers.get('ETag') != etag
+
+
+def test_customization_options_conditional_get(client, sample_options):
+    """Test that the ETag also varies with the query string."""
+    response = client.get('/api/customization/options')
+    etag = response.headers.get('ETag')
+    assert etag
+    
+    assert client.get(
+        '/api/customization/options', headers={'If-None-Match': etag}
+    ).status_code == 304
+    assert client.get(
+        '/api/customization/options?category=size', headers={'If-None-Match': etag}
+    ).status_code == 200
+
+
+def test_customizations_per_category(client, sample_options):
+    """Test the per-category payloads of both grouped endpoints."""
+    response = client.get('/api/customizations?category=topping')
+    assert response.status_code == 200
+    assert [g['category'] for g in response.get_json()] == ['topping']
+    
+    response = client.get('/api/customization/options?category=size')
+    data = response.get_json()
+    assert list(data) == ['size']
+    assert [o['name'] for o in data['size']] == ['Small', 'Large']
+    
+    assert client.get('/api/customizations?category=unknown').get_json() == []
+    assert client.get('/api/customization/options?category=unknown').get_json() == {}
+
+
+def test_grouped_payloads_served_without_queries(client, sample_options, sql_statements):
+    """Test that warm grouped payloads only run the fingerprint query."""
+    client.get('/api/customizations')
+    client.get('/api/customization/options')
+    sql_statements.clear()
+    
+    assert client.get('/api/customizations').status_code == 200
+    assert client.get('/api/customization/options?category=size').status_code == 200
+    option_queries = [s for s in sql_statements if 'customization_option' in s]
+    assert len(option_queries) == 2
+    assert all('max(customization_option.id)' in s for s in option_queries)
+
+
+def test_grouped_payloads_follow_direct_writes(client, sample_options, db_session):
+    """Test that rows written outside the admin endpoints are served."""
+    client.get('/api/customization/options')
+    
+    db_session.session.add(CustomizationOption(category='topping', name='Berries', price=300.0))
+    db_session.session.commit()
+    
+    data = client.get('/api/customization/options?category=topping').get_json()
+    assert [o['name'] for o in data['topping']] == ['Sprinkles', 'Berries']
+
+
+def test_grouped_payloads_rebuilt_on_option_change(client, sample_options):
+    """Test that updates and deletes rebuild the cached payloads."""
+    small = sample_options[0]
+    client.get('/api/customization/options')
+    
+    client.put(f'/api/admin/customizations/{small.id}', json={'price': 1200.0})
+    data = client.get('/api/customization/options?category=size').get_json()
+    assert data['size'][0]['price'] == 1200.0
+    
+    client.delete(f'/api/admin/customizations/{small.id}')
+    data = client.get('/api/customizations?category=size').get_json()
+    assert [o['name'] for o in data[0]['options']] == ['Large']
+
+
+@pytest.fixture
+def dietary_options(db_session):
+    """Toppings with different dietary compatibility."""
+    options = [
+        CustomizationOption(category='topping', name='Fruit', price=200.0),
+        CustomizationOption(category='topping', name='Cookie Crumble', price=180.0,
+                            is_vegan_compatible=True, is_gluten_free_compatible=False),
+        CustomizationOption(category='topping', name='Honeycomb', price=250.0,
+                            is_vegan_compatible=False, is_gluten_free_compatible=True),
+        CustomizationOption(category='flavor', name='Butter Vanilla', price=0.0,
+                            is_vegan_compatible=False),
+    ]
+    db_session.session.add_all(options)
+    db_session.session.commit()
+    return options
+
+
+def _names(data):
+    return {group['category']: [o['name'] for o in group['options']] for group in data}
+
+
+def test_customizations_filtered_by_diet(client, dietary_options):
+    assert _names(client.get('/api/customizations?diet=vegan').get_json()) == {
+        'topping': ['Cookie Crumble', 'Fruit'],
+    }
+    assert _names(client.get('/api/customizations?diet=gluten_free').get_json()) == {
+        'topping': ['Fruit', 'Honeycomb'], 'flavor': ['Butter Vanilla'],
+    }
+    assert _names(client.get('/api/customizations?diet=vegan,gluten_free').get_json()) == {
+        'topping': ['Fruit'],
+    }
+    assert _names(client.get('/api/customizations?diet=vegan&category=flavor').get_json()) == {}
+
+
+def test_diet_filter_without_queries(client, dietary_options, sql_statements):
+    """Test that diet variants are built from the cached options, not the database."""
+    client.get('/api/customizations')
+    sql_statements.clear()
+    
+    assert client.get('/api/customizations?diet=vegan').status_code == 200
+    assert client.get('/api/customizations?diet=gluten_free&category=topping').status_code == 200
+    option_queries = [s for s in sql_statements if 'customization_option' in s]
+    assert all('max(customization_option.id)' in s for s in option_queries)
+
+
+def test_diet_filter_rejects_unknown_diet(client, db_session):
+    response = client.get('/api/customizations?diet=vegan,keto')
+    
+    assert response.status_code == 400
+    assert 'keto' in response.get_json()['error']['message']
@@ -0,0 +1,137 @@
+# backend/tests/test_api/test_orders.py
+from datetime import datetime, timedelta
+import pytest
+from extensions import db
+from models.cake import Cake
+from models.order import Order
+
+
+def order_payload(cart_items, **overrides):
+    payload = {
+        'customer_name': 'Jane Doe',
+        'customer_email': 'jane@example.com',
+        'customer_phone': '0712345678',
+        'delivery_address': '1 Cake Street, Nairobi',
+        'delivery_date': (datetime.now() + timedelta(days=3)).isoformat(),
+        'delivery_time': 'Morning',
+        'payment_method': 'M-Pesa',
+        'cart_items': cart_items,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_create_order_recomputes_prices(client, sample_cake, pricing_options):
+    """Client-sent prices are ignored; every line is priced from the catalog."""
+    response = client.post('/api/orders', json=order_payload(
+        [
+            {'cake_id': sample_cake.id, 'quantity': 2, 'base_price': 1, 'subtotal': 2,
+             'customizations': 'Candles', 'item_subtotal': 2},
+            {'cake_size': 'Large', 'quantity': 1, 'is_vegan': True,
+             'toppings': [pricing_options['Sprinkles'].id], 'unit_price': 5},
+        ],
+        subtotal=3, tax=0, total_price=3, delivery_fee=500.0,
+    ))
+
+    assert response.status_code == 201
+    order = response.get_json()
+    catalog, custom = order['items']
+
+    assert catalog['base_price'] == sample_cake.price
+    assert catalog['subtotal'] == sample_cake.price * 2
+    assert catalog['notes'] == 'Candles'
+    assert custom['base_price'] == 2500.0
+    assert custom['customization_price'] == 150.0 + 250.0
+    assert custom['unit_price'] == 2900.0
+
+    subtotal = sample_cake.price * 2 + 2900.0
+    assert order['subtotal'] == subtotal
+    assert order['tax'] == pytest.approx(subtotal * 0.16)
+    assert order['total_price'] == pytest.approx(subtotal * 1.16 + 500.0)
+
+
+def test_create_order_queries_do_not_grow_with_items(client, pricing_options, sql_statements):
+    """Cakes and options are loaded with one IN query each for the whole order."""
+    cakes = [Cake(name=f'Corporate {i}', description='Boardroom sheet cake', price=100.0 + i)
+             for i in range(20)]
+    db.session.add_all(cakes)
+    db.session.commit()
+    berries = pricing_options['Berries'].id
+
+    def place_order(order_cakes):
+        items = [
+            {'cake_id': cake.id, 'quantity': 3, 'is_gluten_free': True, 'toppings': [berries]}
+            for cake in order_cakes
+        ]
+        sql_statements.clear()
+        response = client.post('/api/orders', json=order_payload(items))
+        assert response.status_code == 201
+        return response.get_json(), [s for s in sql_statements if s.lstrip().startswith('SELECT')]
+
+    _, single_selects = place_order(cakes[:1])
+    order, corporate_selects = place_order(cakes)
+
+    assert order['subtotal'] == sum((c.price + 300.0 + 200.0) * 3 for c in cakes)
+    assert len(corporate_selects) == len(single_selects)
+    option_selects = [s for s in corporate_selects if 'FROM customization_option' in s]
+    assert len(option_selects) == 1
+
+
+def test_create_order_unknown_template(client, db_session):
+    response = client.post('/api/orders', json=order_payload(
+        [{'template_id': 4242, 'cake_size': 'Large', 'quantity': 1}]
+    ))
+
+    assert response.status_code == 404
+    assert response.get_json()['missing_template_ids'] == [4242]
+    assert Order.query.count() == 0
+
+
+def test_create_order_rejects_unpriced_items(client, sample_cake, pricing_options):
+    """A custom cake in a size without a price option is rejected, not charged 0."""
+    response = client.post('/api/orders', json=order_payload([
+        {'cake_id': sample_cake.id, 'quantity': 1},
+        {'cake_size': 'XL', 'quantity': 1},
+    ]))
+
+    assert response.status_code == 400
+    assert response.get_json()['unpriced_items'] == [1]
+    assert Order.query.count() == 0
+
+
+def test_create_order_unknown_cake(client, db_session):
+    response = client.post('/api/orders', json=order_payload([{'cake_id': 4242}]))
+
+    assert response.status_code == 404
+    assert response.get_json()['missing_cake_ids'] == [4242]
+    assert Order.query.count() == 0
+
+
+def test_create_order_invalid_item(client, db_session):
+    response = client.post('/api/orders', json=order_payload([{'cake_size': 'Medium', 'quantity': 0}]))
+
+    assert response.status_code == 400
+    assert 'cart_items' in response.get_json()['validation_errors']
+
+
+@pytest.mark.parametrize('fee', [-10000, 0, 1, 'free'])
+def test_create_order_rejects_client_delivery_fee(client, sample_cake, fee):
+    """Only the configured delivery fee is accepted."""
+    response = client.post('/api/orders', json=order_payload(
+        [{'cake_id': sample_cake.id, 'quantity': 1}], delivery_fee=fee
+    ))
+
+    assert response.status_code == 400
+    assert response.get_json()['delivery_fee'] == 500.0
+    assert Order.query.count() == 0
+
+
+def test_create_order_charges_configured_delivery_fee(client, app, sample_cake, monkeypatch):
+    monkeypatch.setitem(app.config, 'DELIVERY_FEE', 750.0)
+
+    response = client.post('/api/orders', json=order_payload([{'cake_id': sample_cake.id, 'quantity': 1}]))
+
+    assert response.status_code == 201
+    order = response.get_json()
+    assert order['delivery_fee'] == 750.0
+    assert order['total_price'] == pytest.approx(sample_cake.price * 1.16 + 750.0)
@@ -0,0 +1,167 @@
+# backend/tests/test_api/test_portfolio.py
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models.cart import CartItem
+from models.customization import CakeTemplate, CakeTemplateImage
+
+
+@pytest.fixture
+def template(db_session):
+    """A vegan-capable portfolio design."""
+    template = CakeTemplate(
+        name='Floral Wedding Tier', description='Three tiers with sugar flowers',
+        category='Wedding', default_shape='Round', default_size='Large', default_layers=3,
+        default_flavor='Vanilla', default_frosting='Buttercream', base_price=8000.0,
+        can_be_vegan=True, orders_count=4
+    )
+    db_session.session.add(template)
+    db_session.session.commit()
+    return template
+
+
+def test_add_template_to_cart(client, template, pricing_options):
+    response = client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart',
+                           json={'quantity': 2, 'is_vegan': True})
+
+    assert response.status_code == 201
+    item = response.get_json()['items'][0]
+    assert item['cake_shape'] == 'Round'
+    assert item['cake_size'] == 'Large'
+    assert item['flavor'] == 'Vanilla'
+    assert item['base_price'] == 8000.0
+    assert item['customization_price'] == 250.0  # Vegan surcharge
+    assert response.get_json()['total'] == (8000.0 + 250.0) * 2
+
+    db.session.expire_all()
+    assert CakeTemplate.query.get(template.id).orders_count == 5
+
+
+def test_template_order_charges_cart_price(client, template, pricing_options):
+    """A design ordered from the cart is charged what the cart showed."""
+    client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart',
+                json={'quantity': 2, 'is_vegan': True})
+    cart = client.get('/api/cart').get_json()
+    assert cart['items'][0]['template_id'] == template.id
+
+    response = client.post('/api/orders', json={
+        'customer_name': 'Jane Doe',
+        'customer_email': 'jane@example.com',
+        'customer_phone': '0712345678',
+        'delivery_address': '1 Cake Street, Nairobi',
+        'delivery_date': (datetime.now() + timedelta(days=3)).isoformat(),
+        'payment_method': 'M-Pesa',
+        'cart_items': [
+            {field: item[field] for field in ('template_id', 'cake_size', 'quantity', 'is_vegan')}
+            for item in cart['items']
+        ],
+    })
+
+    assert response.status_code == 201
+    order = response.get_json()
+    assert order['subtotal'] == cart['total'] == (8000.0 + 250.0) * 2
+    assert order['items'][0]['base_price'] == 8000.0
+
+
+def test_add_template_to_cart_single_transaction(client, template, pricing_options, sql_statements):
+    """Insert, cart totals and counter update share one commit; warm option prices cost no query."""
+    client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart', json={})
+    sql_statements.clear()
+
+    response = client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart', json={})
+
+    assert response.status_code == 201
+    writes = [s.split()[0] for s in sql_statements if not s.lstrip().startswith('SELECT')]
+    assert writes == ['INSERT', 'UPDATE', 'UPDATE']
+    assert not [s for s in sql_statements if 'FROM customization_option' in s]
+
+
+def test_add_template_to_cart_rejects_unsupported_diet(client, template, pricing_options):
+    response = client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart',
+                           json={'is_gluten_free': True})
+
+    assert response.status_code == 400
+    assert CartItem.query.count() == 0
+    assert CakeTemplate.query.get(template.id).orders_count == 4
+
+
+def test_add_unavailable_template_to_cart(client, template):
+    template.is_available = False
+    db.session.commit()
+
+    response = client.post(f'/api/portfolio/cakes/{template.id}/add-to-cart', json={})
+
+    assert response.status_code == 404
+
+
+def test_portfolio_cursor_pagination(client, db_session):
+    """Keyset pages walk the listing order, including the boolean is_featured key."""
+    for i in range(5):
+        db_session.session.add(CakeTemplate(
+            name=f'Design {i}', description='Seasonal design', category='Birthday',
+            base_price=2000.0, is_featured=i % 2 == 0, sort_order=i % 3,
+            created_at=datetime(2026, 1, 1, 9, i)
+        ))
+    db_session.session.commit()
+    expected = [cake['id'] for cake in client.get('/api/portfolio?per_page=10').get_json()['cakes']]
+    
+    seen = []
+    cursor = ''
+    while cursor is not None:
+        response = client.get(f'/api/portfolio?cursor={cursor}&per_page=2')
+        assert response.status_code == 200
+        data = response.get_json()
+        seen += [cake['id'] for cake in data['cakes']]
+        cursor = data['pagination']['next_cursor']
+    
+    assert seen == expected
+
+
+def test_portfolio_cursor_pagination_null_sort_order(client, db_session):
+    """A template saved without a sort_order still shows up on cursor pages."""
+    for i in range(3):
+        db_session.session.add(CakeTemplate(
+            name=f'Design {i}', description='Seasonal design', category='Birthday',
+            base_price=2000.0, sort_order=None if i == 1 else i,
+            created_at=datetime(2026, 1, 1, 9, i)
+        ))
+    db_session.session.commit()
+    expected = [cake['id'] for cake in client.get('/api/portfolio?per_page=10').get_json()['cakes']]
+    
+    seen = []
+    cursor = ''
+    while cursor is not None:
+        data = client.get(f'/api/portfolio?cursor={cursor}&per_page=1').get_json()
+        seen += [cake['id'] for cake in data['cakes']]
+        cursor = data['pagination']['next_cursor']
+    
+    assert len(expected) == 3
+    assert seen == expected
+    
+    # Rows written outside the ORM cannot leave a NULL key behind either
+    with pytest.raises(IntegrityError):
+        db_session.session.execute(text('UPDATE cake_template SET sort_order = NULL'))
+    db_session.session.rollback()
+
+
+def test_portfolio_etag_ignores_view_counts(client, template):
+    etag = client.get('/api/portfolio').headers['ETag']
+    
+    response = client.get(f'/api/portfolio/cakes/{template.id}')
+    assert response.get_json()['views_count'] == 1
+    
+    assert client.get('/api/portfolio', headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_portfolio_etag_follows_image_edits(client, template):
+    image = CakeTemplateImage(template_id=template.id, image_url='https://img/1.jpg', caption='Top tier')
+    db.session.add(image)
+    db.session.commit()
+    etag = client.get('/api/portfolio').headers['ETag']
+    
+    image.caption = 'Sugar flowers'
+    db.session.commit()
+    
+    assert client.get('/api/portfolio', headers={'If-None-Match': etag}).status_code == 200
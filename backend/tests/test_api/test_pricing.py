@@ -0,0 +1,75 @@
+# backend/tests/test_api/test_pricing.py
+import pytest
+from models.cart import CartItem
+
+
+def test_quote_prices_each_configuration(client, sample_cake, pricing_options):
+    response = client.post('/api/pricing/quote', json={'items': [
+        {'cake_size': 'Large', 'quantity': 2, 'is_vegan': True,
+         'toppings': [pricing_options['Sprinkles'].id, pricing_options['Berries'].id]},
+        {'cake_id': sample_cake.id},
+        {'cake_size': 'Medium', 'is_gluten_free': True},
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    large, catalog, medium = data['items']
+
+    assert [line['index'] for line in data['items']] == [0, 1, 2]
+    assert large['base_price'] == 2500.0
+    assert large['customization_price'] == 150.0 + 300.0 + 250.0
+    assert large['unit_price'] == 3200.0
+    assert large['subtotal'] == 6400.0
+    assert catalog['base_price'] == sample_cake.price
+    assert catalog['quantity'] == 1
+    assert medium['unit_price'] == 1700.0
+    assert data['item_count'] == 4
+    assert data['total'] == 6400.0 + sample_cake.price + 1700.0
+
+
+def test_quote_matches_cart_pricing(client, pricing_options):
+    config = {'cake_size': 'Large', 'quantity': 3, 'is_gluten_free': True,
+              'toppings': [pricing_options['Berries'].id]}
+
+    quoted = client.post('/api/pricing/quote', json={'items': [config]}).get_json()
+    cart = client.post('/api/cart/items', json=config).get_json()
+
+    assert quoted['total'] == cart['total']
+
+
+def test_quote_does_not_write(client, sample_cake, pricing_options, sql_statements):
+    cake_id = sample_cake.id
+    sql_statements.clear()
+    response = client.post('/api/pricing/quote', json={'items': [
+        {'cake_id': cake_id}, {'cake_size': 'Medium', 'quantity': 5},
+    ]})
+    statements = list(sql_statements)
+
+    assert response.status_code == 200
+    assert not [s for s in statements if not s.lstrip().upper().startswith('SELECT')]
+    # One query for the pricing table, one IN query for the cakes
+    assert len(statements) == 2
+    assert CartItem.query.count() == 0
+
+
+def test_quote_unknown_cake(client, sample_cake):
+    response = client.post('/api/pricing/quote', json={'items': [
+        {'cake_id': sample_cake.id}, {'cake_id': 9999},
+    ]})
+
+    assert response.status_code == 404
+    assert response.get_json()['missing_cake_ids'] == [9999]
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'items': []},
+    {'items': [{'quantity': 1}]},
+    {'items': [{'cake_size': 'Huge'}]},
+    {'items': [{'cake_size': 'Small', 'quantity': 0}]},
+    {'items': [{'cake_size': 'Small'}] * 101},
+])
+def test_quote_validation(client, db_session, payload):
+    response = client.post('/api/pricing/quote', json=payload)
+
+    assert response.status_code == 400
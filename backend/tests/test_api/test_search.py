@@ -0,0 +1,167 @@
+# backend/tests/test_api/test_search.py
+import pytest
+from flask import json
+from models.cake import Cake
+from models.customization import CakeTemplate
+
+
+@pytest.fixture
+def searchable_catalog(db_session):
+    """Create cakes and portfolio templates with distinct wording."""
+    db_session.session.add_all([
+        Cake(name='Chocolate Fudge Cake', description='Rich dark chocolate layers', price=30.0),
+        Cake(name='Lemon Drizzle', description='Zesty sponge with a hint of chocolate', price=20.0),
+        Cake(name='Carrot Cake', description='Spiced carrot sponge', price=22.0),
+        CakeTemplate(name='Chocolate Wedding Tower', description='Three tiers of celebration',
+                     category='Wedding', base_price=9000.0),
+        CakeTemplate(name='Hidden Chocolate Design', description='Not on display',
+                     category='Birthday', base_price=4000.0, is_available=False),
+    ])
+    db_session.session.commit()
+
+
+def test_search_ranks_name_matches_first(client, searchable_catalog):
+    """Test that matches in names outrank matches in descriptions."""
+    response = client.get('/api/search?q=chocolate')
+    
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    names = [r['item']['name'] for r in data['results']]
+    assert set(names) == {'Chocolate Fudge Cake', 'Lemon Drizzle', 'Chocolate Wedding Tower'}
+    assert names[-1] == 'Lemon Drizzle'
+    assert {r['type'] for r in data['results']} == {'cake', 'template'}
+
+
+def test_search_category_and_prefix(client, searchable_catalog):
+    """Test template categories are indexed and partial words match."""
+    data = json.loads(client.get('/api/search?q=weddings').data)
+    assert [r['item']['name'] for r in data['results']] == ['Chocolate Wedding Tower']
+    
+    data = json.loads(client.get('/api/search?q=choc').data)
+    assert len(data['results']) == 3
+
+
+def test_search_tracks_updates(client, searchable_catalog, db_session):
+    """Test that the index follows inserts, updates and deletes."""
+    cake = Cake.query.filter_by(name='Carrot Cake').first()
+    cake.name = 'Red Velvet'
+    db_session.session.commit()
+    
+    assert json.loads(client.get('/api/search?q=carrot').data)['results'][0]['item']['name'] == 'Red Velvet'
+    assert len(json.loads(client.get('/api/search?q=velvet').data)['results']) == 1
+    
+    db_session.session.delete(cake)
+    db_session.session.commit()
+    assert json.loads(client.get('/api/search?q=velvet').data)['results'] == []
+
+
+def test_search_pagination(client, searchable_catalog):
+    """Test paging through ranked results."""
+    first = json.loads(client.get('/api/search?q=chocolate&per_page=2').data)
+    second = json.loads(client.get('/api/search?q=chocolate&per_page=2&page=2').data)
+    
+    assert len(first['results']) == 2
+    assert first['pagination']['has_next'] is True
+    assert len(second['results']) == 1
+    assert second['pagination']['has_next'] is False
+
+
+def test_search_requires_query(client, db_session):
+    """Test that an empty query is a validation error, and operators are inert."""
+    assert client.get('/api/search').status_code == 400
+    response = client.get('/api/search?q=name:"*')
+    assert response.status_code == 200
+    assert json.loads(response.data)['results'] == []
+
+
+def test_suggest_prefixes(client, searchable_catalog, db_session):
+    """Test typeahead over cake, template, category and flavor names."""
+    from models.customization import CustomizationOption
+    db_session.session.add(CustomizationOption(category='flavor', name='Chocolate Mint', price=0.0))
+    db_session.session.commit()
+    
+    data = json.loads(client.get('/api/search/suggest?prefix=Choc').data)
+    texts = [s['text'] for s in data['suggestions']]
+    assert texts == ['Chocolate Fudge Cake', 'Chocolate Mint', 'Chocolate Wedding Tower']
+    
+    # Word starts inside a name also match, after whole-name matches
+    data = json.loads(client.get('/api/search/suggest?prefix=fud').data)
+    assert [s['text'] for s in data['suggestions']] == ['Chocolate Fudge Cake']
+    
+    data = json.loads(client.get('/api/search/suggest?prefix=wed').data)
+    assert [(s['type'], s['text']) for s in data['suggestions']] == [
+        ('category', 'Wedding'), ('template', 'Chocolate Wedding Tower')
+    ]
+
+
+def test_suggest_follows_cake_writes(client, admin_csrf_headers, searchable_catalog):
+    """Test that cake controller writes update the index incrementally."""
+    client.get('/api/search/suggest?prefix=x')  # build the index
+    
+    response = client.post('/api/cakes', json={
+        'name': 'Black Forest',
+        'description': 'Cherries, cream and chocolate',
+        'price': 28.0
+    })
+    assert response.status_code == 201
+    new_id = json.loads(response.data)['id']
+    
+    data = json.loads(client.get('/api/search/suggest?prefix=black').data)
+    assert [s['id'] for s in data['suggestions']] == [new_id]
+    
+    client.delete(f'/api/cakes/{new_id}')
+    data = json.loads(client.get('/api/search/suggest?prefix=black').data)
+    assert data['suggestions'] == []
+
+
+def test_suggest_picks_up_writes_from_other_processes(client, searchable_catalog, db_session,
+                                                      monkeypatch):
+    """Test that table changes made without the index hooks show up after the TTL."""
+    import time
+    client.get('/api/search/suggest?prefix=x')  # build the index
+    
+    db_session.session.add(Cake(name='Black Forest', description='Cherries', price=28.0))
+    db_session.session.commit()
+    data = json.loads(client.get('/api/search/suggest?prefix=black').data)
+    assert data['suggestions'] == []  # still within the TTL
+    
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    data = json.loads(client.get('/api/search/suggest?prefix=black').data)
+    assert [s['text'] for s in data['suggestions']] == ['Black Forest']
+    
+    Cake.query.filter_by(name='Black Forest').delete()
+    db_session.session.commit()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 122)
+    data = json.loads(client.get('/api/search/suggest?prefix=black').data)
+    assert data['suggestions'] == []
+
+
+def test_suggest_is_safe_during_concurrent_writes():
+    """Lookups racing upserts/removes on the shared key list never fail."""
+    import threading
+    from services.typeahead_service import SuggestionIndex
+    
+    index = SuggestionIndex()
+    index._loaded = True  # Maintained incrementally only, no database
+    for i in range(50):
+        index.upsert('cake', i, f'Cake number {i}')
+    
+    stop = threading.Event()
+    
+    def churn():
+        while not stop.is_set():
+            for i in range(50):
+                index.remove('cake', i)
+            for i in range(50):
+                index.upsert('cake', i, f'Cake number {i}')
+    
+    writer = threading.Thread(target=churn)
+    writer.start()
+    try:
+        for _ in range(2000):
+            for suggestion in index.suggest('cake'):
+                assert suggestion['text'].startswith('Cake')
+    finally:
+        stop.set()
+        writer.join()
@@ -0,0 +1,268 @@
+# backend/tests/test_cart_store.py
+import re
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models.cart import Cart, CartItem
+from services.cart_service import find_cart_total_drift
+from services.cart_store import (
+    KeyValueCartStore, MemoryKeyValue, SqlCartStore, make_guest_cart_store
+)
+from utils.exceptions import ConflictError
+
+CART_WRITE = re.compile(r'\s*(INSERT INTO|UPDATE|DELETE FROM) cart', re.I)
+
+
+def _client(kind):
+    if kind == 'memory':
+        return MemoryKeyValue()
+    fakeredis = pytest.importorskip('fakeredis')
+    return fakeredis.FakeRedis()
+
+
+@pytest.fixture(params=['memory', 'fakeredis'])
+def kv_store(request, app, db_session):
+    """Guest carts in a key-value store for the duration of the test."""
+    stores = app.extensions['cart_stores']
+    previous = stores['guest']
+    stores['guest'] = KeyValueCartStore(_client(request.param), ttl=3600)
+    yield stores['guest']
+    stores['guest'] = previous
+
+
+def _guest_session_id(client):
+    with client.session_transaction() as session:
+        return session['cart_session_id']
+
+
+def test_guest_carts_default_to_sql(app):
+    assert isinstance(app.extensions['cart_stores']['guest'], SqlCartStore)
+    assert isinstance(app.extensions['cart_stores']['user'], SqlCartStore)
+
+
+def test_unknown_cart_store_is_rejected(app):
+    app.config['CART_STORE'] = 'mongo'
+    try:
+        with pytest.raises(ValueError):
+            make_guest_cart_store(app)
+    finally:
+        app.config['CART_STORE'] = 'sql'
+
+
+def test_guest_browsing_never_writes_cart_rows(client, kv_store, sample_cake, pricing_options,
+                                               sql_statements):
+    response = client.post('/api/cart/items', json={
+        'cake_size': 'Large', 'quantity': 2, 'toppings': [pricing_options['Sprinkles'].id],
+    })
+    assert response.status_code == 201
+    custom_id = response.get_json()['items'][0]['id']
+    response = client.post('/api/cart/items', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+    })
+    catalog = response.get_json()['items'][1]
+    assert catalog['cake']['name'] == sample_cake.name
+
+    response = client.put(f'/api/cart/items/{custom_id}', json={'cake_size': 'Large', 'quantity': 3})
+    assert (response.get_json()['total'], response.get_json()['item_count']) == (
+        (2500.0 + 150.0) * 3 + 25.0, 4
+    )
+    assert client.get('/api/cart/count').get_json() == {'item_count': 4}
+    assert client.delete(f"/api/cart/items/{catalog['id']}").status_code == 200
+    assert client.delete(f"/api/cart/items/{catalog['id']}").status_code == 404
+
+    data = client.get('/api/cart').get_json()
+    assert (len(data['items']), data['item_count']) == (1, 3)
+
+    response = client.patch('/api/cart/items', json={'operations': [
+        {'op': 'add', 'cake_size': 'Medium', 'quantity': 1},
+        {'op': 'update', 'id': custom_id, 'quantity': 1},
+    ]})
+    assert (response.get_json()['total'], response.get_json()['item_count']) == (
+        2650.0 + 1500.0, 2
+    )
+
+    assert client.post('/api/cart/clear').status_code == 200
+    assert client.get('/api/cart').get_json()['items'] == []
+
+    assert not [s for s in sql_statements if CART_WRITE.match(s)]
+    assert Cart.query.count() == 0
+
+
+def test_guest_delta_responses(client, kv_store, sample_cake, pricing_options):
+    response = client.post('/api/cart/items?response=delta', json={
+        'cake_size': 'Large', 'quantity': 2, 'toppings': [pricing_options['Sprinkles'].id],
+    })
+    added = response.get_json()
+    assert response.status_code == 201
+    assert (added['total'], added['item_count'], added['version']) == ((2500.0 + 150.0) * 2, 2, 1)
+    assert 'items' not in added
+    response = client.post('/api/cart/items?response=delta', json={
+        'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1,
+    })
+    catalog = response.get_json()['item']
+    assert catalog['cake']['name'] == sample_cake.name
+
+    response = client.put(f"/api/cart/items/{added['item']['id']}?response=delta",
+                          json={'cake_size': 'Large', 'quantity': 3})
+    delta = response.get_json()
+    assert (delta['item']['quantity'], delta['total'], delta['item_count'], delta['version']) == (
+        3, (2500.0 + 150.0) * 3 + 25.0, 4, 3
+    )
+
+    response = client.delete(f"/api/cart/items/{catalog['id']}?response=delta")
+    assert response.get_json() == {
+        'removed_id': catalog['id'], 'total': (2500.0 + 150.0) * 3, 'item_count': 3, 'version': 4,
+    }
+
+
+def test_guest_size_change_is_repriced(client, kv_store, pricing_options):
+    added = client.post('/api/cart/items?response=delta',
+                        json={'cake_size': 'Large', 'quantity': 1}).get_json()
+
+    response = client.put(f"/api/cart/items/{added['item']['id']}?response=delta",
+                          json={'cake_size': 'Medium', 'quantity': 2})
+
+    delta = response.get_json()
+    assert (delta['item']['base_price'], delta['total'], delta['item_count']) == (1500.0, 3000.0, 2)
+    assert client.get('/api/cart').get_json()['total'] == 3000.0
+
+
+@pytest.mark.parametrize('kind', ['sql', 'memory'])
+def test_guest_checkout_leaves_cart_as_is(client, app, kind, sample_cake, pricing_options,
+                                          monkeypatch):
+    if kind == 'memory':
+        monkeypatch.setitem(app.extensions['cart_stores'], 'guest',
+                            KeyValueCartStore(MemoryKeyValue(), ttl=3600))
+    client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 2})
+    client.post('/api/cart/items', json={'cake_id': sample_cake.id, 'cake_size': 'Medium', 'quantity': 1})
+    before = client.get('/api/cart').get_json()
+
+    response = client.post('/api/orders', json={
+        'customer_name': 'Jane Doe',
+        'customer_email': 'jane@example.com',
+        'customer_phone': '0712345678',
+        'delivery_address': '1 Cake Street, Nairobi',
+        'delivery_date': (datetime.now() + timedelta(days=3)).isoformat(),
+        'payment_method': 'M-Pesa',
+        'cart_items': [{'cake_size': 'Medium', 'quantity': 2},
+                       {'cake_id': sample_cake.id, 'quantity': 1}],
+    })
+
+    assert response.status_code == 201
+    assert client.get('/api/cart').get_json() == before
+    assert (before['total'], before['item_count']) == (1500.0 * 2 + 25.0, 3)
+    assert Cart.query.count() == (1 if kind == 'sql' else 0)
+
+
+def test_login_materializes_guest_cart_into_user_cart(client, kv_store, sample_user, pricing_options):
+    user_cart = Cart(user_id=sample_user.id, total_amount=1500.0, item_count=1)
+    user_cart.items.append(CartItem(cake_size='Medium', quantity=1, base_price=1500.0,
+                                    customization_price=0.0))
+    db.session.add(user_cart)
+    db.session.commit()
+    for quantity in (1, 2):
+        client.post('/api/cart/items', json={'cake_size': 'Large', 'quantity': quantity})
+    session_id = _guest_session_id(client)
+
+    client.post('/api/auth/login', json={'email': 'test@example.com', 'password': 'TestPass123'})
+
+    data = client.get('/api/cart').get_json()
+    assert data['id'] == user_cart.id
+    assert (len(data['items']), data['total'], data['item_count']) == (3, 1500.0 + 2500.0 * 3, 4)
+    assert Cart.query.count() == 1
+    assert find_cart_total_drift() == []
+    assert kv_store.client.get(kv_store.key(session_id)) is None
+
+
+def test_overlapping_guest_writes_conflict(kv_store):
+    def add(cart, quantity):
+        kv_store.add_item(cart, CartItem(cake_size='Medium', quantity=quantity,
+                                         base_price=1500.0, customization_price=0.0))
+
+    first = kv_store.create(None, 'visitor')
+    second = kv_store.create(None, 'visitor')
+    add(first, 1)
+    add(second, 2)
+    kv_store.commit(first)
+    with pytest.raises(ConflictError):
+        kv_store.commit(second)
+
+    first, second = kv_store.find(None, 'visitor'), kv_store.find(None, 'visitor')
+    add(first, 3)
+    kv_store.commit(first)
+    add(second, 4)
+    with pytest.raises(ConflictError):
+        kv_store.commit(second)
+
+    cart = kv_store.find(None, 'visitor')
+    assert ([item.quantity for item in cart.items], cart.item_count, cart.version) == ([1, 3], 4, 2)
+    add(cart, 5)
+    kv_store.commit(cart)
+    add(cart, 6)
+    kv_store.commit(cart)
+    assert kv_store.find(None, 'visitor').item_count == 15
+
+
+def test_conflicting_guest_write_returns_409(client, kv_store, pricing_options, monkeypatch):
+    client.post('/api/cart/items', json={'cake_size': 'Medium', 'quantity': 1})
+    monkeypatch.setattr(kv_store, '_swap', lambda key, expected, value: False)
+
+    response = client.post('/api/cart/items', json={'cake_size': 'Large', 'quantity': 1})
+
+    assert response.status_code == 409
+    assert response.get_json()['error']['type'] == 'ConflictError'
+    monkeypatch.undo()
+    assert client.get('/api/cart/count').get_json() == {'item_count': 1}
+
+
+def test_redis_write_racing_the_watch_conflicts(app, db_session):
+    fakeredis = pytest.importorskip('fakeredis')
+    server = fakeredis.FakeServer()
+    store = KeyValueCartStore(fakeredis.FakeRedis(server=server), ttl=3600)
+    other = fakeredis.FakeRedis(server=server)
+    cart = store.create(None, 'visitor')
+    store.add_item(cart, CartItem(cake_size='Medium', quantity=1, base_price=1500.0,
+                                  customization_price=0.0))
+
+    pipeline = store.client.pipeline
+
+    def racing_pipeline():
+        pipe = pipeline()
+        multi = pipe.multi
+
+        def write_then_multi():
+            other.set(store.key('visitor'), '{"written": "elsewhere"}')
+            multi()
+        pipe.multi = write_then_multi
+        return pipe
+    store.client.pipeline = racing_pipeline
+
+    with pytest.raises(ConflictError):
+        store.commit(cart)
+    assert other.get(store.key('visitor')) == b'{"written": "elsewhere"}'
+
+
+def test_redis_cart_store_from_config(app, monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    import redis
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis.Redis, 'from_url', lambda url: client)
+    monkeypatch.setitem(app.config, 'CART_STORE', 'redis')
+
+    store = make_guest_cart_store(app)
+
+    assert isinstance(store, KeyValueCartStore)
+    assert store.client is client
+
+
+def test_memory_key_value_expires_entries(monkeypatch):
+    client = MemoryKeyValue()
+    client.set('cart', '{}', ex=60)
+    assert client.get('cart') == '{}'
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now + 61)
+    assert client.get('cart') is None
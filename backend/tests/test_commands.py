@@ -0,0 +1,73 @@
+# backend/tests/test_commands.py
+from datetime import datetime, timedelta
+
+from extensions import db
+from models.cart import Cart, CartItem, CartItemImage
+from services.cart_service import apply_cart_delta, find_cart_total_drift
+
+
+def test_carts_check_reports_and_fixes_drift(app, db_session):
+    consistent = Cart(session_id='in-sync', total_amount=3000.0, item_count=2)
+    consistent.items.append(CartItem(cake_size='Medium', quantity=2, base_price=1400.0,
+                                     customization_price=100.0))
+    drifted = Cart(session_id='drifted', total_amount=10.0, item_count=9)
+    drifted.items.append(CartItem(cake_size='Large', quantity=1, base_price=2500.0))
+    emptied = Cart(session_id='emptied', total_amount=500.0, item_count=1)
+    db.session.add_all([consistent, drifted, emptied])
+    db.session.commit()
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=['carts', 'check'])
+
+    assert result.exit_code == 1
+    assert f'cart {drifted.id}: total 10.00 != 2500.00, items 9 != 1' in result.output
+    assert f'cart {emptied.id}:' in result.output
+    assert f'cart {consistent.id}:' not in result.output
+
+    result = runner.invoke(args=['carts', 'check', '--fix'])
+
+    assert result.exit_code == 0
+    assert 'Recomputed totals for 2 cart(s).' in result.output
+    assert find_cart_total_drift() == []
+    db.session.expire_all()
+    assert Cart.query.get(drifted.id).total_amount == 2500.0
+    assert Cart.query.get(emptied.id).item_count == 0
+
+    assert runner.invoke(args=['carts', 'check']).exit_code == 0
+
+
+def test_carts_gc_deletes_abandoned_guest_carts_in_chunks(app, db_session, sample_user):
+    old = datetime.utcnow() - timedelta(days=45)
+    abandoned = []
+    for i in range(3):
+        cart = Cart(session_id=f'abandoned-{i}', updated_at=old)
+        item = CartItem(cake_size='Medium', quantity=1, base_price=1500.0)
+        item.reference_images.append(CartItemImage(image_url=f'https://example.com/{i}.jpg'))
+        cart.items.append(item)
+        abandoned.append(cart)
+    recent = Cart(session_id='recent', updated_at=datetime.utcnow() - timedelta(days=2))
+    user_cart = Cart(user_id=sample_user.id, updated_at=old)
+    revived = Cart(session_id='revived', updated_at=old)
+    db.session.add_all([*abandoned, recent, user_cart, revived])
+    db.session.commit()
+
+    # Any cart write (here a totals delta) counts as activity
+    apply_cart_delta(revived.id, 0.0, 0)
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['carts', 'gc', '--older-than', '30d', '--chunk-size', '2'])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.count('deleted 2 carts') == 1
+    assert 'deleted 1 carts (3 total' in result.output
+    assert 'Deleted 3 abandoned guest cart(s)' in result.output
+    assert sorted(c.session_id or 'user' for c in Cart.query) == ['recent', 'revived', 'user']
+    assert CartItem.query.count() == 0
+    assert CartItemImage.query.count() == 0
+
+
+def test_carts_gc_rejects_bad_duration(app, db_session):
+    result = app.test_cli_runner().invoke(args=['carts', 'gc', '--older-than', 'a month'])
+
+    assert result.exit_code == 2
+    assert 'is not a duration' in result.output
@@ -0,0 +1,84 @@
+# backend/tests/test_compression.py
+import gzip
+import json
+import pytest
+
+import utils.cache
+from extensions import db
+from models.cake import Cake
+from utils.compression import compress_response, brotli
+
+
+@pytest.fixture
+def many_cakes(db_session):
+    """Enough cakes for the catalog to exceed the compression threshold."""
+    cakes = [
+        Cake(name=f'Cake number {i}', description='A repetitive description ' * 4, price=10 + i)
+        for i in range(30)
+    ]
+    db.session.add_all(cakes)
+    db.session.commit()
+    return cakes
+
+
+def test_catalog_is_gzipped_when_accepted(client, many_cakes):
+    plain = client.get('/api/cakes')
+    response = client.get('/api/cakes', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.data) < len(plain.data)
+    assert json.loads(gzip.decompress(response.data)) == plain.get_json()
+
+    # Same representation, so the compressed ETag is the weak form of the raw one
+    assert response.headers['ETag'] == f'W/{plain.headers["ETag"]}'
+    revalidated = client.get('/api/cakes', headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': response.headers['ETag'],
+    })
+    assert revalidated.status_code == 304
+
+
+def test_cached_catalog_is_compressed_once(client, many_cakes, monkeypatch):
+    calls = []
+    original = utils.cache.compress
+    monkeypatch.setattr(utils.cache, 'compress', lambda data, enc: calls.append(enc) or original(data, enc))
+
+    first = client.get('/api/cakes', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/api/cakes', headers={'Accept-Encoding': 'gzip'})
+
+    assert calls == ['gzip']
+    assert first.data == second.data
+
+
+def test_uncompressed_without_accept_encoding(client, many_cakes):
+    response = client.get('/api/cakes', headers={'Accept-Encoding': 'identity'})
+
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.get_json()[0]['name'] == 'Cake number 0'
+
+
+def test_small_responses_are_not_compressed(client, sample_cake):
+    response = client.get(f'/api/cakes/{sample_cake.id}', headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_uncached_responses_are_compressed(app):
+    body = json.dumps({'items': ['x' * 50] * 100})
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip;q=0.5, br;q=0'}):
+        response = compress_response(app.response_class(body, mimetype='application/json'))
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.get_data()).decode() == body
+
+
+@pytest.mark.skipif(brotli is None, reason='brotli not installed')
+def test_brotli_preferred_when_available(client, many_cakes):
+    response = client.get('/api/cakes', headers={'Accept-Encoding': 'gzip, br'})
+
+    assert response.headers['Content-Encoding'] == 'br'
+    assert json.loads(brotli.decompress(response.data))[0]['name'] == 'Cake number 0'
@@ -0,0 +1,102 @@
+# backend/tests/test_json_provider.py
+import json
+import time
+import uuid
+from datetime import datetime, date
+from decimal import Decimal
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from schemas.order_schema import OrderSchema
+from utils.json_provider import (
+    StdlibJSONProvider, OrjsonProvider, make_json_provider, orjson
+)
+
+PROVIDERS = [StdlibJSONProvider] + ([OrjsonProvider] if orjson else [])
+
+
+def make_app(**settings):
+    app = Flask(__name__)
+    app.config.update(settings)
+    return app
+
+
+@pytest.mark.parametrize('provider_class', PROVIDERS)
+def test_provider_output_matches_flask_default(provider_class):
+    """Same compact, key-sorted JSON as Flask's provider; dates as ISO 8601."""
+    app = make_app()
+    provider = provider_class(app)
+    payload = {'b': 1, 'a': [1.5, None, True, 'café'], 'nested': {'z': 0, 'y': {}}}
+
+    assert json.loads(provider.dumps(payload)) == payload
+    assert provider.dumps(payload, separators=(',', ':')).replace('\\u00e9', 'é') == \
+        DefaultJSONProvider(app).dumps(payload, separators=(',', ':'), ensure_ascii=False)
+    assert provider.dumps_bytes(payload) == provider.dumps(payload).encode('utf-8')
+    assert provider.loads(b'{"x": [1, 2]}') == {'x': [1, 2]}
+
+    special = {
+        'when': datetime(2026, 3, 1, 12, 30, 15, 123456),
+        'day': date(2026, 3, 1),
+        'amount': Decimal('12.50'),
+        'ref': uuid.UUID(int=1),
+    }
+    assert json.loads(provider.dumps(special)) == {
+        'when': '2026-03-01T12:30:15.123456',
+        'day': '2026-03-01',
+        'amount': '12.50',
+        'ref': '00000000-0000-0000-0000-000000000001',
+    }
+
+
+@pytest.mark.parametrize('provider_class', PROVIDERS)
+def test_provider_response_and_debug_formatting(provider_class):
+    app = make_app()
+    provider = provider_class(app)
+    with app.app_context():
+        response = provider.response({'b': 2, 'a': 1})
+        assert response.mimetype == 'application/json'
+        assert response.get_data() == b'{"a":1,"b":2}\n'
+
+        app.debug = True
+        assert b'\n  "a": 1' in provider.response({'b': 2, 'a': 1}).get_data()
+
+
+def test_provider_selection():
+    assert isinstance(make_json_provider(make_app(JSON_PROVIDER='stdlib')), StdlibJSONProvider)
+    expected = OrjsonProvider if orjson else StdlibJSONProvider
+    assert isinstance(make_json_provider(make_app()), expected)
+
+    with pytest.raises(ValueError):
+        make_json_provider(make_app(JSON_PROVIDER='simplejson'))
+
+
+def test_app_uses_configured_provider(app, client, sample_cake):
+    assert isinstance(app.json, (StdlibJSONProvider, OrjsonProvider))
+    response = client.get('/api/cakes')
+    assert response.status_code == 200
+    assert response.get_json()[0]['name'] == sample_cake.name
+
+
+@pytest.mark.slow
+def test_provider_benchmark_on_my_orders_payload(app, make_orders):
+    """Benchmark: /api/orders/my-orders output for 1,000 orders, best of 3 runs."""
+    with app.app_context():
+        payload = OrderSchema(many=True).dump(make_orders(1000))
+
+    def best_of(dumps):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            dumps(payload)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    flask_app = make_app()
+    results = {'flask default': best_of(DefaultJSONProvider(flask_app).dumps)}
+    for provider_class in PROVIDERS:
+        results[provider_class.__name__] = best_of(provider_class(flask_app).dumps_bytes)
+    timings = ', '.join(f'{name}: {seconds * 1000:.1f} ms' for name, seconds in results.items())
+
+    if orjson:
+        assert results['OrjsonProvider'] * 2 < results['StdlibJSONProvider'], timings
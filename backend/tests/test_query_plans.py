@@ -0,0 +1,192 @@
+# backend/tests/test_query_plans.py
+"""
+EXPLAIN regression tests: every lookup the controllers issue must be served
+by an index.
+
+Each test drives real endpoints against seeded data, records the statements
+they send, then EXPLAINs every statement with a WHERE clause and fails on a
+sequential scan. Unfiltered reads (whole-catalog loads, COUNT(*) totals) are
+full reads by design and are not checked.
+
+Runs against SQLite (EXPLAIN QUERY PLAN) or, with TEST_DATABASE_URL pointing
+at PostgreSQL, against Postgres with enable_seqscan off so that any seq scan
+left in the plan means no usable index exists.
+"""
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from models.cart import Cart, CartItem
+from models.customization import CakeTemplate
+from models.order import Order, OrderItem, OrderItemImage
+
+
+@pytest.fixture
+def recorded_statements(db_session):
+    """Record (statement, parameters) for every single statement executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(db_session.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db_session.engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture
+def seeded(db_session, sample_user, sample_cake, pricing_options):
+    """A few hundred orders, carts and templates so plans are realistic."""
+    base = datetime(2026, 1, 1, 9, 0, 0)
+    for i in range(200):
+        order = Order(
+            order_number=f'ORD-202601{i % 28 + 1:02d}-{i:03d}',
+            user_id=sample_user.id if i % 4 == 0 else None,
+            customer_name=f'Customer {i}',
+            customer_email=f'customer{i}@example.com',
+            customer_phone='0700000000',
+            delivery_address='1 Bakery Lane, Nairobi',
+            delivery_date=base + timedelta(days=7),
+            subtotal=1000.0,
+            total_price=1660.0,
+            status=('pending', 'confirmed', 'completed', 'cancelled')[i % 4],
+            created_at=base + timedelta(hours=i)
+        )
+        item = OrderItem(
+            cake_id=sample_cake.id, quantity=1, cake_shape='Round', cake_size='Medium',
+            cake_layers='1', flavor='Vanilla', filling='None', frosting='Buttercream',
+            base_price=1000.0, unit_price=1000.0, subtotal=1000.0
+        )
+        item.reference_images.append(OrderItemImage(image_url=f'https://example.com/{i}.jpg'))
+        order.items.append(item)
+        db_session.session.add(order)
+
+        cart = Cart(session_id=f'guest-{i}')
+        cart.items.append(CartItem(cake_size='Medium', quantity=1, base_price=1500.0))
+        db_session.session.add(cart)
+
+        db_session.session.add(CakeTemplate(
+            name=f'Template {i}', description='Seasonal design',
+            category=('Birthday', 'Wedding')[i % 2], base_price=2000.0, is_available=i % 10 != 0, is_featured=i % 7 == 0,
+            sort_order=i % 5
+        ))
+    db_session.session.commit()
+    return db_session
+
+
+def _sqlite_full_scans(conn, statement, parameters):
+    rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+    scans = []
+    for row in rows:
+        detail = row[-1]
+        # "SCAN t USING [COVERING] INDEX ix" walks an index; a bare "SCAN t"
+        # reads the whole table. Automatic indexes are built per query.
+        if (detail.startswith('SCAN ') and 'USING' not in detail
+                and 'CONSTANT ROW' not in detail and '(subquery' not in detail) \
+                or 'AUTOMATIC' in detail:
+            scans.append(detail)
+    return scans
+
+
+def _postgres_full_scans(conn, statement, parameters):
+    conn.exec_driver_sql('SET LOCAL enable_seqscan = off')
+    rows = conn.exec_driver_sql(f'EXPLAIN {statement}', parameters).all()
+    return [row[0].strip() for row in rows if re.search(r'Seq Scan on ', row[0])]
+
+
+def assert_no_full_scans(db_session, statements):
+    """EXPLAIN each recorded lookup and fail listing those that scan a table."""
+    conn = db_session.session.connection()
+    explain = (
+        _postgres_full_scans if conn.dialect.name == 'postgresql' else _sqlite_full_scans
+    )
+
+    lookups = [
+        (statement, parameters) for statement, parameters in statements
+        if re.match(r'\s*(SELECT|UPDATE|DELETE)\b', statement, re.I)
+        and re.search(r'\bWHERE\b', statement, re.I)
+    ]
+    assert lookups, 'no lookups were recorded'
+
+    failures = []
+    for statement, parameters in lookups:
+        scans = explain(conn, statement, parameters)
+        if scans:
+            failures.append(f'{" ".join(statement.split())}\n    -> {"; ".join(scans)}')
+    db_session.session.rollback()
+
+    assert not failures, 'Sequential scans:\n' + '\n'.join(failures)
+
+
+def test_order_lookups_use_indexes(client, seeded, auth_headers, sample_cake, pricing_options,
+                                   recorded_statements):
+    response = client.post('/api/orders', json={
+        'customer_name': 'Jane Doe',
+        'customer_email': 'jane@example.com',
+        'customer_phone': '0712345678',
+        'delivery_address': '1 Cake Street, Nairobi',
+        'delivery_date': (datetime.now() + timedelta(days=3)).isoformat(),
+        'payment_method': 'M-Pesa',
+        'cart_items': [
+            {'cake_id': sample_cake.id, 'quantity': 2},
+            {'cake_size': 'Large', 'is_vegan': True,
+             'toppings': [pricing_options['Berries'].id]},
+        ],
+    })
+    assert response.status_code == 201
+    order = response.get_json()
+
+    assert client.get('/api/orders/my-orders').status_code == 200
+    assert client.get(f"/api/orders/track/{order['order_number']}").status_code == 200
+    assert client.get(f"/api/orders/{order['id']}").status_code == 200
+
+    assert_no_full_scans(seeded, recorded_statements)
+
+
+def test_admin_listing_lookups_use_indexes(client, seeded, admin_csrf_headers, recorded_statements):
+    for status in ('pending', 'cancelled'):
+        assert client.get(f'/api/admin/orders?status={status}&per_page=5').status_code == 200
+
+    response = client.get('/api/admin/orders?cursor=&per_page=5')
+    cursor = response.get_json()['next_cursor']
+    assert client.get(f'/api/admin/orders?cursor={cursor}&per_page=5').status_code == 200
+    assert client.get(f'/api/admin/orders?status=pending&cursor={cursor}&per_page=5').status_code == 200
+
+    response = client.get('/api/admin/users?cursor=&per_page=1')
+    cursor = response.get_json()['next_cursor']
+    assert client.get(f'/api/admin/users?cursor={cursor}&per_page=1').status_code == 200
+
+    assert_no_full_scans(seeded, recorded_statements)
+
+
+def test_cart_lookups_use_indexes(client, seeded, pricing_options, recorded_statements):
+    response = client.post('/api/cart/items', json={
+        'cake_size': 'Large', 'quantity': 1, 'toppings': [pricing_options['Sprinkles'].id],
+    })
+    assert response.status_code == 201
+    item_id = response.get_json()['items'][0]['id']
+
+    assert client.get('/api/cart').status_code == 200
+    assert client.put(f'/api/cart/items/{item_id}', json={
+        'cake_size': 'Large', 'quantity': 3,
+    }).status_code == 200
+    assert client.delete(f'/api/cart/items/{item_id}').status_code == 200
+    assert client.post('/api/cart/clear').status_code == 200
+
+    assert_no_full_scans(seeded, recorded_statements)
+
+
+def test_catalog_lookups_use_indexes(client, seeded, recorded_statements):
+    assert client.get('/api/customizations').status_code == 200
+    assert client.get('/api/customization/options').status_code == 200
+    assert client.get('/api/portfolio?featured=true').status_code == 200
+    assert client.get('/api/portfolio?category=Wedding').status_code == 200
+
+    response = client.get('/api/portfolio?cursor=&per_page=5')
+    cursor = response.get_json()['pagination']['next_cursor']
+    assert client.get(f'/api/portfolio?cursor={cursor}&per_page=5').status_code == 200
+
+    assert_no_full_scans(seeded, recorded_statements)
@@ -7,6 +7,7 @@ from .exceptions import (
     AuthenticationError,
     AuthorizationError,
     ResourceNotFoundError,
+    ConflictError,
     DatabaseError
 )
 
@@ -19,5 +20,6 @@ __all__ = [
     'AuthenticationError',
     'AuthorizationError',
     'ResourceNotFoundError',
+    'ConflictError',
     'DatabaseError'
 ]
@@ -0,0 +1,151 @@
+# backend/utils/cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from .http_cache import is_not_modified, not_modified_response, with_etag
+from .compression import compress
+
+
+class CachedBody:
+    """Pre-serialized JSON response body plus its strong ETag."""
+    __slots__ = ('data', 'etag', 'encoded')
+
+    def __init__(self, data):
+        self.data = data
+        self.etag = hashlib.blake2b(data, digest_size=16).hexdigest()
+        self.encoded = {}    # content coding -> compressed bytes
+
+    def compressed(self, encoding):
+        """Compressed bytes for `encoding`, compressed once and then reused."""
+        data = self.encoded.get(encoding)
+        if data is None:
+            data = self.encoded[encoding] = compress(self.data, encoding)
+        return data
+
+
+class VersionedCache:
+    """
+    Process-local cache of serialized payloads.
+
+    Every write path that changes the underlying rows calls bump(), which
+    moves the cache to a new version and drops every entry built for the
+    old one. Entries also expire after `ttl` seconds so that other worker
+    processes (which never see this process's bumps) converge quickly.
+
+    Keys include request parameters (page, per_page, ...), so the cache
+    holds at most `max_entries` entries and evicts the least recently used
+    one beyond that.
+    """
+
+    def __init__(self, name, ttl_config_key=None, default_ttl=None, max_entries=1024):
+        self.name = name
+        self.ttl_config_key = ttl_config_key
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    @property
+    def version(self):
+        return self._version
+
+    def _ttl(self):
+        if self.ttl_config_key:
+            return current_app.config.get(self.ttl_config_key, self.default_ttl)
+        return self.default_ttl
+
+    def get(self, key):
+        """Return the cached value for key, or None when missing or expired."""
+        ttl = self._ttl()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, stored_at, value = entry
+            if version != self._version or (ttl and time.monotonic() - stored_at > ttl):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, version=None):
+        """Store value unless the cache was bumped since `version` was read."""
+        with self._lock:
+            if version is not None and version != self._version:
+                return value
+            self._entries[key] = (self._version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_or_build(self, key, builder):
+        """Return the cached value for key, building and storing it on a miss."""
+        value = self.get(key)
+        if value is None:
+            version = self._version
+            value = self.set(key, builder(), version=version)
+        return value
+
+    def bump(self):
+        """Invalidate every entry by moving to a new version."""
+        with self._lock:
+            self._version += 1
+            self._entries = OrderedDict()
+        return self._version
+
+
+_registry = []
+
+
+def clear_all_caches():
+    """Bump every registered cache (used by tests and maintenance scripts)."""
+    for cache in _registry:
+        cache.bump()
+
+
+def serialize_body(payload):
+    """Serialize a payload with the application's JSON provider."""
+    return CachedBody(current_app.json.dumps_bytes(payload))
+
+
+def cached_json_response(body, status=200):
+    """
+    Build a JSON response straight from a CachedBody, skipping serialization.
+
+    The body's content hash doubles as its ETag, so a matching
+    If-None-Match is answered with an empty 304. The response keeps a
+    reference to the body so compression can reuse its cached encodings.
+    """
+    if status == 200 and is_not_modified(body.etag):
+        return not_modified_response(body.etag)
+    
+    response = current_app.response_class(
+        body.data,
+        status=status,
+        mimetype='application/json'
+    )
+    if status == 200:
+        with_etag(response, body.etag)
+    response.cached_body = body
+    return response
+
+
+# Public cake catalog: full list, each page and each cake id
+catalog_cache = VersionedCache(
+    'catalog',
+    ttl_config_key='CATALOG_CACHE_TTL',
+    default_ttl=60
+)
+
+# Everything derived from customization_option: the pricing table and the
+# grouped option payloads. Every option write bumps it.
+option_cache = VersionedCache(
+    'options',
+    ttl_config_key='OPTION_CACHE_TTL',
+    default_ttl=300
+)
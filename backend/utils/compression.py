@@ -0,0 +1,82 @@
+# backend/utils/compression.py
+"""
+Response compression negotiated with Accept-Encoding.
+
+gzip is always available; brotli is preferred when the `brotli` package is
+installed and the client accepts it. Responses below a size threshold,
+streamed responses and non-text content are sent as-is.
+
+Bodies served from the response cache (CachedBody) keep their compressed
+forms next to the raw bytes, so an unchanged catalog is compressed once per
+encoding rather than on every request.
+"""
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional speedup
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/plain', 'text/csv', 'application/x-ndjson'
+}
+
+
+def available_encodings():
+    """Supported encodings, most preferred first."""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress(data, encoding):
+    """Compress bytes with the given content coding."""
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESSION_BROTLI_QUALITY', 5))
+    # mtime=0 keeps the output (and any cached copy) byte-for-byte stable
+    return gzip.compress(data, compresslevel=config.get('COMPRESSION_GZIP_LEVEL', 6), mtime=0)
+
+
+def negotiate_encoding():
+    """Best encoding the client accepts, or None."""
+    return request.accept_encodings.best_match(available_encodings())
+
+
+def compress_response(response):
+    """
+    Compress an eligible response in place (used as an after_request hook).
+
+    When the response was built from a CachedBody (`response.cached_body`),
+    the body's memoized compressed bytes are used. The strong ETag becomes
+    weak, since the bytes on the wire now differ per encoding; conditional
+    requests still match because If-None-Match uses weak comparison.
+    """
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.content_length is None
+        or response.content_length < current_app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    cached_body = getattr(response, 'cached_body', None)
+    if cached_body is not None:
+        data = cached_body.compressed(encoding)
+    else:
+        data = compress(response.get_data(), encoding)
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
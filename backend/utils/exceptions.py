@@ -50,6 +50,12 @@ class ResourceNotFoundError(APIException):
     description = "Resource not found"
 
 
+class ConflictError(APIException):
+    """Raised when a resource was changed concurrently."""
+    code = 409
+    description = "Resource was modified concurrently"
+
+
 class DatabaseError(APIException):
     """Raised when database operation fails."""
     code = 500
@@ -0,0 +1,182 @@
+# backend/utils/fast_serializer.py
+"""
+Precompiled serializers for hot marshmallow schemas.
+
+`compile_schema(schema)` wraps a schema instance in an object with the same
+`dump(obj, many=None)` interface, backed by a plain-Python function generated
+from the schema's dump fields: one attribute read per field plus the minimal
+formatting marshmallow would apply (int()/float()/str(), isoformat()).
+Output is identical to `schema.dump`; anything the generator does not know
+how to inline is delegated to the marshmallow field itself, and schemas with
+pre/post-dump hooks or a custom get_attribute simply use `schema.dump`.
+
+Functions are generated lazily, per schema and per object class, on the first
+dump, so nested schemas referenced by name ('CakeSchema') are resolved after
+every module has registered its schemas.
+"""
+import threading
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import PRE_DUMP, POST_DUMP
+from marshmallow.utils import ensure_text_type
+
+
+# Field classes whose formatting is inlined (exact types only, so subclasses
+# with their own _serialize keep going through marshmallow)
+_INT_FIELDS = (fields.Integer,)
+_FLOAT_FIELDS = (fields.Float,)
+_STRING_FIELDS = (fields.String, fields.Email, fields.Url)
+_PASSTHROUGH_FIELDS = (fields.Boolean, fields.Raw)
+_ISO_FIELDS = (fields.DateTime, fields.Date)
+
+
+def _is_plain(schema):
+    """True when schema.dump is nothing more than its fields."""
+    return (
+        not schema._hooks[PRE_DUMP]
+        and not schema._hooks[POST_DUMP]
+        and type(schema).get_attribute is Schema.get_attribute
+        and schema.dict_class is dict
+    )
+
+
+class CompiledSchema:
+    """Drop-in replacement for a marshmallow schema instance on the dump path."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.many = schema.many
+        self.plain = _is_plain(schema)
+        self._functions = {}     # object class -> generated function
+        self._lock = threading.Lock()
+
+    def dump(self, obj, *, many=None):
+        many = self.many if many is None else bool(many)
+        if not self.plain:
+            return self.schema.dump(obj, many=many)
+        if many:
+            return [self.dump_one(item) for item in obj]
+        return self.dump_one(obj)
+
+    def dump_one(self, obj):
+        function = self._functions.get(obj.__class__)
+        if function is None:
+            function = self._compile(obj.__class__)
+        return function(obj)
+
+    def _compile(self, cls):
+        with self._lock:
+            function = self._functions.get(cls)
+            if function is None:
+                function = self._functions[cls] = _generate(self.schema, cls)
+            return function
+
+
+def compile_schema(schema):
+    """Return a CompiledSchema for a marshmallow schema instance."""
+    return CompiledSchema(schema)
+
+
+def _nested_schema(field):
+    """Compiled schema behind a Nested field, or None if it dumps as a list."""
+    schema = field.schema
+    if schema.many or field.many:
+        return None
+    return compile_schema(schema)
+
+
+def _field_expression(index, field, value, namespace):
+    """
+    Python expression serializing `value` the way `field` would.
+
+    Returns None when the field has no inline form and must be serialized
+    through marshmallow.
+    """
+    kind = type(field)
+    if kind in _INT_FIELDS or kind in _FLOAT_FIELDS:
+        if field.as_string:
+            return None
+        caster = '_int' if kind in _INT_FIELDS else '_float'
+        return f"None if {value} is None else {caster}({value})"
+    if kind in _STRING_FIELDS:
+        return f"None if {value} is None else ({value} if {value}.__class__ is _str else _text({value}))"
+    if kind in _PASSTHROUGH_FIELDS:
+        return value
+    if kind in _ISO_FIELDS:
+        if (field.format or field.DEFAULT_FORMAT) not in ('iso', 'iso8601'):
+            return None
+        return f"None if {value} is None else {value}.isoformat()"
+    if kind is fields.Nested:
+        nested = _nested_schema(field)
+        if nested is None:
+            return None
+        namespace[f'_n{index}'] = nested.dump_one
+        return f"None if {value} is None else _n{index}({value})"
+    if kind is fields.List and type(field.inner) is fields.Nested:
+        nested = _nested_schema(field.inner)
+        if nested is None:
+            return None
+        namespace[f'_n{index}'] = nested.dump_one
+        return f"None if {value} is None else [_n{index}(each) for each in {value}]"
+    return None
+
+
+def _generate(schema, cls):
+    """Generate the serializer function for `schema` dumping `cls` instances."""
+    if hasattr(cls, '__getitem__'):
+        # Mappings are read by key, not attribute; leave them to marshmallow
+        return lambda obj: schema.dump(obj, many=False)
+
+    namespace = {
+        '_int': int, '_float': float, '_str': str, '_text': ensure_text_type,
+        '_missing': missing, '_get_attribute': schema.get_attribute,
+    }
+    # (key, setup statements, value expression); a None expression means the
+    # setup assigns the key itself because the field may be missing
+    literal = []      # leading keys that are always present
+    statements = []   # everything after the first optional key
+
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        attribute = field.attribute or name
+        target = statements if statements else literal
+
+        if type(field) is fields.Method and field._serialize_method is not None:
+            namespace[f'_m{index}'] = field._serialize_method
+            target.append((key, None, f"_m{index}(obj)"))
+            continue
+
+        # Attributes declared on the class (columns, relationships,
+        # properties) are read directly; anything else goes through the field
+        inline = (
+            field.dump_default is missing
+            and attribute.isidentifier()
+            and hasattr(cls, attribute)
+        )
+        expression = _field_expression(index, field, f"v{index}", namespace) if inline else None
+
+        if expression is not None:
+            target.append((key, f"v{index} = obj.{attribute}", expression))
+        else:
+            namespace[f'_f{index}'] = field
+            statements.append((key, (
+                f"v{index} = _f{index}.serialize({name!r}, obj, accessor=_get_attribute)\n"
+                f"    if v{index} is not _missing:\n"
+                f"        data[{key!r}] = v{index}"
+            ), None))
+
+    lines = ['def serialize(obj):']
+    lines += [f"    {setup}" for _, setup, _ in literal if setup]
+    items = ', '.join(f"{key!r}: {expression}" for key, _, expression in literal)
+    lines.append(f"    data = {{{items}}}")
+    for key, setup, expression in statements:
+        if setup:
+            lines.append(f"    {setup}")
+        if expression is not None:
+            lines.append(f"    data[{key!r}] = {expression}")
+    lines.append('    return data')
+
+    source = '\n'.join(lines)
+    exec(compile(source, f'<serializer {type(schema).__name__}:{cls.__name__}>', 'exec'), namespace)
+    serialize = namespace['serialize']
+    serialize.__source__ = source
+    return serialize
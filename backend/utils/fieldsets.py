@@ -0,0 +1,90 @@
+# backend/utils/fieldsets.py
+from functools import lru_cache
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, noload
+from .exceptions import ValidationError
+from .fast_serializer import compile_schema
+
+
+def requested_fields(allowed):
+    """
+    Parse the ?fields=a,b,c sparse fieldset parameter.
+
+    Args:
+        allowed: Iterable of field names the endpoint can return
+
+    Returns:
+        tuple or None: Requested field names in request order, or None when
+        the parameter is absent (meaning "all fields")
+
+    Raises:
+        ValidationError: If an unknown field is requested
+    """
+    raw = request.args.get('fields')
+    if raw is None:
+        return None
+
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    if not fields:
+        raise ValidationError("At least one field must be requested")
+
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise ValidationError(
+            "Unknown fields requested",
+            payload={'unknown_fields': unknown, 'allowed_fields': sorted(allowed)}
+        )
+    return fields
+
+
+def schema_fields(schema_cls):
+    """Names of the fields a schema can dump."""
+    return [name for name, field in schema_cls._declared_fields.items() if not field.load_only]
+
+
+def schema_attributes(schema_cls, fields):
+    """Model attribute names read when dumping the given schema fields."""
+    declared = schema_cls._declared_fields
+    return {
+        (declared[name].attribute or name).split('.')[0]
+        for name in fields
+    }
+
+
+@lru_cache(maxsize=128)
+def projected_schema(schema_cls, fields, many=True):
+    """Return a (cached) compiled schema restricted to the requested fields."""
+    return compile_schema(schema_cls(many=many, only=fields))
+
+
+def projection_options(model, attributes, always=()):
+    """
+    Loader options that fetch only the columns a response needs.
+
+    Columns not in `attributes` (or `always`, e.g. sort keys needed to build
+    a cursor) are left out of the SELECT, and relationships that are not
+    requested are never loaded.
+
+    Args:
+        model: Mapped model class
+        attributes: Model attribute names the response reads
+        always: Extra column attribute names to load regardless
+
+    Returns:
+        list: Options for Query.options()
+    """
+    mapper = inspect(model)
+    wanted = set(attributes) | set(always)
+    wanted.update(mapper.get_property_by_column(c).key for c in mapper.primary_key)
+
+    columns = [
+        getattr(model, attr.key) for attr in mapper.column_attrs
+        if attr.key in wanted
+    ]
+    options = [load_only(*columns)]
+    options.extend(
+        noload(getattr(model, rel.key)) for rel in mapper.relationships
+        if rel.key not in wanted
+    )
+    return options
@@ -0,0 +1,90 @@
+# backend/utils/http_cache.py
+import hashlib
+from functools import wraps
+from flask import current_app, request, make_response, g
+from extensions import db
+
+
+def table_fingerprint(*models):
+    """
+    Compute a cheap fingerprint of the current state of one or more tables.
+
+    Uses one aggregate query per table (row count, max id and, when the model
+    has one, max updated_at) instead of loading any rows. Inserts, deletes and
+    ORM updates all change at least one of those values.
+    """
+    parts = []
+    for model in models:
+        columns = [db.func.count(model.id), db.func.max(model.id)]
+        if hasattr(model, 'updated_at'):
+            columns.append(db.func.max(model.updated_at))
+        row = db.session.query(*columns).one()
+        parts.append(f"{model.__tablename__}:" + ':'.join(str(value) for value in row))
+    return ';'.join(parts)
+
+
+def make_etag(*parts):
+    """Hash arbitrary parts into a strong ETag value."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def is_not_modified(etag):
+    """Check the request's If-None-Match header against an ETag."""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified_response(etag):
+    """Build an empty 304 response carrying the current ETag."""
+    response = current_app.response_class(status=304)
+    return with_etag(response, etag)
+
+
+def with_etag(response, etag):
+    """Attach a strong ETag and ask clients to revalidate before reuse."""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def conditional_get(*models):
+    """
+    Decorator adding ETag / If-None-Match support to a read-only endpoint.
+
+    The ETag is derived from the fingerprint of the given tables and the
+    request's query string, so it is known before any rows are loaded.
+    When the client already holds the current representation the view is
+    not called at all and an empty 304 is returned. Otherwise the
+    fingerprint is left on `g.table_fingerprint`, so the view can key any
+    cached payload by it instead of querying the tables again.
+
+    Usage:
+        @portfolio_bp.route('/portfolio')
+        @conditional_get(CakeTemplate, CakeTemplateImage)
+        def get_portfolio_cakes():
+            ...
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return f(*args, **kwargs)
+
+            g.table_fingerprint = table_fingerprint(*models)
+            etag = make_etag(
+                request.path,
+                request.query_string,
+                g.table_fingerprint
+            )
+            if is_not_modified(etag):
+                return not_modified_response(etag)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                with_etag(response, etag)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,135 @@
+# backend/utils/json_provider.py
+"""
+JSON providers for `app.json` (used by jsonify, request.get_json and the
+response cache).
+
+- OrjsonProvider: orjson, when it is installed. Serializes straight to bytes.
+- StdlibJSONProvider: the stdlib encoder, tuned to reuse one JSONEncoder
+  per option set instead of building a new one on every call.
+
+Both keep Flask's defaults (sorted keys, compact output outside debug mode)
+and serialize datetimes and dates as ISO 8601 strings, the same format the
+schemas produce.
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+JSON_PROVIDERS = ('auto', 'orjson', 'stdlib')
+
+# dumps() arguments the fast paths understand
+FORMATTING_ARGS = {'separators', 'indent'}
+
+
+def _default(o):
+    """Serialize types json/orjson do not handle themselves."""
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+class _BytesResponseMixin:
+    """Build responses from dumps_bytes() without a str round trip."""
+
+    def _pretty(self):
+        return (self.compact is None and self._app.debug) or self.compact is False
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumps_bytes(obj, pretty=self._pretty())
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
+
+
+class StdlibJSONProvider(_BytesResponseMixin, DefaultJSONProvider):
+    """Stdlib json with cached encoders and ISO 8601 datetimes."""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._encoders = {}
+
+    def _encoder(self, pretty):
+        key = (pretty, self.sort_keys, self.ensure_ascii)
+        encoder = self._encoders.get(key)
+        if encoder is None:
+            encoder = self._encoders[key] = json.JSONEncoder(
+                default=self.default,
+                ensure_ascii=self.ensure_ascii,
+                sort_keys=self.sort_keys,
+                indent=2 if pretty else None,
+                separators=None if pretty else (',', ':'),
+            )
+        return encoder
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.keys() <= FORMATTING_ARGS:
+            return self._encoder(kwargs.get('indent') is not None).encode(obj)
+        return super().dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj, pretty=False):
+        return self._encoder(pretty).encode(obj).encode('utf-8')
+
+
+class OrjsonProvider(_BytesResponseMixin, DefaultJSONProvider):
+    """orjson-backed provider; output is always compact unless pretty-printed."""
+
+    default = staticmethod(_default)
+
+    def _options(self, pretty):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # separators are accepted for compatibility and ignored: orjson always
+        # writes compact UTF-8. Other json.dumps arguments use the stdlib.
+        if kwargs.keys() <= FORMATTING_ARGS:
+            return self.dumps_bytes(obj, pretty=kwargs.get('indent') is not None).decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def dumps_bytes(self, obj, pretty=False):
+        return orjson.dumps(obj, default=self.default, option=self._options(pretty))
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def make_json_provider(app):
+    """
+    Build the JSON provider selected by the JSON_PROVIDER setting.
+
+    'auto' uses orjson when it is importable and the stdlib provider
+    otherwise; 'orjson' requires orjson to be installed.
+    """
+    choice = app.config.get('JSON_PROVIDER', 'auto')
+    if choice not in JSON_PROVIDERS:
+        raise ValueError(
+            f"JSON_PROVIDER must be one of {', '.join(JSON_PROVIDERS)}, not {choice!r}"
+        )
+    if choice == 'orjson' and orjson is None:
+        raise ValueError("JSON_PROVIDER is 'orjson' but orjson is not installed")
+
+    if choice == 'stdlib' or orjson is None:
+        return StdlibJSONProvider(app)
+    return OrjsonProvider(app)
@@ -0,0 +1,110 @@
+# backend/utils/pagination.py
+import base64
+import json
+from datetime import date, datetime
+from flask import request
+from sqlalchemy import and_, literal, or_
+from .exceptions import ValidationError
+
+
+def cursor_requested():
+    """Return True when the client opted into keyset pagination with ?cursor=."""
+    return 'cursor' in request.args
+
+
+def encode_cursor(values):
+    """Encode sort-key values into an opaque, URL-safe cursor string."""
+    payload = [
+        value.isoformat() if isinstance(value, (datetime, date)) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    """
+    Decode a cursor back into typed sort-key values.
+
+    Raises:
+        ValidationError: If the cursor is malformed or does not match the keys
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError("cursor does not match sort keys")
+
+        values = []
+        for column, value in zip(columns, payload):
+            python_type = column.type.python_type
+            if value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif value is not None and python_type is date:
+                value = date.fromisoformat(value)
+            values.append(value)
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        raise ValidationError("Invalid pagination cursor")
+
+
+def _seek_condition(keys, values):
+    """
+    Build the "row comes after the cursor" predicate for mixed sort directions.
+
+    For keys (k1, k2, ..., kn) this expands to
+        k1 > v1
+        OR (k1 = v1 AND k2 > v2)
+        OR ...
+    with > replaced by < for descending keys, which lets the database seek
+    straight to the cursor position using an index on the sort keys.
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal_prefix = [prev_column == values[j] for j, (prev_column, _) in enumerate(keys[:i])]
+        # Bound as a typed literal: SQLAlchemy refuses < / > against a bare
+        # True/False, which boolean sort keys (e.g. is_featured) produce
+        value = literal(values[i], column.type)
+        step = column < value if descending else column > value
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def keyset_paginate(query, keys, cursor, per_page):
+    """
+    Paginate a query by seeking on its sort keys instead of OFFSET.
+
+    Unlike paginate(), this never issues a COUNT(*) and the cost of a page
+    does not grow with its depth. The last key must be unique (normally the
+    primary key) so that the ordering is total.
+
+    Args:
+        query: Base query, already filtered but not ordered
+        keys: List of (column, descending) tuples, e.g.
+              [(Order.created_at, True), (Order.id, True)]
+        cursor: Cursor returned by the previous page, or '' for the first page
+        per_page: Maximum number of rows to return
+
+    Returns:
+        tuple: (items, next_cursor) where next_cursor is None on the last page
+    """
+    columns = [column for column, _ in keys]
+
+    if cursor:
+        query = query.filter(_seek_condition(keys, decode_cursor(cursor, columns)))
+
+    query = query.order_by(*[
+        column.desc() if descending else column.asc()
+        for column, descending in keys
+    ])
+
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if items and len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    return items, next_cursor